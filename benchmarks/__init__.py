@@ -0,0 +1 @@
+"""Benchmarks for the Mod Manager's hot paths. Run them as modules from the project root."""
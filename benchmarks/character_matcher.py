@@ -0,0 +1,71 @@
+"""
+Benchmark CharacterMatcher and the batch API against match_character.
+
+Usage (from the project root):
+    python -m benchmarks.character_matcher [folder_count]
+"""
+import sys
+import time
+import random
+from config.constants import CHARACTER_LISTS
+from utils.character_matcher import match_character, CharacterMatcher
+
+def make_folder_names(character_list, count, seed=0):
+    """Build folder names that exercise every matching strategy."""
+    rng = random.Random(seed)
+    decorations = ["", "_mod", " skin v2", "-outfit", " 14fix", "_final"]
+    names = []
+    while len(names) < count:
+        character = rng.choice(character_list)
+        word = rng.choice(character.split())
+        kind = rng.randrange(4)
+        if kind == 0:
+            name = character
+        elif kind == 1:
+            name = word.lower() + rng.choice(decorations)
+        elif kind == 2:
+            # Typo so only the fuzzy strategies can match
+            position = rng.randrange(len(word))
+            name = word[:position] + rng.choice("xyzq") + word[position + 1:]
+        else:
+            name = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(rng.randint(4, 20)))
+        names.append(name)
+    return names
+
+def run(folder_count=2000):
+    for game, character_list in CHARACTER_LISTS.items():
+        if not character_list:
+            continue
+        names = make_folder_names(character_list, folder_count)
+
+        start = time.perf_counter()
+        expected = [match_character(name, character_list) for name in names]
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = CharacterMatcher(character_list)
+        actual = [matcher.match(name) for name in names]
+        matcher_time = time.perf_counter() - start
+
+        # Second pass shows the memoized cost of refreshes
+        start = time.perf_counter()
+        for name in names:
+            matcher.match(name)
+        memo_time = time.perf_counter() - start
+
+        # Batch API on a fresh matcher so nothing is memoized yet
+        start = time.perf_counter()
+        batch = CharacterMatcher(character_list).match_many(names)
+        batch_time = time.perf_counter() - start
+
+        mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+        batch_mismatches = sum(1 for a, b in zip(expected, batch) if a != b)
+        print(f"{game}: {len(names)} folders")
+        print(f"  match_character   {reference_time * 1000:8.1f} ms")
+        print(f"  CharacterMatcher  {matcher_time * 1000:8.1f} ms (build included)")
+        print(f"  match_many        {batch_time * 1000:8.1f} ms (build included)")
+        print(f"  memoized repeat   {memo_time * 1000:8.1f} ms")
+        print(f"  mismatches        {mismatches} (match), {batch_mismatches} (match_many)")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,98 @@
+"""
+Benchmark the streaming roster extractor against the BeautifulSoup scraper.
+
+Pages are the roster copies get_icons saves under
+assets/character_icons/<game>/cache/roster.html, any HTML files given on the
+command line, and a synthetic page shaped like prydwen.gg's (cards buried in
+a large amount of unrelated markup and inline script). Each parser is checked
+to return the same characters, then timed and its peak memory measured.
+
+Usage (from the project root):
+    python -m benchmarks.roster_parser [page.html ...]
+"""
+import os
+import sys
+import glob
+import time
+import random
+import tracemalloc
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
+from utils.icons.roster import iter_roster
+
+PAGE_URL = "https://www.prydwen.gg/wuthering-waves/characters"
+RUNS = 5
+
+def soup_roster(html, page_url):
+    """The previous scraper: full tree with html.parser, then find_all per card."""
+    roster = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for card in soup.find_all('div', class_='avatar-card card'):
+        name_tag = card.find('span', class_='emp-name')
+        character_name = name_tag.text.strip() if name_tag else "Unknown"
+        img_tags = [img for img in card.find_all('img', {'data-main-image': True}) if 'src' in img.attrs]
+        if img_tags:
+            roster.append((character_name, urljoin(page_url, img_tags[0]['src'])))
+    return roster
+
+def stream_roster(html, page_url):
+    return list(iter_roster(html, page_url))
+
+def make_page(cards=120, filler=4000, seed=0):
+    """Build a roster page with `cards` characters and `filler` unrelated blocks."""
+    rng = random.Random(seed)
+    parts = ["<!DOCTYPE html><html><head><title>Characters</title>"]
+    parts.append("<script>window.__DATA__ = " + repr([rng.random() for _ in range(5000)]) + ";</script>")
+    parts.append("</head><body><div id='___gatsby'><nav class='menu'>")
+    for index in range(filler):
+        parts.append(
+            f"<div class='filter-item item-{index}'><a href='/page/{index}'>"
+            f"<span class='label'>Link {index}</span><svg viewBox='0 0 10 10'><path d='M0 0L10 10'/></svg></a></div>"
+        )
+    parts.append("</nav><div class='employees-container'>")
+    for index in range(cards):
+        parts.append(
+            f"<div class=\"avatar-card card\"><a href=\"/characters/c{index}\">"
+            f"<div class=\"gatsby-image-wrapper\"><div aria-hidden=\"true\" style=\"padding-top:133%\"></div>"
+            f"<img aria-hidden=\"true\" data-placeholder-image=\"\" src=\"data:image/webp;base64,{'A' * 300}\">"
+            f"<picture><source type=\"image/webp\" srcset=\"/static/{index:04x}/a.webp 1x\">"
+            f"<img data-main-image=\"\" decoding=\"async\" src=\"/static/{index:04x}/c{index}.webp\" alt=\"\"></picture>"
+            f"</div></a><div class=\"card-info\"><span class=\"emp-name\">Character &amp; {index}</span>"
+            f"<span class=\"emp-rarity\">5</span></div></div>"
+        )
+    parts.append("</div></div></body></html>")
+    return "".join(parts)
+
+def measure(parse, html):
+    """Best time of RUNS parses, and the peak memory of one parse, in (seconds, bytes)."""
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        parse(html, PAGE_URL)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    parse(html, PAGE_URL)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def run(paths=()):
+    pages = {"synthetic": make_page()}
+    for path in list(paths) + sorted(glob.glob(os.path.join("assets", "character_icons", "*", "cache", "roster.html"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages[path] = f.read()
+
+    for name, html in pages.items():
+        reference = soup_roster(html, PAGE_URL)
+        streamed = stream_roster(html, PAGE_URL)
+        soup_time, soup_peak = measure(soup_roster, html)
+        stream_time, stream_peak = measure(stream_roster, html)
+
+        print(f"{name} ({len(html) / 1024:.0f} KB, {len(reference)} characters):")
+        print(f"  BeautifulSoup  {soup_time * 1000:8.1f} ms  peak {soup_peak / 1024 / 1024:6.1f} MB")
+        print(f"  iter_roster    {stream_time * 1000:8.1f} ms  peak {stream_peak / 1024 / 1024:6.1f} MB"
+              f"  ({soup_time / stream_time:.1f}x faster)")
+        print(f"  same roster    {reference == streamed}")
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
@@ -3,6 +3,8 @@ Constants and configuration data for the Mod Manager.
 """
 
 SAVE_FILE = "mod_manager_data.json"
+LIBRARY_INDEX_FILE = "mod_library_index.json"
+INSTALL_RECORDS_FILE = "mod_installs.json"
 
 GAME_TABS = [
     "Genshin",
@@ -1,9 +1,13 @@
 """
 Main application window for the Mod Manager.
 """
+import os
+import threading
 import customtkinter as ctk
 from config.constants import GAME_TABS, CHARACTER_LISTS
 from config.settings import load_data
+from utils.icons.thumbnails import generate_thumbnails
+from utils.staged_install import clean_staging
 from .tabs.settings_tab import SettingsTab
 from .tabs.game_tab import GameTab
 from .widgets.toast import ToastManager
@@ -15,6 +19,9 @@ class App(ctk.CTk):
         super().__init__()
         self.title("Modern Mod Manager")
         
+        # Bake missing character icon thumbnails off the UI thread
+        threading.Thread(target=self._generate_thumbnails, daemon=True).start()
+        
         # Initialize toast manager
         self.toast_manager = ToastManager(self)
         
@@ -29,11 +36,16 @@ class App(ctk.CTk):
             height = app_settings.get("height", 750)
         
         self.geometry(f"{width}x{height}")
+        
+        # Drop staging folders of installs interrupted by a crash, before any install can be queued
+        self._clean_staging()
 
-        self.tabview = ctk.CTkTabview(self)
+        self.tabview = ctk.CTkTabview(self, command=self._on_tab_changed)
         self.tabview.pack(expand=True, fill="both", padx=10, pady=10)
 
         self.tabs = {}
+        self.tab_paths = {}
+        self.placeholders = {}
         
         # Create tabs in specific order - Settings will be last
         self.tab_order = ["Settings"] + GAME_TABS  # Settings first in list means it will be last in UI
@@ -42,7 +54,9 @@ class App(ctk.CTk):
         for tab_name in reversed(self.tab_order):  # Create in reverse order to maintain desired order
             self.tabview.add(tab_name)
         
-        # Game tabs
+        # Game tabs are built on first activation
+        for game in GAME_TABS:
+            self._show_placeholder(game)
         self.refresh_game_tabs()
         
         # Settings tab
@@ -50,28 +64,77 @@ class App(ctk.CTk):
         self.settings_frame = SettingsTab(self.settings_tab, self.game_paths, self.refresh_game_tabs, self.toast_manager)
         self.settings_frame.pack(expand=True, fill="both")
 
+    def _generate_thumbnails(self):
+        """Generate outdated icon thumbnails for every game."""
+        for game in GAME_TABS:
+            try:
+                # In-process: a process pool must not be started from this thread
+                generate_thumbnails(game, workers=1)
+            except Exception as e:
+                print(f"Failed to generate thumbnails for {game}: {str(e)}")
+
     def refresh_game_tabs(self):
-        """Refresh all game tabs with current settings."""
-        # Remove old game tabs
+        """Rebuild game tabs whose mod directories changed since they were built."""
         for game in GAME_TABS:
-            if game in self.tabs:
+            if game in self.tabs and self.tab_paths.get(game) != self._get_game_paths(game):
                 self.tabs[game].destroy()
                 del self.tabs[game]
+                del self.tab_paths[game]
+                self._show_placeholder(game)
+
+        # Only the visible tab is built now, the others wait for activation
+        self._build_game_tab(self.tabview.get())
 
-        # Add game tabs with current settings
+    def _on_tab_changed(self):
+        """Build the newly selected game tab after the tab switch is drawn."""
+        game = self.tabview.get()
+        if game in GAME_TABS and game not in self.tabs:
+            self.after(10, lambda: self._build_game_tab(game))
+
+    def _clean_staging(self):
+        """Remove leftover staging folders from every game's mods directory."""
         for game in GAME_TABS:
-            mods_from = self.game_paths.get(game, {}).get("from", "")
-            mods_to = self.game_paths.get(game, {}).get("to", "")
-            character_list = CHARACTER_LISTS.get(game, [])
-            
-            # Get the tab frame
-            tab_frame = self.tabview.tab(game)
-            
-            # Create a new frame inside the tab
-            frame = ctk.CTkFrame(tab_frame)
-            frame.pack(expand=True, fill="both")
-            
-            # Create the game tab with the new frame
-            self.tabs[game] = frame
-            game_tab = GameTab(frame, game, mods_from, mods_to, character_list, self.toast_manager)
-            game_tab.pack(expand=True, fill="both")
\ No newline at end of file
+            mods_to = self._get_game_paths(game)[1]
+            if mods_to and os.path.isdir(mods_to):
+                clean_staging(mods_to)
+
+    def _get_game_paths(self, game):
+        """Get the (from, to) mod directories configured for a game."""
+        paths = self.game_paths.get(game, {})
+        return paths.get("from", ""), paths.get("to", "")
+
+    def _show_placeholder(self, game):
+        """Show a placeholder in a game tab that has not been built yet."""
+        if game in self.placeholders:
+            return
+        placeholder = ctk.CTkLabel(
+            self.tabview.tab(game),
+            text=f"Loading {game}...",
+            font=ctk.CTkFont(size=16)
+        )
+        placeholder.pack(expand=True)
+        self.placeholders[game] = placeholder
+
+    def _build_game_tab(self, game):
+        """Build a game tab with current settings if it is not built yet."""
+        if game not in GAME_TABS or game in self.tabs:
+            return
+        
+        mods_from, mods_to = self._get_game_paths(game)
+        character_list = CHARACTER_LISTS.get(game, [])
+        
+        if game in self.placeholders:
+            self.placeholders.pop(game).destroy()
+        
+        # Get the tab frame
+        tab_frame = self.tabview.tab(game)
+        
+        # Create a new frame inside the tab
+        frame = ctk.CTkFrame(tab_frame)
+        frame.pack(expand=True, fill="both")
+        
+        # Create the game tab with the new frame
+        self.tabs[game] = frame
+        self.tab_paths[game] = (mods_from, mods_to)
+        game_tab = GameTab(frame, game, mods_from, mods_to, character_list, self.toast_manager, self.game_paths)
+        game_tab.pack(expand=True, fill="both")
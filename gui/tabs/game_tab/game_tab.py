@@ -3,10 +3,19 @@ Game tab for managing mods for a specific game.
 """
 import os
 import re
+import queue
+import tkinter as tk
 import customtkinter as ctk
-from utils.character_matcher import match_character
-from utils.file_operations import get_directory_contents, find_matching_mods
+from config.settings import load_data
+from utils.match_cache import CharacterMatchCache
+from utils.loadouts import LoadoutStore
+from utils.file_operations import find_matching_mods
+from utils.jobs import get_job_queue
+from utils.mod_index import get_library_index
+from utils.staged_install import can_undo
+from utils.watcher import LibraryWatcher
 from gui.widgets.custom_widgets import CharacterImageButton
+from gui.widgets.virtual_grid import VirtualGrid
 from .instructions_window import InstructionsWindow
 from .mod_card import ModCard
 from .mod_operations import ModOperations
@@ -14,147 +23,405 @@ from .mod_operations import ModOperations
 class GameTab(ctk.CTkFrame):
     """Game tab for mod management."""
     
-    def __init__(self, master, game, mods_from, mods_to, character_list, toast_manager=None):
+    CHARS_PER_ROW = 2
+    MODS_PER_ROW = 3
+    
+    def __init__(self, master, game, mods_from, mods_to, character_list, toast_manager=None, settings=None):
         super().__init__(master)
         self.game = game
         self.mods_from = mods_from
         self.mods_to = mods_to
         self.character_list = character_list
         self.toast_manager = toast_manager
-        self.character_buttons = []
+        self.library_index = get_library_index()
+        self.library_queue = get_job_queue("library", 1)
+        self.revalidating = set()
+        self.settings = settings if settings is not None else load_data()
+        self.match_cache = CharacterMatchCache(self.settings, game, character_list)
+        self.loadouts = LoadoutStore(self.settings, game)
         self.selected_character = None
+        self.selected_character_name = None
+        self.watcher = None
+        self._watch_after_id = None
         
         # Initialize mod operations
         self.mod_operations = ModOperations(self)
 
         self._create_layout()
         self.populate_characters()
+        self._start_watcher()
 
     def _create_layout(self):
         """Create the main layout."""
         # Character frame with scrollable area
-        self.character_frame = ctk.CTkScrollableFrame(self, width=300, height=400)
+        self.character_frame = ctk.CTkFrame(self, width=300, height=400)
         self.character_frame.pack(side="left", fill="y", padx=10, pady=10)
+        self.character_frame.pack_propagate(False)
+
+        ctk.CTkLabel(
+            self.character_frame, 
+            text="Characters:", 
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(pady=10)
+
+        # Library-wide actions
+        ctk.CTkButton(
+            self.character_frame,
+            text="Extract All Archives",
+            fg_color="orange",
+            hover_color="darkorange",
+            command=self.mod_operations.extract_all_archives
+        ).pack(side="bottom", fill="x", padx=10, pady=10)
+        self.loadouts_btn = ctk.CTkButton(
+            self.character_frame,
+            text="Loadouts",
+            command=self._show_loadout_menu
+        )
+        self.loadouts_btn.pack(side="bottom", fill="x", padx=10, pady=(10, 0))
+
+        self.character_status_label = ctk.CTkLabel(self.character_frame, text="")
+
+        # Character buttons are recycled as the sidebar scrolls
+        self.character_grid = VirtualGrid(
+            self.character_frame,
+            create_cell=self._create_character_button,
+            bind_cell=self._bind_character_button,
+            columns=self.CHARS_PER_ROW,
+            cell_height=150,
+            padding=5,
+            fg_color="transparent"
+        )
 
         # Main content frame
         self.content_frame = ctk.CTkFrame(self)
         self.content_frame.pack(side="left", fill="both", expand=True, padx=10, pady=10)
 
         # Mods display frame
-        self.mods_frame = ctk.CTkScrollableFrame(self.content_frame)
+        self.mods_frame = ctk.CTkFrame(self.content_frame)
         self.mods_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-        # Initial message
-        self.initial_label = ctk.CTkLabel(
+        # Title
+        self.mods_title_label = ctk.CTkLabel(
+            self.mods_frame, 
+            text="", 
+            font=ctk.CTkFont(size=20, weight="bold")
+        )
+        self.mods_title_label.pack(pady=(10, 5))
+
+        # Character actions, shown once a character is selected
+        self.mods_actions_frame = ctk.CTkFrame(self.mods_frame, fg_color="transparent")
+        self.mods_actions_frame.pack(pady=(0, 10))
+        self.extract_character_btn = ctk.CTkButton(
+            self.mods_actions_frame,
+            text="Extract Character Archives",
+            fg_color="orange",
+            hover_color="darkorange",
+            state="disabled",
+            command=self.mod_operations.extract_character_archives
+        )
+        self.extract_character_btn.pack(side="left", padx=5)
+        self.undo_install_btn = ctk.CTkButton(
+            self.mods_actions_frame,
+            text="Undo Last Install",
+            state="disabled",
+            command=self.mod_operations.undo_last_install
+        )
+        self.undo_install_btn.pack(side="left", padx=5)
+
+        # Initial message, also used for empty states
+        self.mods_status_label = ctk.CTkLabel(
             self.mods_frame, 
             text="Select a character to view mods.",
             font=ctk.CTkFont(size=16)
         )
-        self.initial_label.pack(pady=50)
+        self.mods_status_label.pack(pady=50)
+
+        # Mod cards are recycled as the grid scrolls
+        self.mods_grid = VirtualGrid(
+            self.mods_frame,
+            create_cell=self._create_mod_card,
+            bind_cell=self._bind_mod_card,
+            columns=self.MODS_PER_ROW,
+            cell_height=280
+        )
 
     def populate_characters(self):
         """Populate the character list with image buttons."""
-        # Clear existing buttons
-        for btn in self.character_buttons:
-            btn.destroy()
-        self.character_buttons.clear()
-
-        # Use grid for the label as well
-        ctk.CTkLabel(
-            self.character_frame, 
-            text="Characters:", 
-            font=ctk.CTkFont(size=16, weight="bold")
-        ).grid(row=0, column=0, columnspan=2, pady=10)  # Span two columns
-
         if not self.mods_from or not os.path.isdir(self.mods_from):
-            ctk.CTkLabel(self.character_frame, text="(Directory not found)").grid(row=1, column=0, columnspan=2)
+            self._show_character_status("(Directory not found)")
             return
 
-        subfolders = get_directory_contents(self.mods_from)
+        subfolders = self.library_index.list_names(self.mods_from)
+        self.library_index.save()
+        self._update_character_matches(subfolders)
+        self._show_character_folders(subfolders)
+
+    def _show_character_status(self, text):
+        """Replace the character grid with a status message."""
+        self.character_grid.pack_forget()
+        self.character_status_label.configure(text=text)
+        self.character_status_label.pack()
+
+    def _show_character_folders(self, subfolders, keep_position=False):
+        """Show character folders in the sidebar grid."""
         if not subfolders:
-            ctk.CTkLabel(self.character_frame, text="(No character folders found)").grid(row=1, column=0, columnspan=2)
+            self._show_character_status("(No character folders found)")
             return
+        self.character_status_label.pack_forget()
+        self.character_grid.pack(fill="both", expand=True)
+        self.character_grid.set_items(subfolders, keep_position=keep_position)
+
+    def _match_character(self, folder):
+        """Match a character folder to a known character name."""
+        return self.match_cache.match(folder)
+
+    def _update_character_matches(self, subfolders):
+        """Match every character folder and persist the match table if it changed."""
+        self.match_cache.match_all(subfolders)
+        self.match_cache.retain(subfolders)
+        success, error = self.match_cache.save()
+        if not success:
+            print(f"Failed to save character matches: {error}")
 
-        # Create a grid layout for character buttons
-        chars_per_row = 2  # Number of characters per row
-        
-        for i, folder in enumerate(subfolders):
-            matched = match_character(folder, self.character_list)
-            
-            # Create image button
-            char_btn = CharacterImageButton(
-                master=self.character_frame,
-                character_name=matched,
-                folder_name=folder,
-                game_name=self.game,
-                on_click=self.show_character_mods,
-                width=130,
-                height=150
+    def _show_character_menu(self, event, folder):
+        """Show the right-click menu for choosing a folder's character by hand."""
+        current = self._match_character(folder)
+        selected = tk.StringVar(value=current)
+        menu = tk.Menu(self, tearoff=0)
+        
+        match_menu = tk.Menu(menu, tearoff=0)
+        for character in self.character_list:
+            match_menu.add_radiobutton(
+                label=character,
+                variable=selected,
+                value=character,
+                command=lambda c=character: self._set_character_override(folder, c)
             )
-            
-            # Calculate grid position
-            row = (i // chars_per_row) + 1  # Start rows after the label
-            col = i % chars_per_row
-            
-            char_btn.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
-            self.character_buttons.append(char_btn)
-    
-        # Configure grid weights for responsive layout
-        for col in range(chars_per_row):
-            self.character_frame.grid_columnconfigure(col, weight=1)
+        menu.add_cascade(label="Match as", menu=match_menu, state="normal" if self.character_list else "disabled")
+        menu.add_command(
+            label="Use automatic match",
+            command=lambda: self._set_character_override(folder, None),
+            state="normal" if self.match_cache.is_overridden(folder) else "disabled"
+        )
+        
+        menu._selected = selected  # Keep the variable alive while the menu is open
+        try:
+            menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            menu.grab_release()
 
-    def show_character_mods(self, folder, matched_name):
-        """Show mods for the selected character."""
-        self.selected_character = folder
+    def _set_character_override(self, folder, character_name):
+        """Record the character chosen for a folder, or clear it with None."""
+        if character_name is None:
+            self.match_cache.clear_override(folder)
+        else:
+            self.match_cache.set_override(folder, character_name)
         
-        # Clear the mods frame
-        for widget in self.mods_frame.winfo_children():
-            widget.destroy()
+        success, error = self.match_cache.save()
+        if not success and self.toast_manager:
+            self.toast_manager.show_toast(f"Failed to save character match: {error}", "error", 5000)
         
-        # Title
-        title_label = ctk.CTkLabel(
-            self.mods_frame, 
-            text=f"{matched_name} Mods", 
-            font=ctk.CTkFont(size=20, weight="bold")
+        self.character_grid.refresh()
+        if folder == self.selected_character:
+            self.selected_character_name = self._match_character(folder)
+            self.mods_title_label.configure(text=f"{self.selected_character_name} Mods")
+
+    def _show_loadout_menu(self):
+        """Show the menu for saving, applying and deleting loadouts under the Loadouts button."""
+        names = self.loadouts.names()
+        menu = tk.Menu(self, tearoff=0)
+        menu.add_command(label="Save current mods as loadout...", command=self.mod_operations.save_loadout)
+        
+        apply_menu = tk.Menu(menu, tearoff=0)
+        for name in names:
+            apply_menu.add_command(label=name, command=lambda n=name: self.mod_operations.apply_loadout(n))
+        menu.add_cascade(label="Apply", menu=apply_menu, state="normal" if names else "disabled")
+        
+        delete_menu = tk.Menu(menu, tearoff=0)
+        for name in names:
+            delete_menu.add_command(label=name, command=lambda n=name: self.mod_operations.delete_loadout(n))
+        menu.add_cascade(label="Delete", menu=delete_menu, state="normal" if names else "disabled")
+        
+        try:
+            menu.tk_popup(
+                self.loadouts_btn.winfo_rootx(),
+                self.loadouts_btn.winfo_rooty() + self.loadouts_btn.winfo_height()
+            )
+        finally:
+            menu.grab_release()
+
+    def _create_character_button(self, master):
+        """Create an image button for the character grid pool."""
+        return CharacterImageButton(
+            master=master,
+            character_name="",
+            folder_name="",
+            game_name=self.game,
+            on_click=self.show_character_mods,
+            on_context=self._show_character_menu,
+            width=130,
+            height=150
         )
-        title_label.pack(pady=(10, 20))
+
+    def _bind_character_button(self, char_btn, folder):
+        """Point a pooled character button at a character folder."""
+        char_btn.bind_character(self._match_character(folder), folder)
+
+    def show_character_mods(self, folder, matched_name):
+        """Show mods for the selected character."""
+        self.selected_character = folder
+        self.selected_character_name = matched_name
+        self.mods_title_label.configure(text=f"{matched_name} Mods")
+        self.extract_character_btn.configure(state="normal")
+        self.undo_install_btn.configure(state="normal" if can_undo(self.mods_to, folder) else "disabled")
         
         char_path = os.path.join(self.mods_from, folder)
         if not os.path.isdir(char_path):
-            ctk.CTkLabel(self.mods_frame, text="(Character folder not found)").pack()
+            self._show_mods_status("(Character folder not found)")
             return
         
-        subfolders = get_directory_contents(char_path)
-        if not subfolders:
-            ctk.CTkLabel(self.mods_frame, text="(No mods found)").pack()
+        mod_entries = self.library_index.list_entries(char_path)
+        self.library_index.save()
+        if not mod_entries:
+            self._show_mods_status("(No mods found)")
             return
 
         # Get currently installed mods for comparison
         current_mods = self._get_current_mods(folder)
+        self._show_mod_entries(mod_entries, current_mods)
+        self._queue_revalidation(folder, char_path)
+
+    def _queue_revalidation(self, folder, char_path):
+        """Check the shown mods' nested folders in the background and refresh the grid if any changed."""
+        if char_path in self.revalidating:
+            return
+        self.revalidating.add(char_path)
+        self.library_queue.submit(
+            self,
+            self._revalidate_job,
+            self.library_index,
+            char_path,
+            label=folder,
+            on_done=lambda job: self._on_revalidated(job, folder, char_path)
+        )
+
+    @staticmethod
+    def _revalidate_job(job, library_index, char_path):
+        """Worker thread: rescan mods whose nested folders changed since they were indexed."""
+        return library_index.revalidate(char_path)
+
+    def _on_revalidated(self, job, folder, char_path):
+        """Main thread: show rescanned sizes and instructions if the character is still selected."""
+        self.revalidating.discard(char_path)
+        if job.state == "failed":
+            print(f"Failed to revalidate {char_path}: {job.error}")
+            return
+        if job.result and self.winfo_exists():
+            self.library_index.save()
+            if folder == self.selected_character:
+                self._sync_mod_cards()
+
+    def _show_mods_status(self, text):
+        """Replace the mods grid with a status message."""
+        self.mods_grid.pack_forget()
+        self.mods_status_label.configure(text=text, font=ctk.CTkFont(size=12))
+        self.mods_status_label.pack(pady=0)
+
+    def _show_mod_entries(self, mod_entries, current_mods, keep_position=False):
+        """Show library index entries in the mods grid."""
+        self.mods_status_label.pack_forget()
+        self.mods_grid.pack(fill="both", expand=True, padx=10, pady=10)
+        self.mods_grid.set_items(
+            [(entry, self._is_installed(entry, current_mods)) for entry in mod_entries],
+            keep_position=keep_position
+        )
+
+    @staticmethod
+    def _is_installed(entry, current_mods):
+        """Check whether a library entry is installed; archives install under their name without extension."""
+        if entry["kind"] == "archive":
+            return os.path.splitext(entry["name"])[0] in current_mods
+        return entry["name"] in current_mods
+
+    def _start_watcher(self):
+        """Watch the mods_from directory and apply changes as they happen."""
+        if not self.mods_from or not os.path.isdir(self.mods_from):
+            return
+        self.watcher = LibraryWatcher(self.mods_from)
+        self.watcher.start()
+        self._check_watch_queue()
+
+    def _check_watch_queue(self):
+        """Drain filesystem change events from the watcher thread."""
+        events = []
+        try:
+            while True:
+                events.append(self.watcher.events.get_nowait())
+        except queue.Empty:
+            pass
         
-        # Create a frame for the grid layout
-        grid_frame = ctk.CTkFrame(self.mods_frame)
-        grid_frame.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        # Configure grid
-        mods_per_row = 3
-        for i in range(mods_per_row):
-            grid_frame.grid_columnconfigure(i, weight=1)
-        
-        # Display each mod as a card
-        for i, mod_folder in enumerate(subfolders):
-            row = i // mods_per_row
-            col = i % mods_per_row
-            
-            # Check if this mod is currently installed
-            is_current = mod_folder in current_mods
-            is_archive = mod_folder.lower().endswith(('.zip', '.rar'))
-            
-            print(f"Debug: Checking mod '{mod_folder}' - is_current: {is_current}")
-            
-            # Create mod card
-            mod_card = self._create_mod_card(grid_frame, mod_folder, is_current, is_archive)
-            mod_card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+        if events:
+            self._apply_library_changes(events)
+        
+        # Schedule next check
+        self._watch_after_id = self.after(500, self._check_watch_queue)
+
+    def _apply_library_changes(self, events):
+        """Update the character and mod grids for a batch of watcher events."""
+        root = os.path.abspath(self.mods_from)
+        changed_dirs = set()
+        rescan = False
+        for event in events:
+            if event.kind == "rescan":
+                rescan = True
+            elif event.kind == "renamed" and event.directory == root:
+                if self.match_cache.is_overridden(event.name):
+                    self.match_cache.set_override(event.new_name, self.match_cache.overrides[event.name])
+                    self.match_cache.clear_override(event.name)
+                if event.name == self.selected_character:
+                    self.selected_character = event.new_name
+            changed_dirs.add(event.directory)
+
+        if rescan or root in changed_dirs:
+            self.library_index.invalidate(self.mods_from)
+            self._sync_character_buttons()
+
+        if self.selected_character:
+            char_path = os.path.join(self.mods_from, self.selected_character)
+            if rescan or os.path.abspath(char_path) in changed_dirs:
+                self.library_index.invalidate(char_path)
+                self._sync_mod_cards()
+
+        self.library_index.save()
+
+    def _sync_character_buttons(self):
+        """Update the character grid to match the mods_from listing."""
+        if not os.path.isdir(self.mods_from):
+            self.populate_characters()
+            return
+        
+        subfolders = self.library_index.list_names(self.mods_from)
+        self._update_character_matches(subfolders)
+        self._show_character_folders(subfolders, keep_position=True)
+
+    def _sync_mod_cards(self):
+        """Update the mods grid to match the selected character's folder."""
+        char_path = os.path.join(self.mods_from, self.selected_character)
+        mod_entries = self.library_index.list_entries(char_path)
+        if not mod_entries:
+            self.show_character_mods(self.selected_character, self.selected_character_name)
+            return
+        
+        current_mods = self._get_current_mods(self.selected_character)
+        self._show_mod_entries(mod_entries, current_mods, keep_position=True)
+
+    def destroy(self):
+        """Stop the library watcher before destroying the tab."""
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self._watch_after_id is not None:
+            self.after_cancel(self._watch_after_id)
+        super().destroy()
 
     def _get_current_mods(self, character_folder):
         """Get list of currently installed mods for the character."""
@@ -180,11 +447,8 @@ class GameTab(ctk.CTkFrame):
         print(f"Debug: Current mod names: {current_mod_names}")
         return current_mod_names
 
-    def _create_mod_card(self, parent_frame, mod_folder, is_current, is_archive):
-        """Create a mod card widget."""
-        # Check for instructions
-        has_instructions = self._check_for_instructions(mod_folder) is not None
-        
+    def _create_mod_card(self, parent_frame):
+        """Create a mod card widget for the mods grid pool."""
         # Create callbacks dictionary
         callbacks = {
             'delete': self.mod_operations.delete_mod,
@@ -193,11 +457,12 @@ class GameTab(ctk.CTkFrame):
             'install': self.mod_operations.install_mod
         }
         
-        # Create the mod card using the ModCard helper
-        return ModCard.create_mod_card(
-            parent_frame, mod_folder, is_current, is_archive, 
-            has_instructions, callbacks
-        )
+        return ModCard(parent_frame, callbacks)
+
+    def _bind_mod_card(self, mod_card, item):
+        """Point a pooled mod card at a library index entry."""
+        entry, is_current = item
+        mod_card.bind_mod(entry["name"], is_current, entry["kind"] == "archive", entry["has_instructions"])
 
     def _check_for_instructions(self, mod_folder):
         """Check if a mod folder has an instructions file and return its content."""
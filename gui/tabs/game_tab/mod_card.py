@@ -1,218 +1,158 @@
 """
 Mod card widget for displaying individual mods.
 """
-import os
 import customtkinter as ctk
-from PIL import Image
+from gui.widgets.image_cache import get_image
 
-class ModCard:
-    """Helper class for creating mod cards."""
-    
-    @staticmethod
-    def create_mod_card(parent_frame, mod_folder, is_current, is_archive, 
-                       has_instructions, callbacks):
-        """Create a mod card widget."""
+class ModCard(ctk.CTkFrame):
+    """
+    Card showing one mod with its delete/instructions/install actions.
+
+    Cards are reusable: the mods grid keeps a small pool of them and calls
+    bind_mod() to point a card at another mod while scrolling.
+    """
+
+    def __init__(self, parent_frame, callbacks, **kwargs):
         # Main card frame
-        card_frame = ctk.CTkFrame(
+        super().__init__(
             parent_frame,
             width=200,
             height=280,
-            corner_radius=10
+            corner_radius=10,
+            **kwargs
         )
-        
-        # Add green background if currently installed
-        if is_current:
-            card_frame.configure(fg_color=("lightgreen", "darkgreen"))
-        
+        self.callbacks = callbacks
+        self.mod_folder = None
+        self.is_current = False
+        self.has_instructions = False
+        self.default_fg_color = self.cget("fg_color")
+
         # Image frame
-        image_frame = ctk.CTkFrame(card_frame, height=150, corner_radius=8)
+        image_frame = ctk.CTkFrame(self, height=150, corner_radius=8)
         image_frame.pack(fill="x", padx=10, pady=(10, 5))
         image_frame.pack_propagate(False)
-        
+
+        self.image_label = ctk.CTkLabel(image_frame, text="")
+        self.image_label.pack(expand=True, fill="both", padx=5, pady=5)
+
+        # Mod name
+        self.name_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(size=12, weight="bold"),
+            wraplength=180
+        )
+        self.name_label.pack(pady=(0, 5), fill="x", expand=True)
+
+        # Action buttons frame
+        buttons_frame = ctk.CTkFrame(self, height=40)
+        buttons_frame.pack(fill="x", padx=10, pady=(0, 10), side="bottom")
+        buttons_frame.pack_propagate(False)
+
+        # Delete button
+        self.delete_btn = self._create_icon_button(
+            buttons_frame, "assets/static/trash-2.png", "🗑️",
+            fg_color="red",
+            hover_color="darkred",
+            command=lambda: self.callbacks['delete'](self.mod_folder)
+        )
+        self.delete_btn.pack(side="left", padx=(5, 0))
+
+        # Right side buttons frame
+        self.right_buttons_frame = ctk.CTkFrame(buttons_frame, fg_color="transparent")
+        self.right_buttons_frame.pack(side="right", padx=(0, 5))
+
+        # Instructions button (only shown for folders)
+        self.instructions_btn = self._create_icon_button(
+            self.right_buttons_frame, "assets/static/info.png", "📄",
+            command=self._on_instructions
+        )
+
+        # Action buttons: extract for archives, install for both
+        self.extract_btn = self._create_icon_button(
+            self.right_buttons_frame, "assets/static/package-open.png", "📦",
+            fg_color="orange",
+            hover_color="darkorange",
+            command=lambda: self.callbacks['extract'](self.mod_folder)
+        )
+        self.install_btn = self._create_icon_button(
+            self.right_buttons_frame, "assets/static/arrow-down-from-line.png", "⬇️",
+            command=self._on_install
+        )
+
+    def bind_mod(self, mod_folder, is_current, is_archive, has_instructions):
+        """Show another mod in this card."""
+        self.mod_folder = mod_folder
+        self.is_current = is_current
+        self.has_instructions = has_instructions
+
+        # Add green background if currently installed
+        self.configure(fg_color=("lightgreen", "darkgreen") if is_current else self.default_fg_color)
+
         # Image (placeholder for now)
         if is_archive:
             image_path = "assets/static/file-archive.svg"
         else:
             image_path = "assets/static/placeholder.webp"
-        
+
         try:
-            image = ctk.CTkImage(
-                light_image=Image.open(image_path),
-                dark_image=Image.open(image_path),
-                size=(180, 140)
-            )
-            image_label = ctk.CTkLabel(image_frame, image=image, text="")
-            image_label.pack(expand=True, fill="both", padx=5, pady=5)
+            self.image_label.configure(image=get_image(image_path, (180, 140)), text="")
         except Exception as e:
             # Fallback if image fails to load
-            image_label = ctk.CTkLabel(
-                image_frame, 
+            self.image_label.configure(
+                image=None,
                 text="📁" if not is_archive else "📦",
                 font=ctk.CTkFont(size=48)
             )
-            image_label.pack(expand=True, fill="both")
-        
+
         # Mod name
         mod_display_name = mod_folder
         if is_current:
             mod_display_name += " (Current)"
-            
-        name_label = ctk.CTkLabel(
-            card_frame,
-            text=mod_display_name,
-            font=ctk.CTkFont(size=12, weight="bold"),
-            wraplength=180
-        )
-        name_label.pack(pady=(0, 5), fill="x", expand=True)
-        
-        # Action buttons frame
-        buttons_frame = ctk.CTkFrame(card_frame, height=40)
-        buttons_frame.pack(fill="x", padx=10, pady=(0, 10), side="bottom")
-        buttons_frame.pack_propagate(False)
-        
-        # Delete button
-        ModCard._create_delete_button(buttons_frame, mod_folder, callbacks['delete'])
-        
-        # Right side buttons frame
-        right_buttons_frame = ctk.CTkFrame(buttons_frame, fg_color="transparent")
-        right_buttons_frame.pack(side="right", padx=(0, 5))
-        
+        self.name_label.configure(text=mod_display_name)
+
         # Instructions button (only for folders)
+        self.instructions_btn.pack_forget()
+        self.extract_btn.pack_forget()
+        self.install_btn.pack_forget()
         if not is_archive:
-            ModCard._create_instructions_button(right_buttons_frame, mod_folder, 
-                                              has_instructions, callbacks['instructions'])
-        
-        # Action button
-        ModCard._create_action_button(right_buttons_frame, mod_folder, is_archive, 
-                                    is_current, callbacks)
-        
-        return card_frame
-    
-    @staticmethod
-    def _create_delete_button(buttons_frame, mod_folder, delete_callback):
-        """Create the delete button."""
-        try:
-            delete_icon = ctk.CTkImage(
-                light_image=Image.open("assets/static/trash-2.png"),
-                dark_image=Image.open("assets/static/trash-2.png"),
-                size=(16, 16)
-            )
-            delete_btn = ctk.CTkButton(
-                buttons_frame,
-                image=delete_icon,
-                text="",
-                width=30,
-                height=30,
-                fg_color="red",
-                hover_color="darkred",
-                command=lambda: delete_callback(mod_folder)
-            )
-        except Exception as e:
-            delete_btn = ctk.CTkButton(
-                buttons_frame,
-                text="🗑️",
-                width=30,
-                height=30,
-                font=ctk.CTkFont(size=14),
-                fg_color="red",
-                hover_color="darkred",
-                command=lambda: delete_callback(mod_folder)
-            )
-        delete_btn.pack(side="left", padx=(5, 0))
-    
-    @staticmethod
-    def _create_instructions_button(right_buttons_frame, mod_folder, has_instructions, instructions_callback):
-        """Create the instructions button."""
-        try:
-            info_icon = ctk.CTkImage(
-                light_image=Image.open("assets/static/info.png"),
-                dark_image=Image.open("assets/static/info.png"),
-                size=(16, 16)
-            )
-            instructions_btn = ctk.CTkButton(
-                right_buttons_frame,
-                image=info_icon,
-                text="",
-                width=30,
-                height=30,
+            self.instructions_btn.configure(
                 fg_color="blue" if has_instructions else "gray",
                 hover_color="darkblue" if has_instructions else "darkgray",
-                command=lambda: instructions_callback(mod_folder) if has_instructions else None,
                 state="normal" if has_instructions else "disabled"
             )
+            self.instructions_btn.pack(side="left", padx=(0, 2))
+
+        # Action buttons: archives can be extracted or installed directly
+        if is_archive:
+            self.extract_btn.pack(side="left", padx=(0, 2))
+        self.install_btn.configure(
+            fg_color="green" if not is_current else "gray",
+            hover_color="darkgreen" if not is_current else "darkgray",
+            state="normal" if not is_current else "disabled"
+        )
+        self.install_btn.pack(side="left", padx=(0, 0))
+
+    def _on_instructions(self):
+        if self.has_instructions:
+            self.callbacks['instructions'](self.mod_folder)
+
+    def _on_install(self):
+        if not self.is_current:
+            self.callbacks['install'](self.mod_folder)
+
+    @staticmethod
+    def _create_icon_button(parent, icon_path, fallback_text, **kwargs):
+        """Create a small square button with an icon, or an emoji if the icon fails to load."""
+        try:
+            icon = get_image(icon_path, (16, 16))
+            return ctk.CTkButton(parent, image=icon, text="", width=30, height=30, **kwargs)
         except Exception as e:
-            instructions_btn = ctk.CTkButton(
-                right_buttons_frame,
-                text="📄",
+            return ctk.CTkButton(
+                parent,
+                text=fallback_text,
                 width=30,
                 height=30,
                 font=ctk.CTkFont(size=14),
-                fg_color="blue" if has_instructions else "gray",
-                hover_color="darkblue" if has_instructions else "darkgray",
-                command=lambda: instructions_callback(mod_folder) if has_instructions else None,
-                state="normal" if has_instructions else "disabled"
+                **kwargs
             )
-        instructions_btn.pack(side="left", padx=(0, 2))
-    
-    @staticmethod
-    def _create_action_button(right_buttons_frame, mod_folder, is_archive, is_current, callbacks):
-        """Create the action button (install/extract)."""
-        if is_archive:
-            try:
-                extract_icon = ctk.CTkImage(
-                    light_image=Image.open("assets/static/package-open.png"),
-                    dark_image=Image.open("assets/static/package-open.png"),
-                    size=(16, 16)
-                )
-                action_btn = ctk.CTkButton(
-                    right_buttons_frame,
-                    image=extract_icon,
-                    text="",
-                    width=30,
-                    height=30,
-                    fg_color="orange",
-                    hover_color="darkorange",
-                    command=lambda: callbacks['extract'](mod_folder)
-                )
-            except Exception as e:
-                action_btn = ctk.CTkButton(
-                    right_buttons_frame,
-                    text="📦",
-                    width=30,
-                    height=30,
-                    font=ctk.CTkFont(size=14),
-                    fg_color="orange",
-                    hover_color="darkorange",
-                    command=lambda: callbacks['extract'](mod_folder)
-                )
-        else:
-            try:
-                install_icon = ctk.CTkImage(
-                    light_image=Image.open("assets/static/arrow-down-from-line.png"),
-                    dark_image=Image.open("assets/static/arrow-down-from-line.png"),
-                    size=(16, 16)
-                )
-                action_btn = ctk.CTkButton(
-                    right_buttons_frame,
-                    image=install_icon,
-                    text="",
-                    width=30,
-                    height=30,
-                    fg_color="green" if not is_current else "gray",
-                    hover_color="darkgreen" if not is_current else "darkgray",
-                    command=lambda: callbacks['install'](mod_folder) if not is_current else None,
-                    state="normal" if not is_current else "disabled"
-                )
-            except Exception as e:
-                action_btn = ctk.CTkButton(
-                    right_buttons_frame,
-                    text="⬇️",
-                    width=30,
-                    height=30,
-                    font=ctk.CTkFont(size=14),
-                    fg_color="green" if not is_current else "gray",
-                    hover_color="darkgreen" if not is_current else "darkgray",
-                    command=lambda: callbacks['install'](mod_folder) if not is_current else None,
-                    state="normal" if not is_current else "disabled"
-                )
-        action_btn.pack(side="left", padx=(0, 0)) 
\ No newline at end of file
@@ -2,18 +2,41 @@
 Mod operations for installing, extracting, and deleting mods.
 """
 import os
-import threading
 import customtkinter as ctk
-from utils.file_operations import copy_mod_folder
-from utils.zip.extract import extract_archive
+from utils.copy_progress import InstallCancelled
+from utils.file_operations import copy_mod_folder, install_archive
+from utils.link_tree import DEFAULT_STRATEGY, REFLINK, HARDLINK, SYMLINK
+from utils.staged_install import undo_last_install
+from utils.jobs import get_job_queue
+from utils.loadouts import capture_loadout, apply_loadout
+from utils.mod_index import ARCHIVE_EXTENSIONS
+from utils.zip.extract import extract_archive, ExtractionCancelled
 from gui.widgets.extraction_progress import ExtractionProgressWindow
 
+DEFAULT_EXTRACT_WORKERS = 2
+DEFAULT_INSTALL_WORKERS = 2
+
+# How the install toast describes each install strategy
+INSTALL_VERBS = {
+    REFLINK: "cloned into",
+    HARDLINK: "hard-linked into",
+    SYMLINK: "linked into",
+    "delta": "updated in",
+    "extract": "extracted to",
+}
+
 class ModOperations:
     """Helper class for mod operations."""
     
     def __init__(self, game_tab):
         self.game_tab = game_tab
         self.progress_window = None
+        self.extraction_queue = get_job_queue("extract", DEFAULT_EXTRACT_WORKERS)
+        self.install_queue = get_job_queue("install", DEFAULT_INSTALL_WORKERS)
+        self.extraction_jobs = []
+        self.install_jobs = []
+        self.queued_archives = set()
+        self.installing_characters = set()
     
     def delete_mod(self, mod_folder):
         """Delete a mod folder."""
@@ -22,7 +45,8 @@ class ModOperations:
                 self.game_tab.toast_manager.show_toast("No character selected.", "error", 3000)
             return
         
-        mod_path = os.path.join(self.game_tab.mods_from, self.game_tab.selected_character, mod_folder)
+        char_path = os.path.join(self.game_tab.mods_from, self.game_tab.selected_character)
+        mod_path = os.path.join(char_path, mod_folder)
         
         try:
             import shutil
@@ -30,6 +54,7 @@ class ModOperations:
                 shutil.rmtree(mod_path)
             else:
                 os.remove(mod_path)
+            self.game_tab.library_index.invalidate(char_path)
             
             if self.game_tab.toast_manager:
                 self.game_tab.toast_manager.show_toast(f"Deleted {mod_folder}", "success", 3000)
@@ -47,74 +72,421 @@ class ModOperations:
                 self.game_tab.toast_manager.show_toast("No character selected.", "error", 3000)
             return
 
-        char_path = os.path.join(self.game_tab.mods_from, self.game_tab.selected_character)
-        archive_path = os.path.join(char_path, mod_folder)
-        
-        # Create progress window
-        self.progress_window = ExtractionProgressWindow(self.game_tab, total_files=1)
-        
-        # Start extraction in a separate thread
-        thread = threading.Thread(
-            target=self._extract_archive_thread,
-            args=(archive_path, char_path, mod_folder),
-            daemon=True
-        )
-        thread.start()
+        self._queue_extractions([(self.game_tab.selected_character, mod_folder)])
 
-    def _extract_archive_thread(self, archive_path, char_path, mod_folder):
-        """Thread function for archive extraction."""
-        success = extract_archive(archive_path, char_path, self.progress_window)
-        
-        if success:
-            self.progress_window.update_progress(mod_folder, True)
+    def extract_character_archives(self):
+        """Extract every archive of the selected character."""
+        if not self.game_tab.selected_character:
             if self.game_tab.toast_manager:
-                self.game_tab.toast_manager.show_toast(
-                    f"Successfully extracted {mod_folder}!",
-                    "success",
-                    3000
-                )
-            # Refresh the mod list after a short delay
-            self.game_tab.after(1000, self._refresh_mod_list)
-        else:
-            self.progress_window.update_progress(mod_folder, False)
+                self.game_tab.toast_manager.show_toast("No character selected.", "error", 3000)
+            return
+
+        self._queue_extractions(self._find_archives([self.game_tab.selected_character]))
+
+    def extract_all_archives(self):
+        """Extract every archive in the mods_from directory."""
+        character_folders = self.game_tab.library_index.list_names(self.game_tab.mods_from)
+        self._queue_extractions(self._find_archives(character_folders))
+
+    def _find_archives(self, character_folders):
+        """List (character folder, archive) pairs in the given character folders."""
+        archives = []
+        for character_folder in character_folders:
+            char_path = os.path.join(self.game_tab.mods_from, character_folder)
+            for entry in self.game_tab.library_index.list_entries(char_path, details=False):
+                if entry["kind"] == "archive":
+                    archives.append((character_folder, entry["name"]))
+        self.game_tab.library_index.save()
+        return archives
+
+    def _queue_extractions(self, archives):
+        """Queue archive extractions and show them in the shared progress window."""
+        archive_paths = [
+            (os.path.join(self.game_tab.mods_from, character_folder), archive)
+            for character_folder, archive in archives
+        ]
+        archive_paths = [
+            (char_path, archive) for char_path, archive in archive_paths
+            if os.path.join(char_path, archive) not in self.queued_archives
+        ]
+        if not archive_paths:
             if self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast("No archives to extract.", "info", 3000)
+            return
+
+        self._open_progress_window()
+        self.extraction_queue.set_workers(self._extraction_workers())
+        for char_path, archive in archive_paths:
+            archive_path = os.path.join(char_path, archive)
+            self.queued_archives.add(archive_path)
+            job = self.extraction_queue.submit(
+                self.game_tab,
+                self._extract_archive_job,
+                archive_path,
+                char_path,
+                label=archive,
+                on_progress=self._on_extraction_progress,
+                on_done=lambda job, path=archive_path, folder=char_path: self._on_extraction_done(job, path, folder)
+            )
+            self.extraction_jobs.append(job)
+            self.progress_window.add_job(job)
+
+    def _extraction_workers(self):
+        """Get the configured number of parallel extractions."""
+        archive_settings = self.game_tab.settings.get("archive_settings", {})
+        try:
+            return max(1, int(archive_settings.get("extract_workers", DEFAULT_EXTRACT_WORKERS)))
+        except (TypeError, ValueError):
+            return DEFAULT_EXTRACT_WORKERS
+
+    @staticmethod
+    def _extract_archive_job(job, archive_path, char_path):
+        """Worker thread: extract one archive next to it, streaming progress to the window."""
+        success = extract_archive(
+            archive_path,
+            char_path,
+            progress=lambda progress: job.report(**progress),
+            is_cancelled=job.is_cancelled
+        )
+        if not success and not job.is_cancelled():
+            raise RuntimeError("extraction failed")
+
+    def _cancel_extractions(self):
+        """Cancel the extractions and installs queued from this tab."""
+        for job in self.extraction_jobs + self.install_jobs:
+            job.cancel()
+
+    def _on_extraction_progress(self, job, progress):
+        """Main thread: show a job's new state."""
+        if self.progress_window is not None and self.progress_window.winfo_exists():
+            self.progress_window.update_job(job)
+
+    def _on_extraction_done(self, job, archive_path, char_path):
+        """Main thread: record a finished extraction and summarize the batch when all are done."""
+        self.queued_archives.discard(archive_path)
+        self.game_tab.library_index.invalidate(char_path)
+        self._on_extraction_progress(job, {})
+
+        if self.game_tab.selected_character and os.path.abspath(char_path) == os.path.abspath(
+                os.path.join(self.game_tab.mods_from, self.game_tab.selected_character)):
+            self._refresh_mod_list()
+
+        if any(not pending.finished for pending in self.extraction_jobs):
+            return
+
+        done = [finished.label for finished in self.extraction_jobs if finished.state == "done"]
+        failed = [finished.label for finished in self.extraction_jobs if finished.state == "failed"]
+        self.extraction_jobs = []
+        if self.game_tab.toast_manager:
+            if failed:
                 self.game_tab.toast_manager.show_toast(
-                    f"Failed to extract {mod_folder}.",
+                    f"Failed to extract {', '.join(failed)}.",
                     "error",
                     5000
                 )
+            elif len(done) == 1:
+                self.game_tab.toast_manager.show_toast(f"Successfully extracted {done[0]}!", "success", 3000)
+            elif done:
+                self.game_tab.toast_manager.show_toast(f"Successfully extracted {len(done)} archives!", "success", 3000)
 
     def install_mod(self, mod_folder):
-        """Install a mod folder."""
-        if not self.game_tab.selected_character:
+        """Queue the install of a mod folder or archive for the selected character."""
+        character_folder = self.game_tab.selected_character
+        if not character_folder:
             if self.game_tab.toast_manager:
                 self.game_tab.toast_manager.show_toast("No character selected.", "error", 3000)
             return
+        if character_folder in self.installing_characters:
+            if self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast("An install for this character is already running.", "info", 3000)
+            return
+        if not self.game_tab.mods_to or not os.path.isdir(self.game_tab.mods_to):
+            if self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast("Mods To directory not found.", "error", 5000)
+            return
+
+        source_path = os.path.join(self.game_tab.mods_from, character_folder, mod_folder)
 
-        source_path = os.path.join(self.game_tab.mods_from, self.game_tab.selected_character, mod_folder)
-        dest_path = os.path.join(self.game_tab.mods_to, mod_folder)
+        # Archives are streamed straight into the game folder
+        if mod_folder.lower().endswith(ARCHIVE_EXTENSIONS):
+            self._queue_archive_install(source_path, character_folder, mod_folder)
+            return
 
-        if copy_mod_folder(source_path, dest_path, self.game_tab.game):
+        install_settings = self.game_tab.settings.get("install_settings", {})
+        self._open_progress_window()
+        self.installing_characters.add(character_folder)
+        job = self.install_queue.submit(
+            self.game_tab,
+            self._install_folder_job,
+            source_path,
+            os.path.join(self.game_tab.mods_to, mod_folder),
+            self.game_tab.game,
+            install_settings.get("strategy", DEFAULT_STRATEGY),
+            install_settings.get("delta", 1) == 1,
+            install_settings.get("delta_hash", 0) == 1,
+            label=f"{mod_folder} → game",
+            on_progress=self._on_extraction_progress,
+            on_done=lambda job: self._on_install_done(job, character_folder, mod_folder)
+        )
+        self.install_jobs.append(job)
+        self.progress_window.add_job(job)
+
+    @staticmethod
+    def _install_folder_job(job, source_path, dest_path, game, strategy, delta, use_hash):
+        """Worker thread: install a library folder into the game's mods folder."""
+        try:
+            return copy_mod_folder(
+                source_path,
+                dest_path,
+                game,
+                strategy,
+                delta=delta,
+                use_hash=use_hash,
+                progress=lambda progress: job.report(**progress),
+                is_cancelled=job.is_cancelled
+            )
+        except InstallCancelled:
+            return None
+
+    def undo_last_install(self):
+        """Queue putting back the mods the selected character had before its last install."""
+        character_folder = self.game_tab.selected_character
+        if not character_folder:
+            if self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast("No character selected.", "error", 3000)
+            return
+        if character_folder in self.installing_characters:
+            if self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast("Wait for the running install to finish.", "info", 3000)
+            return
+
+        self._open_progress_window()
+        self.installing_characters.add(character_folder)
+        job = self.install_queue.submit(
+            self.game_tab,
+            self._undo_install_job,
+            self.game_tab.mods_to,
+            character_folder,
+            label=f"Undo {character_folder} install",
+            on_progress=self._on_extraction_progress,
+            on_done=lambda job: self._on_undo_done(job, character_folder)
+        )
+        self.install_jobs.append(job)
+        self.progress_window.add_job(job)
+
+    @staticmethod
+    def _undo_install_job(job, mods_to, character_folder):
+        """Worker thread: swap the backed-up mods back in and remove the installed one."""
+        return undo_last_install(mods_to, character_folder)
+
+    def _on_undo_done(self, job, character_folder):
+        """Main thread: report an undone install."""
+        self.installing_characters.discard(character_folder)
+        self.install_jobs.remove(job)
+        self._on_extraction_progress(job, {})
+        if job.state == "failed":
+            if self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast(f"Failed to undo install: {job.error}", "error", 5000)
+            return
+        if job.state != "done":
+            return
+
+        restored = job.result
+        if self.game_tab.toast_manager:
+            if restored:
+                self.game_tab.toast_manager.show_toast(f"Restored {', '.join(restored)}.", "success", 3000)
+            else:
+                self.game_tab.toast_manager.show_toast("Removed the last installed mod.", "success", 3000)
+        if character_folder == self.game_tab.selected_character:
+            self._refresh_mod_list()
+
+    def save_loadout(self):
+        """Ask for a name and save every character's installed mod as a loadout."""
+        if not self.game_tab.mods_to or not os.path.isdir(self.game_tab.mods_to):
+            if self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast("Mods To directory not found.", "error", 5000)
+            return
+
+        dialog = ctk.CTkInputDialog(text="Loadout name:", title="Save Loadout")
+        name = (dialog.get_input() or "").strip()
+        if not name:
+            return
+
+        mapping = capture_loadout(
+            self.game_tab.mods_from,
+            self.game_tab.mods_to,
+            self.game_tab.library_index.list_names(self.game_tab.mods_from)
+        )
+        if not mapping:
+            if self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast("No installed mods to save.", "info", 3000)
+            return
+
+        self.game_tab.loadouts.set(name, mapping)
+        success, error = self.game_tab.loadouts.save()
+        if self.game_tab.toast_manager:
+            if success:
+                self.game_tab.toast_manager.show_toast(
+                    f"Saved loadout '{name}' with {len(mapping)} characters.", "success", 3000
+                )
+            else:
+                self.game_tab.toast_manager.show_toast(error, "error", 5000)
+
+    def delete_loadout(self, name):
+        """Delete a saved loadout."""
+        self.game_tab.loadouts.delete(name)
+        success, error = self.game_tab.loadouts.save()
+        if self.game_tab.toast_manager:
+            if success:
+                self.game_tab.toast_manager.show_toast(f"Deleted loadout '{name}'.", "success", 3000)
+            else:
+                self.game_tab.toast_manager.show_toast(error, "error", 5000)
+
+    def apply_loadout(self, name):
+        """Queue one job installing every character of a loadout whose mod differs."""
+        if not self.game_tab.mods_to or not os.path.isdir(self.game_tab.mods_to):
+            if self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast("Mods To directory not found.", "error", 5000)
+            return
+
+        mapping = self.game_tab.loadouts.get(name)
+        characters = set(mapping)
+        if characters & self.installing_characters:
             if self.game_tab.toast_manager:
                 self.game_tab.toast_manager.show_toast(
-                    f"Successfully installed '{mod_folder}'!\nThe mod has been copied to your game directory.",
+                    "Wait for the running installs to finish before applying a loadout.", "info", 3000
+                )
+            return
+
+        self._open_progress_window()
+        self.installing_characters.update(characters)
+        job = self.install_queue.submit(
+            self.game_tab,
+            self._apply_loadout_job,
+            self.game_tab.mods_from,
+            self.game_tab.mods_to,
+            mapping,
+            dict(self.game_tab.settings.get("install_settings", {})),
+            label=f"Loadout '{name}'",
+            on_progress=self._on_extraction_progress,
+            on_done=lambda job: self._on_loadout_done(job, name, characters)
+        )
+        self.install_jobs.append(job)
+        self.progress_window.add_job(job)
+
+    @staticmethod
+    def _apply_loadout_job(job, mods_from, mods_to, mapping, install_settings):
+        """Worker thread: install the characters of a loadout in parallel."""
+        return apply_loadout(
+            mods_from,
+            mods_to,
+            mapping,
+            install_settings,
+            progress=lambda progress: job.report(**progress),
+            is_cancelled=job.is_cancelled
+        )
+
+    def _on_loadout_done(self, job, name, characters):
+        """Main thread: summarize an applied loadout and refresh the mod list once."""
+        self.installing_characters.difference_update(characters)
+        self.install_jobs.remove(job)
+        self._on_extraction_progress(job, {})
+        result = job.result
+        if job.state == "failed" or result is None:
+            if job.state == "failed" and self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast(f"Failed to apply loadout '{name}': {job.error}", "error", 5000)
+            return
+
+        summary = f"{len(result.installed)} installed, {len(result.unchanged)} unchanged"
+        if result.missing:
+            summary += f", {len(result.missing)} missing from the library"
+        if result.failed:
+            summary += f", {len(result.failed)} failed ({', '.join(sorted(result.failed))})"
+        if self.game_tab.toast_manager:
+            self.game_tab.toast_manager.show_toast(
+                f"{'Cancelled' if result.cancelled else 'Applied'} loadout '{name}': {summary}.",
+                "error" if result.failed else "success",
+                5000 if result.failed else 4000
+            )
+        if self.game_tab.selected_character:
+            self._refresh_mod_list()
+
+    def _queue_archive_install(self, archive_path, character_folder, archive):
+        """Queue a direct archive install and show it in the shared progress window."""
+        if archive_path in self.queued_archives:
+            return
+
+        self._open_progress_window()
+        self.extraction_queue.set_workers(self._extraction_workers())
+        self.queued_archives.add(archive_path)
+        self.installing_characters.add(character_folder)
+        job = self.extraction_queue.submit(
+            self.game_tab,
+            self._install_archive_job,
+            archive_path,
+            self.game_tab.mods_to,
+            character_folder,
+            label=f"{archive} → game",
+            on_progress=self._on_extraction_progress,
+            on_done=lambda job: self._on_install_done(job, character_folder, archive, archive_path)
+        )
+        self.install_jobs.append(job)
+        self.progress_window.add_job(job)
+
+    @staticmethod
+    def _install_archive_job(job, archive_path, mods_to, character_folder):
+        """Worker thread: stream an archive into the game's mods folder."""
+        try:
+            return install_archive(
+                archive_path,
+                mods_to,
+                character_folder,
+                progress=lambda progress: job.report(**progress),
+                is_cancelled=job.is_cancelled
+            )
+        except ExtractionCancelled:
+            return None
+
+    def _on_install_done(self, job, character_folder, mod_name, archive_path=None):
+        """Main thread: report a finished folder or archive install."""
+        self.installing_characters.discard(character_folder)
+        if archive_path is not None:
+            self.queued_archives.discard(archive_path)
+        self.install_jobs.remove(job)
+        self._on_extraction_progress(job, {})
+        if job.state == "done" and job.result is not None:
+            verb = INSTALL_VERBS.get(job.result.strategy, "copied to")
+            dropped = f"\n{job.result.files_dropped} files of the previous version were removed." \
+                if job.result.files_dropped else ""
+            if self.game_tab.toast_manager:
+                self.game_tab.toast_manager.show_toast(
+                    f"Successfully installed '{mod_name}'!\nThe mod has been {verb} your game directory.{dropped}",
                     "success",
-                    4000
+                    4000,
+                    key="install-done",
+                    summary="Installed {count} mods"
                 )
             # Refresh the mod list to update the green border
-            self._refresh_mod_list()
-        else:
+            if character_folder == self.game_tab.selected_character:
+                self._refresh_mod_list()
+        elif job.state == "failed":
             if self.game_tab.toast_manager:
                 self.game_tab.toast_manager.show_toast(
-                    f"Failed to install '{mod_folder}'.",
+                    f"Failed to install '{mod_name}': {job.error}",
                     "error",
-                    5000
+                    5000,
+                    key="install-failed",
+                    summary="Failed to install {count} mods, see the progress window"
                 )
-    
+
+    def _open_progress_window(self):
+        """Show the shared progress window, creating it if it was closed."""
+        if self.progress_window is None or not self.progress_window.winfo_exists():
+            self.progress_window = ExtractionProgressWindow(self.game_tab, on_cancel=self._cancel_extractions)
+
     def _refresh_mod_list(self):
         """Refresh the mod list display."""
-        from utils.character_matcher import match_character
         self.game_tab.show_character_mods(
             self.game_tab.selected_character,
-            match_character(self.game_tab.selected_character, self.game_tab.character_list)
+            self.game_tab.match_cache.match(self.game_tab.selected_character)
         ) 
\ No newline at end of file
@@ -10,6 +10,7 @@ import queue
 from config.constants import GAME_TABS
 from config.settings import save_data
 from utils.icons.get_icons import get_icons
+from utils.link_tree import STRATEGIES, DEFAULT_STRATEGY
 import os
 import sys
 
@@ -227,6 +228,66 @@ class SettingsTab(ctk.CTkFrame):
         )
         self.delete_after_extract.pack(padx=10, pady=5, anchor="w")
         
+        # Number of archives extracted at the same time
+        workers_frame = ctk.CTkFrame(archive_frame, fg_color="transparent")
+        workers_frame.pack(padx=10, pady=5, anchor="w")
+        ctk.CTkLabel(
+            workers_frame,
+            text="Parallel extractions:",
+            font=ctk.CTkFont(size=12)
+        ).pack(side="left")
+        self.extract_workers = ctk.CTkOptionMenu(
+            workers_frame,
+            values=[str(n) for n in range(1, 9)],
+            width=70
+        )
+        self.extract_workers.pack(side="left", padx=5)
+        
+        # Add Mod Installation section
+        ctk.CTkLabel(
+            self, 
+            text="Mod Installation", 
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(pady=10)
+        
+        install_frame = ctk.CTkFrame(self)
+        install_frame.pack(fill="x", padx=10, pady=5)
+        
+        # First install method to try; later ones are fallbacks
+        strategy_frame = ctk.CTkFrame(install_frame, fg_color="transparent")
+        strategy_frame.pack(padx=10, pady=5, anchor="w")
+        ctk.CTkLabel(
+            strategy_frame,
+            text="Install method:",
+            font=ctk.CTkFont(size=12)
+        ).pack(side="left")
+        self.install_strategy = ctk.CTkOptionMenu(
+            strategy_frame,
+            values=list(STRATEGIES),
+            width=110
+        )
+        self.install_strategy.pack(side="left", padx=5)
+        ctk.CTkLabel(
+            strategy_frame,
+            text="(falls back to the next method when unavailable)",
+            font=ctk.CTkFont(size=11),
+            text_color="gray"
+        ).pack(side="left", padx=5)
+        
+        # Replacing a mod only copies the files that changed
+        self.delta_install = ctk.CTkCheckBox(
+            install_frame,
+            text="Only copy changed files when replacing an installed mod",
+            font=ctk.CTkFont(size=12)
+        )
+        self.delta_install.pack(padx=10, pady=5, anchor="w")
+        self.delta_hash = ctk.CTkCheckBox(
+            install_frame,
+            text="Compare file contents when timestamps differ (slower)",
+            font=ctk.CTkFont(size=12)
+        )
+        self.delta_hash.pack(padx=10, pady=5, anchor="w")
+        
         ctk.CTkLabel(
             self, 
             text="Update Characters", 
@@ -264,6 +325,15 @@ class SettingsTab(ctk.CTkFrame):
         if "archive_settings" in self.game_paths:
             should_delete = self.game_paths["archive_settings"].get("delete_after_extract", 0)
             self.delete_after_extract.select() if should_delete == 1 else self.delete_after_extract.deselect()
+            self.extract_workers.set(str(self.game_paths["archive_settings"].get("extract_workers", 2)))
+        else:
+            self.extract_workers.set("2")
+        
+        # Load install settings
+        install_settings = self.game_paths.get("install_settings", {})
+        self.install_strategy.set(install_settings.get("strategy", DEFAULT_STRATEGY))
+        self.delta_install.select() if install_settings.get("delta", 1) == 1 else self.delta_install.deselect()
+        self.delta_hash.select() if install_settings.get("delta_hash", 0) == 1 else self.delta_hash.deselect()
 
     def _browse_dir(self, entry):
         """Browse for directory and update entry."""
@@ -306,7 +376,15 @@ class SettingsTab(ctk.CTkFrame):
         
         # Save archive settings
         self.game_paths["archive_settings"] = {
-            "delete_after_extract": self.delete_after_extract.get()
+            "delete_after_extract": self.delete_after_extract.get(),
+            "extract_workers": int(self.extract_workers.get())
+        }
+        
+        # Save install settings
+        self.game_paths["install_settings"] = {
+            "strategy": self.install_strategy.get(),
+            "delta": self.delta_install.get(),
+            "delta_hash": self.delta_hash.get()
         }
         
         success, error = save_data(self.game_paths)
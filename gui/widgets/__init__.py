@@ -2,14 +2,20 @@
 
 from .custom_widgets import ImageButton, CharacterImageButton
 from .extraction_progress import ExtractionProgressWindow
-from .toast import ToastNotification, ToastManager, show_success, show_error, show_info, show_warning
+from .image_cache import ImageCache, get_image, get_fitted_image, get_native_image
+from .toast import ToastNotification, ToastManager, get_toast_manager, show_success, show_error, show_info, show_warning
 
 __all__ = [
     'ImageButton', 
     'CharacterImageButton', 
     'ExtractionProgressWindow',
+    'ImageCache',
+    'get_image',
+    'get_fitted_image',
+    'get_native_image',
     'ToastNotification',
     'ToastManager',
+    'get_toast_manager',
     'show_success',
     'show_error', 
     'show_info',
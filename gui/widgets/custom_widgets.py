@@ -3,7 +3,9 @@ Custom widget implementations for the Mod Manager.
 """
 import customtkinter as ctk
 import os
-from PIL import Image
+import sys
+from utils.icons.thumbnails import get_thumbnail_path
+from .image_cache import image_cache
 
 class ModButton(ctk.CTkButton):
     """Custom button for mod selection."""
@@ -23,12 +25,17 @@ class CharacterButton(ctk.CTkButton):
 class ImageButton(ctk.CTkFrame):
     """Custom button with image and text label."""
     
-    def __init__(self, master, image_path, text, command, width=120, height=140, **kwargs):
+    IMAGE_SIZE = 80  # Maximum size for the image
+    
+    def __init__(self, master, image_path, text, command, width=120, height=140, prescaled=False,
+                 context_command=None, **kwargs):
         super().__init__(master, width=width, height=height, **kwargs)
         
         self.command = command
+        self.context_command = context_command
         self.text = text
         self.image_path = image_path
+        self.prescaled = prescaled
         self.is_hovered = False
         
         # Store the original fg_color 
@@ -59,6 +66,11 @@ class ImageButton(ctk.CTkFrame):
         self.image_label.bind("<Button-1>", self._on_click)
         self.text_label.bind("<Button-1>", self._on_click)
         
+        # Bind right-click events (Button-2 on macOS)
+        context_button = "<Button-2>" if sys.platform == "darwin" else "<Button-3>"
+        for widget in (self, self.image_label, self.text_label):
+            widget.bind(context_button, self._on_context)
+        
         # Hover effects
         self.bind("<Enter>", self._on_hover)
         self.bind("<Leave>", self._on_leave)
@@ -68,45 +80,53 @@ class ImageButton(ctk.CTkFrame):
         self.text_label.bind("<Leave>", self._on_leave)
         
     def load_image(self):
-        """Load and display the character image."""
-        try:
-            if os.path.exists(self.image_path):
-                # Load image with PIL
-                pil_image = Image.open(self.image_path)
-                
-                # Resize image to fit button (maintaining aspect ratio)
-                img_width, img_height = pil_image.size
-                max_size = 80  # Maximum size for the image
-                
-                if img_width > img_height:
-                    new_width = max_size
-                    new_height = int((max_size * img_height) / img_width)
-                else:
-                    new_height = max_size
-                    new_width = int((max_size * img_width) / img_height)
-                
-                pil_image = pil_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                
-                # Create CTkImage instead of PhotoImage
-                self.ctk_image = ctk.CTkImage(
-                    light_image=pil_image,
-                    dark_image=pil_image,
-                    size=(new_width, new_height)
-                )
-                self.image_label.configure(image=self.ctk_image)
-            else:
-                # Show placeholder if image not found
-                self.image_label.configure(text="No Image", font=ctk.CTkFont(size=10))
-                
-        except Exception as e:
-            print(f"Error loading image {self.image_path}: {e}")
-            self.image_label.configure(text="Error", font=ctk.CTkFont(size=10))
+        """Load and display the character image without blocking the UI."""
+        if not os.path.exists(self.image_path):
+            # Show placeholder if image not found
+            self.image_label.configure(image=None, text="No Image", font=ctk.CTkFont(size=10))
+            return
+        
+        # Placeholder until the worker pool has decoded the image
+        self.image_label.configure(image=None, text="…", font=ctk.CTkFont(size=10))
+        
+        # Shared cache decodes and resizes each icon only once
+        spec = ("native", None) if self.prescaled else ("fit", self.IMAGE_SIZE)
+        image_path = self.image_path
+        image_cache.request_image(
+            self, image_path, spec,
+            lambda image, error: self._on_image_loaded(image_path, image, error)
+        )
+    
+    def _on_image_loaded(self, image_path, image, error):
+        """Show a decoded image unless the button was rebound or destroyed meanwhile."""
+        if image_path != self.image_path or not self.winfo_exists():
+            return
+        if error is not None:
+            print(f"Error loading image {self.image_path}: {error}")
+            self.image_label.configure(image=None, text="Error", font=ctk.CTkFont(size=10))
+            return
+        self.ctk_image = image
+        self.image_label.configure(image=self.ctk_image, text="")
+    
+    def set_content(self, image_path, text, prescaled=False):
+        """Show another image and label in this button."""
+        self.text = text
+        self.text_label.configure(text=text)
+        if image_path != self.image_path or prescaled != self.prescaled:
+            self.image_path = image_path
+            self.prescaled = prescaled
+            self.load_image()
     
     def _on_click(self, event=None):
         """Handle click event."""
         if self.command:
             self.command()
     
+    def _on_context(self, event):
+        """Handle right-click event."""
+        if self.context_command:
+            self.context_command(event)
+    
     def _on_hover(self, event=None):
         """Handle hover enter."""
         if not self.is_hovered:
@@ -123,40 +143,68 @@ class ImageButton(ctk.CTkFrame):
 class CharacterImageButton(ImageButton):
     """Specialized image button for characters."""
     
-    def __init__(self, master, character_name, folder_name, game_name, on_click, **kwargs):
-        # Construct image path - check for .webp first, then other formats
-        base_path = os.path.join("assets", "character_icons", game_name, "icons", folder_name)
-        image_path = None
-        
-        # Check for various image formats including .webp
-        name_error = True
-        for ext in ['.webp', '.png', '.jpg', '.jpeg', '.gif', '.bmp']:
-            test_path = f"{base_path}{ext}"
-            if os.path.exists(test_path):
-                image_path = test_path
-                name_error = False
-                break
-        if name_error and image_path is None:
-            character_name_from_path = base_path.split("\\")[-1]
-            new_base_path = base_path.replace(character_name_from_path, character_name_from_path.replace(" ", "_"))
-            for ext in ['.webp', '.png', '.jpg', '.jpeg', '.gif', '.bmp']:
-                test_path = f"{new_base_path}{ext}"
-                if os.path.exists(test_path):
-                    image_path = test_path
-                    name_error = False
-                    break
-        # Fallback to original .png path if nothing found
-        if image_path is None:
-            image_path = f"{base_path}.png"
+    def __init__(self, master, character_name, folder_name, game_name, on_click, on_context=None, **kwargs):
+        self.character_name = character_name
+        self.folder_name = folder_name
+        self.game_name = game_name
+        image_path, prescaled = find_character_icon(game_name, folder_name, self.IMAGE_SIZE)
         
         super().__init__(
             master=master,
             image_path=image_path,
             text=character_name,
-            command=lambda: on_click(folder_name, character_name),
+            command=lambda: on_click(self.folder_name, self.character_name),
+            prescaled=prescaled,
+            context_command=(lambda event: on_context(event, self.folder_name)) if on_context else None,
             **kwargs
         )
-        
+    
+    def bind_character(self, character_name, folder_name):
+        """Show another character folder in this button."""
         self.character_name = character_name
         self.folder_name = folder_name
-        self.game_name = game_name
\ No newline at end of file
+        image_path, prescaled = find_character_icon(self.game_name, folder_name, self.IMAGE_SIZE)
+        self.set_content(image_path, character_name, prescaled)
+
+def find_character_icon(game_name, folder_name, size):
+    """
+    Find the icon to show for a character folder.
+    
+    Args:
+        game_name (str): Game name
+        folder_name (str): Character folder name
+        size (int): Displayed icon size
+    
+    Returns:
+        tuple: (image path, True if it is a pre-baked thumbnail of that size)
+    """
+    # Construct image path - check for .webp first, then other formats
+    base_path = os.path.join("assets", "character_icons", game_name, "icons", folder_name)
+    image_path = None
+    
+    # Check for various image formats including .webp
+    name_error = True
+    for ext in ['.webp', '.png', '.jpg', '.jpeg', '.gif', '.bmp']:
+        test_path = f"{base_path}{ext}"
+        if os.path.exists(test_path):
+            image_path = test_path
+            name_error = False
+            break
+    if name_error and image_path is None:
+        character_name_from_path = base_path.split("\\")[-1]
+        new_base_path = base_path.replace(character_name_from_path, character_name_from_path.replace(" ", "_"))
+        for ext in ['.webp', '.png', '.jpg', '.jpeg', '.gif', '.bmp']:
+            test_path = f"{new_base_path}{ext}"
+            if os.path.exists(test_path):
+                image_path = test_path
+                name_error = False
+                break
+    # Fallback to original .png path if nothing found
+    if image_path is None:
+        image_path = f"{base_path}.png"
+    
+    # Prefer the pre-baked thumbnail, which needs no resampling
+    thumbnail_path = get_thumbnail_path(game_name, image_path, size)
+    if thumbnail_path:
+        return thumbnail_path, True
+    return image_path, False
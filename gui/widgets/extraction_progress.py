@@ -1,86 +1,143 @@
 """
-Extraction progress window for archive operations.
+Progress window for archive extractions and mod installs.
 """
 import customtkinter as ctk
 from tkinter import ttk
 
 class ExtractionProgressWindow(ctk.CTkToplevel):
-    """Window to show extraction progress."""
-    
-    def __init__(self, parent, total_files=1):
+    """
+    Non-modal window showing the progress of a batch of extraction and install jobs.
+
+    Jobs can be added while the window is open; the bar and summary cover
+    every job added since the window was created.
+    """
+
+    STATUS_ICONS = {"queued": "…", "running": "⏳", "done": "✓", "failed": "✗", "cancelled": "⦸"}
+
+    def __init__(self, parent, on_cancel=None):
         super().__init__(parent)
-        self.title("Extracting Archives")
-        self.geometry("400x200")
-        self.resizable(False, False)
-        
-        # Make window modal
-        self.transient(parent)
-        self.grab_set()
-        
-        # Center window
-        self.update_idletasks()
-        width = self.winfo_width()
-        height = self.winfo_height()
-        x = (self.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.winfo_screenheight() // 2) - (height // 2)
-        self.geometry(f'{width}x{height}+{x}+{y}')
-        
+        self.title("Extracting and Installing")
+        self.geometry("460x360")
+        self.on_cancel = on_cancel
+
+        # Stay above the main window without blocking it
+        self.transient(parent.winfo_toplevel())
+
         # Create widgets
         self.progress_label = ctk.CTkLabel(
             self,
-            text="Preparing to extract...",
+            text="Preparing...",
             font=ctk.CTkFont(size=12)
         )
-        self.progress_label.pack(pady=(20, 10))
-        
+        self.progress_label.pack(pady=(15, 5))
+
         # Progress bar
         self.progress_bar = ttk.Progressbar(
             self,
             orient="horizontal",
-            length=350,
+            length=410,
             mode="determinate"
         )
-        self.progress_bar.pack(pady=10)
-        
-        # Status label
-        self.status_label = ctk.CTkLabel(
-            self,
-            text="",
-            font=ctk.CTkFont(size=11),
-            wraplength=350
+        self.progress_bar.pack(pady=5)
+
+        # One status row per job
+        self.jobs_frame = ctk.CTkScrollableFrame(self, height=180)
+        self.jobs_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        # Buttons
+        buttons_frame = ctk.CTkFrame(self, fg_color="transparent")
+        buttons_frame.pack(pady=10)
+
+        self.cancel_button = ctk.CTkButton(
+            buttons_frame,
+            text="Cancel",
+            command=self._cancel,
+            fg_color="red",
+            hover_color="darkred"
         )
-        self.status_label.pack(pady=10)
-        
-        # Close button (initially disabled)
+        self.cancel_button.pack(side="left", padx=5)
+
         self.close_button = ctk.CTkButton(
-            self,
+            buttons_frame,
             text="Close",
-            command=self.destroy,
-            state="disabled"
-        )
-        self.close_button.pack(pady=10)
-        
-        # Initialize progress
-        self.total_files = total_files
-        self.current_file = 0
-        self.progress_bar["maximum"] = total_files
-        
-    def update_progress(self, filename, success=True):
-        """Update progress with current file status."""
-        self.current_file += 1
-        self.progress_bar["value"] = self.current_file
-        
-        status = "✓" if success else "✗"
-        self.status_label.configure(
-            text=f"{status} {filename}"
+            command=self.destroy
         )
-        
-        if self.current_file >= self.total_files:
-            self.progress_label.configure(text="Extraction Complete!")
-            self.close_button.configure(state="normal")
-            
+        self.close_button.pack(side="left", padx=5)
+
+        self.jobs = {}  # job id -> (job, status label)
+
+    def add_job(self, job):
+        """Add a queued job to the window."""
+        label = ctk.CTkLabel(self.jobs_frame, text="", anchor="w", justify="left", font=ctk.CTkFont(size=11))
+        label.pack(fill="x", padx=5)
+        self.jobs[job.id] = (job, label)
+        self.update_job(job)
+
+    def update_job(self, job):
+        """Refresh a job's row and the overall progress."""
+        if job.id not in self.jobs:
+            return
+        _, label = self.jobs[job.id]
+        text = f"{self.STATUS_ICONS.get(job.state, '')} {job.label}"
+        if job.error:
+            text += f" — {job.error}"
+        elif job.state == "running" and job.progress.get("total_bytes"):
+            progress = job.progress
+            percent = 100 * progress["bytes_done"] // progress["total_bytes"]
+            text += (
+                f" — {percent}% ({format_size(progress['bytes_done'])} / {format_size(progress['total_bytes'])},"
+                f" {format_size(progress['throughput'])}/s)"
+            )
+            if progress.get("total_files"):
+                text += f"\n    {progress['files_done']} of {progress['total_files']} files"
+            if progress.get("member"):
+                text += f"\n    {progress['member']}"
+        elif job.state == "running" and job.progress.get("total_items"):
+            progress = job.progress
+            text += f" — {progress['items_done']} of {progress['total_items']}"
+            if progress.get("member"):
+                text += f"\n    {progress['member']}"
+        label.configure(text=text)
+        self._update_summary()
+
+    def _update_summary(self):
+        jobs = [job for job, _ in self.jobs.values()]
+        finished = sum(1 for job in jobs if job.finished)
+        failed = sum(1 for job in jobs if job.state == "failed")
+
+        # Running jobs count for the fraction of their bytes (or items) already done
+        value = finished
+        for job in jobs:
+            if job.state == "running" and job.progress.get("total_bytes"):
+                value += job.progress["bytes_done"] / job.progress["total_bytes"]
+            elif job.state == "running" and job.progress.get("total_items"):
+                value += job.progress["items_done"] / job.progress["total_items"]
+        self.progress_bar["maximum"] = max(1, len(jobs))
+        self.progress_bar["value"] = value
+
+        if finished < len(jobs):
+            self.progress_label.configure(text=f"Finished {finished} of {len(jobs)} jobs...")
+            self.cancel_button.configure(state="normal")
+        else:
+            if failed:
+                self.progress_label.configure(text=f"Finished with {failed} error(s).")
+            else:
+                self.progress_label.configure(text="All Done!")
+            self.cancel_button.configure(state="disabled")
+
+    def _cancel(self):
+        if self.on_cancel:
+            self.on_cancel()
+        self.progress_label.configure(text="Cancelling...")
+
     def show_error(self, message):
         """Show error message."""
         self.progress_label.configure(text="Extraction Failed!")
-        self.status_label.configure(text=message)
-        self.close_button.configure(state="normal") 
\ No newline at end of file
+        ctk.CTkLabel(self.jobs_frame, text=message, anchor="w", wraplength=400).pack(fill="x", padx=5)
+
+def format_size(size):
+    """Format a byte count for display."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
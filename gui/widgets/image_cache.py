@@ -0,0 +1,249 @@
+"""
+Process-wide cache of decoded images for the Mod Manager GUI.
+"""
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import customtkinter as ctk
+from PIL import Image
+from utils.icons.thumbnails import fit_size
+
+class ImageCache:
+    """
+    LRU cache of ready CTkImage objects.
+
+    Entries are keyed by (path, mtime, target size) so an edited file is
+    decoded again, and the least recently used images are evicted once the
+    decoded pixel data exceeds max_bytes. Failed loads are remembered too so
+    a missing asset is not retried for every widget.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, workers=4):
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self._images = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = {}  # key -> callbacks waiting for the decode
+        self._results = queue.Queue()
+        self._drain_root = None
+
+    def get_image(self, path, size):
+        """
+        Get an image displayed at a fixed size.
+
+        Args:
+            path (str): Path to the image file
+            size (tuple): Display size (width, height)
+
+        Returns:
+            CTkImage: The cached image
+
+        Raises:
+            OSError: If the image cannot be opened or decoded
+        """
+        return self._get(path, ("size", tuple(size)))
+
+    def get_fitted_image(self, path, max_size):
+        """
+        Get an image resized to fit a square box, keeping its aspect ratio.
+
+        Args:
+            path (str): Path to the image file
+            max_size (int): Maximum width and height
+
+        Returns:
+            CTkImage: The cached image
+
+        Raises:
+            OSError: If the image cannot be opened or decoded
+        """
+        return self._get(path, ("fit", max_size))
+
+    def get_native_image(self, path):
+        """
+        Get an image displayed at its own pixel size, without resampling.
+
+        Args:
+            path (str): Path to the image file
+
+        Returns:
+            CTkImage: The cached image
+
+        Raises:
+            OSError: If the image cannot be opened or decoded
+        """
+        return self._get(path, ("native", None))
+
+    def request_image(self, widget, path, spec, callback):
+        """
+        Load an image in a worker thread and hand it back on the Tk main loop.
+
+        Cached images are delivered immediately. Otherwise the decode runs in
+        the worker pool and callback(image, error) is called from an after()
+        drain loop once it finishes, so the caller can show a placeholder
+        meanwhile. Must be called from the Tk main thread.
+
+        Args:
+            widget: Any widget of the application, used to schedule the drain loop
+            path (str): Path to the image file
+            spec (tuple): ("size", (width, height)), ("fit", max_size) or ("native", None)
+            callback (callable): Called with (CTkImage, None) or (None, exception)
+        """
+        key = self._key(path, spec)
+        with self._lock:
+            cached = self._images.get(key)
+            if cached is not None:
+                self._images.move_to_end(key)
+        if cached is not None:
+            image, _ = cached
+            if isinstance(image, Exception):
+                callback(None, image)
+            else:
+                callback(image, None)
+            return
+
+        if key in self._pending:
+            self._pending[key].append(callback)
+            return
+        self._pending[key] = [callback]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image-decode")
+        self._executor.submit(self._decode_job, key, path, spec)
+
+        if self._drain_root is None:
+            self._drain_root = widget._root()
+            self._drain_root.after(15, self._drain_results)
+
+    def clear(self):
+        """Drop every cached image."""
+        with self._lock:
+            self._images.clear()
+            self._total_bytes = 0
+
+    def _get(self, path, spec):
+        key = self._key(path, spec)
+        with self._lock:
+            cached = self._images.get(key)
+            if cached is not None:
+                self._images.move_to_end(key)
+        if cached is not None:
+            image, _ = cached
+            if isinstance(image, Exception):
+                raise image
+            return image
+
+        try:
+            pil_image, display_size = decode_image(path, spec)
+            image = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=display_size)
+            cost = _image_bytes(pil_image)
+        except Exception as e:
+            image, cost = e, 0
+        self._store(key, image, cost)
+
+        if isinstance(image, Exception):
+            raise image
+        return image
+
+    def _decode_job(self, key, path, spec):
+        """Worker: decode an image and queue the PIL result for the main thread."""
+        try:
+            pil_image, display_size = decode_image(path, spec)
+            self._results.put((key, pil_image, display_size, None))
+        except Exception as e:
+            self._results.put((key, None, None, e))
+
+    def _drain_results(self):
+        """Main thread: wrap decoded images in CTkImage and run waiting callbacks."""
+        try:
+            while True:
+                key, pil_image, display_size, error = self._results.get_nowait()
+                if error is None:
+                    image = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=display_size)
+                    self._store(key, image, _image_bytes(pil_image))
+                else:
+                    image = None
+                    self._store(key, error, 0)
+                for callback in self._pending.pop(key, []):
+                    try:
+                        callback(image, error)
+                    except Exception as e:
+                        print(f"Image callback failed: {e}")
+        except queue.Empty:
+            pass
+
+        # Keep polling only while decodes are outstanding
+        if self._pending:
+            self._drain_root.after(15, self._drain_results)
+        else:
+            self._drain_root = None
+
+    def _store(self, key, image, cost):
+        with self._lock:
+            if key in self._images:
+                return
+            self._images[key] = (image, cost)
+            self._total_bytes += cost
+            while self._total_bytes > self.max_bytes and len(self._images) > 1:
+                _, (_, evicted_cost) = self._images.popitem(last=False)
+                self._total_bytes -= evicted_cost
+
+    @staticmethod
+    def _key(path, spec):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        return os.path.abspath(path), mtime, spec
+
+def decode_image(path, spec):
+    """
+    Open and resize an image for a cache spec.
+
+    Args:
+        path (str): Path to the image file
+        spec (tuple): ("size", (width, height)), ("fit", max_size) or ("native", None)
+
+    Returns:
+        tuple: (PIL image, display size)
+    """
+    with Image.open(path) as source:
+        source.load()
+        pil_image = source.copy()
+
+    mode, value = spec
+    if mode == "native":
+        return pil_image, pil_image.size
+    if mode == "fit":
+        # Resize image to fit button (maintaining aspect ratio)
+        new_size = fit_size(pil_image.width, pil_image.height, value)
+        pil_image = pil_image.resize(new_size, Image.Resampling.LANCZOS)
+        return pil_image, new_size
+
+    # Keep enough resolution for 2x display scaling, drop the rest
+    width, height = value
+    if pil_image.width > width * 2 or pil_image.height > height * 2:
+        pil_image.thumbnail((width * 2, height * 2), Image.Resampling.LANCZOS)
+    return pil_image, (width, height)
+
+def _image_bytes(pil_image):
+    """Estimate the memory held by a decoded image."""
+    return pil_image.width * pil_image.height * len(pil_image.getbands())
+
+image_cache = ImageCache()
+
+def get_image(path, size):
+    """Get a fixed-size image from the shared cache."""
+    return image_cache.get_image(path, size)
+
+def get_fitted_image(path, max_size):
+    """Get an aspect-preserving image from the shared cache."""
+    return image_cache.get_fitted_image(path, max_size)
+
+def get_native_image(path):
+    """Get an image at its own pixel size from the shared cache."""
+    return image_cache.get_native_image(path)
@@ -1,13 +1,30 @@
 """
 Toast notification widget for displaying non-intrusive messages.
+
+Toasts are driven by their ToastManager: a single Tk timer fades them in and
+out and dismisses them when they expire, at most max_toasts are on screen,
+the rest wait in a queue of at most max_queued, and anything beyond that is
+folded into a single "+N more" toast. A message that is already showing or
+queued, or one sharing a caller-supplied key with such a toast, is counted on
+the existing toast instead of opening another window.
 """
 import customtkinter as ctk
-import threading
 import time
+import weakref
+from collections import deque
 from typing import Optional, Literal
 
+FRAME_MS = 30  # Timer interval while a toast is fading
+FADE_STEP = 0.15  # Alpha change per frame
+MAX_ALPHA = 0.95
+OVERFLOW_KEY = "toast-overflow"  # Key of the toast counting messages past the queue cap
+
 class ToastNotification(ctk.CTkToplevel):
-    """A modern toast notification widget."""
+    """
+    A modern toast notification widget.
+
+    The toast has no timers of its own; step() is called by its ToastManager.
+    """
     
     def __init__(
         self, 
@@ -15,14 +32,25 @@ class ToastNotification(ctk.CTkToplevel):
         message: str, 
         toast_type: Literal["success", "error", "info", "warning"] = "info",
         duration: int = 3000,
-        position: Literal["top-right", "top-left", "bottom-right", "bottom-left", "center"] = "top-right"
+        position: Literal["top-right", "top-left", "bottom-right", "bottom-left", "center"] = "top-right",
+        count: int = 1,
+        on_dismiss=None,
+        key=None,
+        summary=None
     ):
         super().__init__(parent)
         
         self.message = message
+        self.key = key if key is not None else message
+        self.summary = summary
         self.toast_type = toast_type
         self.duration = duration
         self.position = position
+        self.count = count
+        self._on_dismiss = on_dismiss
+        self.alpha = 0.0
+        self.fading_out = False
+        self.expires_at = time.monotonic() + duration / 1000
         
         # Configure window
         self.title("")
@@ -33,8 +61,8 @@ class ToastNotification(ctk.CTkToplevel):
         # Make window stay on top
         self.attributes('-topmost', True)
         
-        # Set transparency
-        self.attributes('-alpha', 0.95)
+        # Start transparent; the manager fades the toast in
+        self.attributes('-alpha', 0.0)
         
         # Configure appearance based on type
         self._configure_appearance()
@@ -44,12 +72,6 @@ class ToastNotification(ctk.CTkToplevel):
         
         # Position window
         self._position_window()
-        
-        # Start auto-dismiss timer
-        self._start_dismiss_timer()
-        
-        # Add fade-in animation
-        self._fade_in()
     
     def _configure_appearance(self):
         """Configure colors and styling based on toast type."""
@@ -106,7 +128,7 @@ class ToastNotification(ctk.CTkToplevel):
         # Message label
         self.message_label = ctk.CTkLabel(
             content_frame,
-            text=self.message,
+            text=self._label_text(),
             font=ctk.CTkFont(size=12),
             text_color=self.text_color,
             wraplength=220,
@@ -164,85 +186,160 @@ class ToastNotification(ctk.CTkToplevel):
         
         self.geometry(f"{window_width}x{window_height}+{x}+{y}")
     
-    def _start_dismiss_timer(self):
-        """Start the auto-dismiss timer."""
-        def dismiss_after_delay():
-            time.sleep(self.duration / 1000)
-            self.after(0, self.dismiss)
-        
-        timer_thread = threading.Thread(target=dismiss_after_delay, daemon=True)
-        timer_thread.start()
-    
-    def _fade_in(self):
-        """Animate the fade-in effect."""
-        self.attributes('-alpha', 0.0)
-        
-        def fade_step(alpha=0.0):
-            if alpha < 0.95:
-                self.attributes('-alpha', alpha)
-                self.after(10, lambda: fade_step(alpha + 0.05))
-        
-        fade_step()
-    
-    def _fade_out(self):
-        """Animate the fade-out effect."""
-        def fade_step(alpha=0.95):
-            if alpha > 0.0:
-                self.attributes('-alpha', alpha)
-                self.after(10, lambda: fade_step(alpha - 0.05))
-            else:
+    def _label_text(self):
+        """Get the message, or its counted form once it has been shown more than once."""
+        if self.count == 1:
+            return self.message
+        if self.summary:
+            return self.summary.format(count=self.count)
+        return f"{self.message} (×{self.count})"
+
+    def repeat(self, count=1):
+        """Count `count` more occurrences of the message and restart the display time."""
+        self.count += count
+        self.message_label.configure(text=self._label_text())
+        self.expires_at = time.monotonic() + self.duration / 1000
+        self.fading_out = False
+
+    @property
+    def fading(self):
+        """Whether the toast is still fading in or out."""
+        return self.fading_out or self.alpha < MAX_ALPHA
+
+    def step(self, now):
+        """
+        Advance the fade by one frame and start fading out once expired.
+
+        Returns:
+            bool: False once the toast has faded out and been destroyed
+        """
+        if not self.fading_out and now >= self.expires_at:
+            self.fading_out = True
+        if self.fading_out:
+            self.alpha = max(0.0, self.alpha - FADE_STEP)
+            if self.alpha == 0.0:
                 self.destroy()
-        
-        fade_step()
+                return False
+        elif self.alpha < MAX_ALPHA:
+            self.alpha = min(MAX_ALPHA, self.alpha + FADE_STEP)
+        self.attributes('-alpha', self.alpha)
+        return True
     
     def dismiss(self):
         """Dismiss the toast with fade-out animation."""
-        self._fade_out()
+        self.fading_out = True
+        if self._on_dismiss:
+            self._on_dismiss()
 
 
 class ToastManager:
-    """Manager for multiple toast notifications."""
+    """
+    Manager for multiple toast notifications.
+
+    One Tk timer drives every toast: it runs every FRAME_MS while something is
+    fading, sleeps until the next expiry otherwise, and stops when no toast is
+    left. At most max_toasts are visible and at most max_queued wait in
+    toast_queue; further messages only bump one "+N more" toast. A message
+    whose key (the message itself unless the caller gives one) and type match
+    a visible or queued toast is coalesced into it, so a burst of install
+    completions becomes a single counted toast.
+    """
     
     def __init__(self, parent):
         self.parent = parent
         self.active_toasts = []
-        self.toast_queue = []
+        self.toast_queue = deque()  # Pending [message, toast_type, duration, position, count, key, summary]
         self.max_toasts = 3
+        self.max_queued = 5
         self.toast_spacing = 10
+        self._timer = None
+        _managers[parent] = self
     
     def show_toast(
         self, 
         message: str, 
         toast_type: Literal["success", "error", "info", "warning"] = "info",
         duration: int = 3000,
-        position: Literal["top-right", "top-left", "bottom-right", "bottom-left", "center"] = "top-right"
+        position: Literal["top-right", "top-left", "bottom-right", "bottom-left", "center"] = "top-right",
+        key=None,
+        summary=None
     ):
-        """Show a toast notification."""
-        # Create toast
-        toast = ToastNotification(
-            self.parent,
-            message,
-            toast_type,
-            duration,
-            position
-        )
-        
-        # Add to active toasts
-        self.active_toasts.append(toast)
-        
-        # Position toasts to avoid overlap
-        self._reposition_toasts()
-        
-        # Remove from active list when dismissed
-        toast.bind("<Destroy>", lambda e: self._remove_toast(toast))
-        
-        return toast
+        """
+        Show a toast notification, or queue it while max_toasts are showing.
+
+        Args:
+            key (str, optional): Toasts of the same type and key are merged;
+                defaults to the message itself
+            summary (str, optional): Text shown once merged, formatted with
+                {count}, e.g. "Installed {count} mods"
+
+        Returns:
+            ToastNotification: The toast showing the message, or None if it was queued
+        """
+        key = key if key is not None else message
+        for toast in self.active_toasts:
+            if toast.key == key and toast.toast_type == toast_type and toast.winfo_exists():
+                toast.repeat()
+                self._schedule(0)
+                return toast
+        for pending in self.toast_queue:
+            if pending[5] == key and pending[1] == toast_type:
+                pending[4] += 1
+                return None
+
+        if key != OVERFLOW_KEY and len(self.toast_queue) >= self.max_queued:
+            return self.show_toast(
+                "+1 more notification", "info", 3000, position,
+                key=OVERFLOW_KEY, summary="+{count} more notifications"
+            )
+        self.toast_queue.append([message, toast_type, duration, position, 1, key, summary])
+        self._show_queued()
+        return self.active_toasts[-1] if not self.toast_queue else None
+    
+    def _show_queued(self):
+        """Open toasts from the queue while there is room on screen."""
+        opened = False
+        while self.toast_queue and len(self.active_toasts) < self.max_toasts:
+            message, toast_type, duration, position, count, key, summary = self.toast_queue.popleft()
+            toast = ToastNotification(
+                self.parent,
+                message,
+                toast_type,
+                duration,
+                position,
+                count=count,
+                on_dismiss=lambda: self._schedule(0),
+                key=key,
+                summary=summary
+            )
+            self.active_toasts.append(toast)
+            opened = True
+        if opened:
+            # Position toasts to avoid overlap
+            self._reposition_toasts()
+            self._schedule(0)
     
-    def _remove_toast(self, toast):
-        """Remove toast from active list."""
-        if toast in self.active_toasts:
-            self.active_toasts.remove(toast)
+    def _schedule(self, delay):
+        """(Re)arm the single timer to tick after `delay` milliseconds."""
+        if self._timer is not None:
+            self.parent.after_cancel(self._timer)
+        self._timer = self.parent.after(delay, self._tick)
+    
+    def _tick(self):
+        """Advance fades, retire finished toasts, promote queued ones and re-arm the timer."""
+        self._timer = None
+        now = time.monotonic()
+        remaining = [toast for toast in self.active_toasts if toast.winfo_exists() and toast.step(now)]
+        if len(remaining) != len(self.active_toasts):
+            self.active_toasts = remaining
             self._reposition_toasts()
+            self._show_queued()
+        
+        if any(toast.fading for toast in self.active_toasts):
+            self._schedule(FRAME_MS)
+        elif self.active_toasts:
+            next_expiry = min(toast.expires_at for toast in self.active_toasts)
+            self._schedule(max(FRAME_MS, int((next_expiry - now) * 1000)))
     
     def _reposition_toasts(self):
         """Reposition all active toasts to avoid overlap."""
@@ -274,25 +371,37 @@ class ToastManager:
             toast.geometry(f"{window_width}x{window_height}+{x}+{y}")
     
     def dismiss_all(self):
-        """Dismiss all active toasts."""
-        for toast in self.active_toasts[:]:  # Copy list to avoid modification during iteration
+        """Dismiss all active toasts and drop the queued ones."""
+        self.toast_queue.clear()
+        for toast in self.active_toasts:
             if toast.winfo_exists():
-                toast.dismiss()
+                toast.fading_out = True
+        self._schedule(0)
+
+
+# One manager per parent window, shared by the convenience functions
+_managers = weakref.WeakKeyDictionary()
 
+def get_toast_manager(parent):
+    """Get the ToastManager of a window, creating one if it has none."""
+    manager = _managers.get(parent)
+    if manager is None:
+        manager = ToastManager(parent)
+    return manager
 
 # Convenience functions for easy usage
 def show_success(parent, message: str, duration: int = 3000):
     """Show a success toast."""
-    return ToastNotification(parent, message, "success", duration)
+    return get_toast_manager(parent).show_toast(message, "success", duration)
 
 def show_error(parent, message: str, duration: int = 5000):
     """Show an error toast."""
-    return ToastNotification(parent, message, "error", duration)
+    return get_toast_manager(parent).show_toast(message, "error", duration)
 
 def show_info(parent, message: str, duration: int = 3000):
     """Show an info toast."""
-    return ToastNotification(parent, message, "info", duration)
+    return get_toast_manager(parent).show_toast(message, "info", duration)
 
 def show_warning(parent, message: str, duration: int = 4000):
     """Show a warning toast."""
-    return ToastNotification(parent, message, "warning", duration) 
\ No newline at end of file
+    return get_toast_manager(parent).show_toast(message, "warning", duration)
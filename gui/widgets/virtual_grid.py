@@ -0,0 +1,175 @@
+"""
+Virtualized scrollable grid that recycles a small pool of cell widgets.
+"""
+import sys
+import math
+import customtkinter as ctk
+
+class VirtualGrid(ctk.CTkFrame):
+    """
+    Scrollable grid that only instantiates widgets for the visible rows.
+
+    Cells are created on demand with create_cell(master) up to the number
+    needed to fill the viewport plus buffer_rows above and below, and are
+    pointed at items with bind_cell(cell, item) as they scroll into view.
+    Item i is always shown by pool slot i % pool_size, so scrolling one row
+    only rebinds one row of cells.
+    """
+
+    def __init__(self, master, create_cell, bind_cell, columns=3, cell_height=290,
+                 padding=10, buffer_rows=1, **kwargs):
+        super().__init__(master, **kwargs)
+        self.create_cell = create_cell
+        self.bind_cell = bind_cell
+        self.columns = columns
+        self.cell_height = cell_height
+        self.padding = padding
+        self.buffer_rows = buffer_rows
+        self.items = []
+        self.cells = []  # (widget, canvas window id)
+        self.cell_indices = []  # item index currently bound to each cell
+        self.cell_width = 1
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 3), pady=3)
+
+        self.canvas = ctk.CTkCanvas(self, highlightthickness=0, yscrollincrement=1)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.configure(yscrollcommand=self._on_canvas_scroll, bg=self._canvas_bg())
+        self.canvas.bind("<Configure>", lambda e: self._relayout())
+
+        # Removed again in destroy(), so rebuilt grids don't pile up handlers
+        self._wheel_bindings = [
+            (sequence, self.bind_all(sequence, self._on_mouse_wheel, add="+"))
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>")
+        ]
+
+    def destroy(self):
+        """Remove this grid's mouse wheel handlers, keeping other widgets' ones."""
+        for sequence, funcid in self._wheel_bindings:
+            script = self.tk.call("bind", "all", sequence)
+            kept = [line for line in script.split("\n") if funcid not in line]
+            self.tk.call("bind", "all", sequence, "\n".join(kept))
+            self.deletecommand(funcid)
+        self._wheel_bindings = []
+        super().destroy()
+
+    def set_items(self, items, keep_position=False):
+        """
+        Replace the items shown by the grid.
+
+        Args:
+            items (list): Items passed to bind_cell
+            keep_position (bool): Keep the scroll offset instead of returning to the top
+        """
+        self.items = list(items)
+        self.cell_indices = [None] * len(self.cells)
+        if not keep_position:
+            self.canvas.yview_moveto(0)
+        self._relayout()
+
+    def refresh(self):
+        """Rebind every visible cell, e.g. after the items changed in place."""
+        self.cell_indices = [None] * len(self.cells)
+        self._update_visible()
+
+    def _relayout(self):
+        """Resize cells to the canvas width and grow the pool to fill the viewport."""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return
+
+        cell_height, padding = self._scaled_metrics()
+        row_height = cell_height + padding
+        rows = math.ceil(len(self.items) / self.columns)
+        total_height = rows * row_height + padding
+        self.canvas.configure(scrollregion=(0, 0, width, max(total_height, height)))
+
+        self.cell_width = max(1, (width - padding) // self.columns - padding)
+        visible_rows = height // row_height + 2 + 2 * self.buffer_rows
+        pool_size = min(rows, visible_rows) * self.columns
+        while len(self.cells) < pool_size:
+            widget = self.create_cell(self.canvas)
+            window_id = self.canvas.create_window(0, 0, window=widget, anchor="nw", state="hidden")
+            self.cells.append((widget, window_id))
+            self.cell_indices.append(None)
+
+        for _, window_id in self.cells:
+            self.canvas.itemconfigure(window_id, width=self.cell_width, height=cell_height)
+        self._update_visible()
+
+    def _update_visible(self):
+        """Position and bind the cells covering the current scroll offset."""
+        if not self.cells:
+            return
+        pool_size = len(self.cells) - len(self.cells) % self.columns
+        cell_height, padding = self._scaled_metrics()
+        row_height = cell_height + padding
+        top = self.canvas.canvasy(0)
+        first_row = max(0, int(top // row_height) - self.buffer_rows)
+        first_index = first_row * self.columns
+
+        shown = set()
+        for index in range(first_index, min(first_index + pool_size, len(self.items))):
+            slot = index % pool_size
+            widget, window_id = self.cells[slot]
+            row, col = divmod(index, self.columns)
+            self.canvas.coords(
+                window_id,
+                padding + col * (self.cell_width + padding),
+                padding + row * row_height
+            )
+            if self.cell_indices[slot] != index:
+                self.bind_cell(widget, self.items[index])
+                self.cell_indices[slot] = index
+            self.canvas.itemconfigure(window_id, state="normal")
+            shown.add(slot)
+
+        for slot, (_, window_id) in enumerate(self.cells):
+            if slot not in shown:
+                self.canvas.itemconfigure(window_id, state="hidden")
+                self.cell_indices[slot] = None
+
+    def _scaled_metrics(self):
+        """Get (cell height, padding) in screen pixels for the current widget scaling."""
+        return round(self._apply_widget_scaling(self.cell_height)), round(self._apply_widget_scaling(self.padding))
+
+    def _on_canvas_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._update_visible()
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+
+    def _on_mouse_wheel(self, event):
+        if not self.winfo_exists() or not self._contains(event.widget):
+            return
+        if self.canvas.yview() == (0.0, 1.0):
+            return
+        if event.num == 4:
+            delta = -40
+        elif event.num == 5:
+            delta = 40
+        elif sys.platform.startswith("win"):
+            delta = -int(event.delta / 6)
+        else:
+            delta = -event.delta
+        self.canvas.yview("scroll", delta, "units")
+
+    def _contains(self, widget):
+        """Check whether a widget is this grid or one of its descendants."""
+        while widget is not None:
+            if widget is self:
+                return True
+            widget = getattr(widget, "master", None)
+        return False
+
+    def _canvas_bg(self):
+        color = self._fg_color if self._fg_color != "transparent" else self._bg_color
+        return self._apply_appearance_mode(color)
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        if hasattr(self, "canvas"):
+            self.canvas.configure(bg=self._canvas_bg())
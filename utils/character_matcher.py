@@ -1,7 +1,8 @@
 """
 Character name matching utilities.
 """
-from difflib import get_close_matches
+from difflib import get_close_matches, SequenceMatcher
+from collections import Counter
 import re
 
 def match_character(name, character_list):
@@ -76,4 +77,190 @@ def clean_name_for_matching(name):
     words = cleaned.split()
     filtered_words = [word for word in words if word.lower() not in mod_terms]
     
-    return ' '.join(filtered_words).strip()
\ No newline at end of file
+    return ' '.join(filtered_words).strip()
+
+class CharacterMatcher:
+    """
+    Precompiled matcher for one character list.
+
+    Gives exactly the same answers as match_character() but builds the
+    lowercased names, word indexes and letter counts once, prunes fuzzy
+    candidates with a letter-count bound before running difflib, and
+    memoizes results per name.
+    """
+
+    CUTOFF = 0.4
+
+    def __init__(self, character_list):
+        self.character_list = list(character_list)
+        self._lowered = [character.lower() for character in self.character_list]
+        self._memo = {}
+
+        # Strategy 2 indexes: meaningful character words and all their substrings,
+        # each mapped to the first character (in list order) that contains them
+        self._word_index = {}
+        self._substring_index = {}
+        for index, lowered in enumerate(self._lowered):
+            for char_word in lowered.split():
+                if len(char_word) <= 2:
+                    continue
+                self._word_index.setdefault(char_word, index)
+                for start in range(len(char_word)):
+                    for end in range(start + 1, len(char_word) + 1):
+                        self._substring_index.setdefault(char_word[start:end], index)
+        self._word_lengths = sorted({len(word) for word in self._word_index})
+
+        # Strategy 3 and 4 candidates, with a letter -> (candidate, count) index
+        # used to bound SequenceMatcher.ratio() for all candidates at once
+        self._fuzzy_words = sorted(self._word_index.items(), key=lambda item: item[1])
+        self._character_letters = _build_letter_index(self.character_list)
+        self._word_letters = _build_letter_index([word for word, _ in self._fuzzy_words])
+
+    def match(self, name):
+        """
+        Match a character name against the character list.
+
+        Args:
+            name (str): The character name to match
+
+        Returns:
+            str: The matched character name or original name if no match
+        """
+        if not name or not self.character_list:
+            return name
+        if name not in self._memo:
+            self._memo[name] = self._match(name)
+        return self._memo[name]
+
+    def match_many(self, names):
+        """
+        Match many names at once, matching each distinct name only once.
+
+        Gives the same answers as match() for every name. The letter-count
+        index already bounds every fuzzy candidate of a name in one pass, so
+        a batch is simply matched name by name through the memo.
+
+        Args:
+            names (list): Character names to match
+
+        Returns:
+            list: The matched character name (or the name itself) for each name
+        """
+        return [self.match(name) for name in names]
+
+    def _match(self, name):
+        # Clean the input name for matching
+        cleaned_name = clean_name_for_matching(name)
+        cleaned_lower = cleaned_name.lower()
+
+        # Strategies 1 and 2: substring and word-based matching
+        index = self._match_words(cleaned_lower)
+        if index is not None:
+            return self.character_list[index]
+
+        # Strategy 3: Fuzzy matching with lower cutoff
+        bounds = self._ratio_bounds(cleaned_name, self.character_list, self._character_letters)
+        result = self._match_fuzzy(cleaned_name, bounds)
+        if result is not None:
+            return result
+
+        # Strategy 4: Fuzzy matching against individual words
+        words = [word for word, _ in self._fuzzy_words]
+        bounds = self._ratio_bounds(cleaned_lower, words, self._word_letters)
+        result = self._match_fuzzy_words(cleaned_lower, bounds)
+        if result is not None:
+            return result
+
+        return name
+
+    def _match_words(self, cleaned_lower):
+        """Strategies 1 and 2: get the index of the matched character, or None."""
+        # Strategy 1: Direct substring match (case insensitive)
+        for index, lowered in enumerate(self._lowered):
+            if lowered in cleaned_lower or cleaned_lower in lowered:
+                return index
+
+        # Strategy 2: Word-based matching
+        best = None
+        for name_word in cleaned_lower.split():
+            found = self._substring_index.get(name_word)
+            if found is not None and (best is None or found < best):
+                best = found
+            for length in self._word_lengths:
+                if length > len(name_word):
+                    break
+                for start in range(len(name_word) - length + 1):
+                    found = self._word_index.get(name_word[start:start + length])
+                    if found is not None and (best is None or found < best):
+                        best = found
+        return best
+
+    def _match_fuzzy(self, cleaned_name, bounds):
+        """Strategy 3: best close match over whole character names, or None."""
+        matcher = SequenceMatcher()
+        matcher.set_seq2(cleaned_name)
+        best_match = None
+        for bound, index in sorted(((bound, index) for index, bound in enumerate(bounds)), reverse=True):
+            if bound < self.CUTOFF or (best_match is not None and bound < best_match[0]):
+                break
+            character = self.character_list[index]
+            matcher.set_seq1(character)
+            score = matcher.ratio()
+            if score >= self.CUTOFF and (best_match is None or (score, character) > best_match):
+                best_match = (score, character)
+        return best_match[1] if best_match is not None else None
+
+    def _match_fuzzy_words(self, cleaned_lower, bounds):
+        """Strategy 4: first character with a close word, or None."""
+        matcher = SequenceMatcher()
+        matcher.set_seq2(cleaned_lower)
+        for (word, index), bound in zip(self._fuzzy_words, bounds):
+            if bound < self.CUTOFF:
+                continue
+            matcher.set_seq1(word)
+            if matcher.ratio() >= self.CUTOFF:
+                return self.character_list[index]
+        return None
+
+    @staticmethod
+    def _ratio_bounds(query, candidates, letter_index):
+        """Upper bounds of SequenceMatcher.ratio() for every candidate (as quick_ratio)."""
+        common = [0] * len(candidates)
+        for letter, count in Counter(query).items():
+            for index, candidate_count in letter_index.get(letter, ()):
+                common[index] += count if count < candidate_count else candidate_count
+        bounds = []
+        for index, candidate in enumerate(candidates):
+            total = len(query) + len(candidate)
+            bounds.append(2.0 * common[index] / total if total else 0.0)
+        return bounds
+
+def _build_letter_index(candidates):
+    """Map each letter to the (candidate index, letter count) pairs containing it."""
+    letter_index = {}
+    for index, candidate in enumerate(candidates):
+        for letter, count in Counter(candidate).items():
+            letter_index.setdefault(letter, []).append((index, count))
+    return letter_index
+
+_matchers = {}
+
+def get_character_matcher(character_list):
+    """Get a shared CharacterMatcher for a character list, building it on first use."""
+    key = tuple(character_list)
+    if key not in _matchers:
+        _matchers[key] = CharacterMatcher(character_list)
+    return _matchers[key]
+
+def match_characters(names, character_list):
+    """
+    Match many character names against a list of known characters in one pass.
+
+    Args:
+        names (list): The character names to match
+        character_list (list): List of known character names
+
+    Returns:
+        list: The matched character name or original name for each name
+    """
+    return get_character_matcher(character_list).match_many(names)
@@ -0,0 +1,96 @@
+"""
+Progress reporting and cancellation for file installs.
+"""
+import os
+import time
+import threading
+
+PROGRESS_INTERVAL = 0.1  # Seconds between progress reports
+
+class InstallCancelled(Exception):
+    """Raised when an install is cancelled between two files."""
+
+def measure_tree(path):
+    """
+    Count the files and bytes of a folder tree, following symlinks like copy_tree.
+
+    Returns:
+        tuple: (file count, total size in bytes)
+    """
+    files = 0
+    total_size = 0
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        with os.scandir(current) as it:
+            for dir_entry in it:
+                if dir_entry.is_dir():
+                    pending.append(dir_entry.path)
+                else:
+                    files += 1
+                    total_size += dir_entry.stat().st_size
+    return files, total_size
+
+class CopyProgress:
+    """
+    Tracks files and bytes placed by an install.
+
+    The progress callback gets the same keys as archive extraction progress
+    (bytes_done, total_bytes, member, throughput) plus files_done and
+    total_files, at most every PROGRESS_INTERVAL seconds and once at the end.
+    Both callbacks are optional and are called from the installing threads;
+    file_done() may be called from several copy threads at once.
+    """
+
+    def __init__(self, total_files=0, total_bytes=0, progress=None, is_cancelled=None):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.files_done = 0
+        self.bytes_done = 0
+        self._progress = progress
+        self._is_cancelled = is_cancelled
+        self._started = time.monotonic()
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+
+    def check_cancelled(self):
+        """Raise InstallCancelled if the install should stop."""
+        if self._is_cancelled and self._is_cancelled():
+            raise InstallCancelled()
+
+    def file_done(self, member, size=0):
+        """Count one placed file of `size` bytes."""
+        with self._lock:
+            self.files_done += 1
+            self.bytes_done += size
+            now = time.monotonic()
+            if now - self._last_report >= PROGRESS_INTERVAL:
+                self._last_report = now
+                self._report(member)
+
+    def restart(self):
+        """Start counting from zero again, e.g. when falling back to another strategy."""
+        self.files_done = 0
+        self.bytes_done = 0
+
+    def complete(self):
+        """Count everything as done at once (a folder symlink places the whole tree)."""
+        self.files_done = self.total_files
+        self.bytes_done = self.total_bytes
+
+    def finish(self):
+        """Send the final progress report."""
+        self._report("")
+
+    def _report(self, member):
+        if not self._progress:
+            return
+        elapsed = time.monotonic() - self._started
+        self._progress({
+            "bytes_done": self.bytes_done,
+            "total_bytes": self.total_bytes,
+            "files_done": self.files_done,
+            "total_files": self.total_files,
+            "member": member,
+            "throughput": self.bytes_done / elapsed if elapsed > 0 else 0.0
+        })
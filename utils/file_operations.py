@@ -3,67 +3,183 @@ File and directory operations for mod management.
 """
 import os
 import shutil
-from tkinter import messagebox
 from config.constants import CHARACTER_LISTS
 from utils.character_matcher import match_character
+from utils.copy_progress import CopyProgress, measure_tree
+from utils.link_tree import clone_tree, DEFAULT_STRATEGY, SYMLINK
+from utils.staged_install import new_staging_dir, swap_in
+from utils.tree_diff import diff_trees, stage_diff
+from utils.zip.extract import open_archive, extract_members
 
-def copy_mod_folder(source_path, dest_path, game_name=None):
-    print("source path:", source_path)
-    print("destination path:", dest_path)
+class InstallResult:
+    """
+    Outcome of a successful install.
     
+    Attributes:
+        path (str): Installed mod folder
+        strategy (str): How it was placed (a utils.link_tree strategy, "delta" or "extract")
+        files (int): Number of files in the installed mod (0 if unknown)
+        bytes_copied (int): Bytes copied, linked or extracted from the library
+        files_dropped (int): Files of the replaced version the new one no longer has
+            (delta installs only)
+    """
+    
+    def __init__(self, path, strategy, files=0, bytes_copied=0, files_dropped=0):
+        self.path = path
+        self.strategy = strategy
+        self.files = files
+        self.bytes_copied = bytes_copied
+        self.files_dropped = files_dropped
+
+def copy_mod_folder(source_path, dest_path, game_name=None, strategy=DEFAULT_STRATEGY, delta=True,
+                    use_hash=False, progress=None, is_cancelled=None):
     """
     Copy a mod folder from source to destination, organizing by character subdirectories.
     Uses the source folder structure to determine the target character folder.
+    The folder is placed with the first available install strategy starting at
+    `strategy` (see utils.link_tree), and the one used is recorded in the
+    install records.
+    
+    With delta, an installed folder of the character (the one with the same name,
+    or the only one) is used as the base of the new mod instead: files that did
+    not change are linked from it and only the ones that differ are copied.
+    
+    The mod is built in a staging folder and swapped in with renames (see
+    utils.staged_install), so a failed or cancelled install leaves the installed
+    mods as they were, and the replaced mods are kept until the next install for undo.
+    
+    Safe to call from a worker thread: errors are raised, never shown.
     
     Args:
         source_path (str): Path to source mod folder
         dest_path (str): Path to destination mod folder
         game_name (str, optional): Game name for character matching (used as fallback)
+        strategy (str, optional): First install strategy to try
+        delta (bool, optional): Whether to build on an installed folder when there is one
+        use_hash (bool, optional): Compare file contents when only mtimes differ
+        progress (callable, optional): Called with a progress dict, see CopyProgress
+        is_cancelled (callable, optional): Returns True when the install should stop
     
     Returns:
-        bool: True if successful, False otherwise
+        InstallResult: The installed folder and how it was placed
+    
+    Raises:
+        FileNotFoundError: If the source folder or the destination directory does not exist
+        InstallCancelled: If the install was cancelled (the installed mods are kept)
+        Exception: Any error raised while copying or swapping files
     """
-    if not os.path.exists(source_path):
-        messagebox.showerror("Error", f"Source folder not found: {source_path}")
-        return False
-
-    if not os.path.exists(os.path.dirname(dest_path)):
-        messagebox.showerror("Error", f"Destination directory not found: {os.path.dirname(dest_path)}")
-        return False
-
+    if not os.path.isdir(source_path):
+        raise FileNotFoundError(f"Source folder not found: {source_path}")
+    
+    dest_dir = os.path.dirname(dest_path)
+    if not os.path.isdir(dest_dir):
+        raise FileNotFoundError(f"Destination directory not found: {dest_dir}")
+    
+    mod_folder_name = os.path.basename(source_path)
+    
+    # Get the character folder name from the source path
+    source_dir = os.path.dirname(source_path)
+    character_folder = os.path.basename(source_dir)
+    
+    installed_paths = _installed_mod_paths(dest_dir, character_folder)
+    
+    # Build the new mod in a staging folder next to the game's mods
+    staging_dir = new_staging_dir(dest_dir)
+    staged_path = os.path.join(staging_dir, mod_folder_name)
+    files_dropped = 0
     try:
-        dest_dir = os.path.dirname(dest_path)
-        mod_folder_name = os.path.basename(source_path)
-        
-        # Get the character folder name from the source path
-        source_dir = os.path.dirname(source_path)
-        character_folder = os.path.basename(source_dir)
-        
-        # Create character-specific subdirectory if it doesn't exist
-        character_dir = os.path.join(dest_dir, character_folder)
-        if not os.path.exists(character_dir):
-            os.makedirs(character_dir)
-        
-        # Update destination path to be in character subdirectory
-        dest_path = os.path.join(character_dir, mod_folder_name)
-        
-        # Find existing mods for this character using find_matching_mods
-        existing_mods = find_matching_mods(dest_dir, character_folder, [character_folder])
+        # Build on an installed version; a symlink install is already instant
+        base_path = None
+        if delta and strategy != SYMLINK:
+            base_path = _find_delta_base(installed_paths, mod_folder_name)
+        if base_path is not None:
+            diff = diff_trees(source_path, base_path, use_hash)
+            tracker = CopyProgress(len(diff.copy) + len(diff.unchanged), diff.copy_bytes, progress, is_cancelled)
+            stage_diff(diff, source_path, base_path, staged_path, strategy, tracker)
+            used_strategy = "delta"
+            files_dropped = len(diff.delete_files)
+            print(f"Staged {len(diff.copy)} changed files ({diff.copy_bytes} bytes), "
+                  f"kept {len(diff.unchanged)}, dropped {files_dropped}")
+        else:
+            # Clone, link or copy the new mod
+            total_files, total_bytes = measure_tree(source_path)
+            tracker = CopyProgress(total_files, total_bytes, progress, is_cancelled)
+            used_strategy = clone_tree(source_path, staged_path, strategy, tracker)
+        tracker.check_cancelled()
         
-        # Remove all matching mods but preserve the character directory
-        for mod_path in existing_mods:
-            full_mod_path = os.path.join(dest_dir, mod_path)
-            print(f"Removing existing mod: {full_mod_path}")
-            if os.path.exists(full_mod_path):
-                shutil.rmtree(full_mod_path)
-        
-        # Copy the new mod
-        shutil.copytree(source_path, dest_path)
-        return True
-        
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to copy mod: {str(e)}")
-        return False
+        # Swap it in, keeping the replaced mods for undo
+        dest_path = swap_in(dest_dir, character_folder, staged_path, installed_paths,
+                            source_path, used_strategy)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    tracker.finish()
+    print(f"Installed with {used_strategy}: {dest_path}")
+    return InstallResult(dest_path, used_strategy, tracker.files_done, tracker.bytes_done, files_dropped)
+
+def install_archive(archive_path, mods_to, character_folder, progress=None, is_cancelled=None):
+    """
+    Install an archived mod by streaming its members straight into the game's mods folder.
+    
+    The mod ends up in mods_to/<character_folder>/<archive name>, replacing the
+    character's installed mods like copy_mod_folder does (staged, then swapped
+    in), without extracting a copy into the library first. The archive itself
+    stays the library copy.
+    
+    Args:
+        archive_path (str): Path to the .zip or .rar archive
+        mods_to (str): Game mods directory
+        character_folder (str): Character folder name
+        progress (callable, optional): Progress callback, see extract_archive
+        is_cancelled (callable, optional): Cancellation check, see extract_archive
+    
+    Returns:
+        InstallResult: The installed folder, with strategy "extract"
+    
+    Raises:
+        FileNotFoundError: If the archive or the mods directory does not exist
+        ExtractionCancelled: If the install was cancelled (the installed mods are kept)
+        Exception: Any error raised while reading the archive or writing files
+    """
+    if not os.path.isfile(archive_path):
+        raise FileNotFoundError(f"Archive not found: {archive_path}")
+    if not os.path.isdir(mods_to):
+        raise FileNotFoundError(f"Destination directory not found: {mods_to}")
+    
+    mod_folder_name = os.path.splitext(os.path.basename(archive_path))[0]
+    
+    with open_archive(archive_path) as archive:
+        # Extract into a staging folder so a failure or cancel leaves the installed mod alone
+        staging_dir = new_staging_dir(mods_to)
+        try:
+            staged_path = os.path.join(staging_dir, mod_folder_name)
+            extract_members(archive, staged_path, progress, is_cancelled)
+            dest_path = swap_in(mods_to, character_folder, staged_path,
+                                _installed_mod_paths(mods_to, character_folder),
+                                archive_path, "extract")
+            return InstallResult(dest_path, "extract", *measure_tree(dest_path))
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+def _installed_mod_paths(mods_to, character_folder):
+    """Get the paths of every mod installed for a character."""
+    return [
+        os.path.join(mods_to, mod_path)
+        for mod_path in find_matching_mods(mods_to, character_folder, [character_folder])
+    ]
+
+def _find_delta_base(installed_paths, mod_folder_name):
+    """
+    Pick the installed folder a delta install should build on.
+    
+    Returns:
+        str: Path of the installed folder with the same name, or of the only
+            installed folder, or None if there is no clear candidate
+    """
+    folders = [path for path in installed_paths if os.path.isdir(path) and not os.path.islink(path)]
+    for path in folders:
+        if os.path.basename(path) == mod_folder_name:
+            return path
+    return folders[0] if len(folders) == 1 else None
 
 def get_directory_contents(path):
     """
@@ -81,7 +197,8 @@ def get_directory_contents(path):
     contents = []
     for f in os.listdir(path):
         full_path = os.path.join(path, f)
-        if os.path.isdir(full_path) or f.lower().endswith(('.zip', '.rar')):
+        # Dangling folder symlinks still count so they can be removed
+        if os.path.isdir(full_path) or os.path.islink(full_path) or f.lower().endswith(('.zip', '.rar')):
             contents.append(f)
     return contents
 
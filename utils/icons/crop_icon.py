@@ -1,29 +1,46 @@
 from PIL import Image
+import io
 import os
 
-def crop_image_to_square(input_path, output_path, start_top=50):
+DEFAULT_START_TOP = 50
+
+def crop_box(width, height, start_top=DEFAULT_START_TOP):
     """
-    Crops the center of a square region from an image.
-    The top of the square starts at 2/5 of the image height.
-    
-    Args:
-        input_path (str): Path to the source image.
-        output_path (str): Path to save the cropped image.
+    Get the square crop box of a portrait.
+
+    The square is as wide as the shorter side, centered horizontally, with its
+    top start_top pixels down (or as low as still fits).
     """
-    with Image.open(input_path) as img:
-        width, height = img.size
+    crop_size = min(width, height)
+    left = (width - crop_size) // 2
+    top = min(start_top, height - crop_size)
+    return (left, top, left + crop_size, top + crop_size)
 
-        crop_size = min(width, height)
+def crop_bytes_to_square(data, output_path, start_top=DEFAULT_START_TOP):
+    """
+    Crop an in-memory portrait to a square icon and save it atomically.
 
-        left = (width - crop_size) // 2
-        top = start_top
-        top = min(top, height - crop_size)
+    Args:
+        data (bytes): Encoded source image.
+        output_path (str): Path to save the cropped image; its extension picks the format.
+        start_top (int): Top of the square in pixels.
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        cropped_img = img.crop(crop_box(img.width, img.height, start_top))
+        base, ext = os.path.splitext(output_path)
+        tmp_path = f"{base}.tmp{ext}"
+        cropped_img.save(tmp_path)
+    os.replace(tmp_path, output_path)
 
-        box = (left, top, left + crop_size, top + crop_size)
-        
-        # Crop and save
-        cropped_img = img.crop(box)
-        cropped_img.save(output_path)
-        print(f"Cropped image saved to {output_path}")
-        
+def crop_image_to_square(input_path, output_path, start_top=DEFAULT_START_TOP):
+    """
+    Crops the center of a square region from an image.
+    The top of the square starts start_top pixels down.
 
+    Args:
+        input_path (str): Path to the source image.
+        output_path (str): Path to save the cropped image.
+    """
+    with open(input_path, 'rb') as f:
+        crop_bytes_to_square(f.read(), output_path, start_top)
+    print(f"Cropped image saved to {output_path}")
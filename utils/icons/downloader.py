@@ -0,0 +1,253 @@
+"""
+HTTP downloads for character icons.
+
+A Downloader shares one pooled requests session between a bounded number of
+worker threads, with connect/read timeouts and retries on connection errors
+and 429/5xx responses. Files that already exist are skipped before any request
+is made. New files are streamed to a ".part" file next to the target and
+renamed into place, so an interrupted run never leaves a truncated icon and
+the next run picks up where it stopped. ETag and Last-Modified values are kept
+in a small JSON cache so pages and refreshed files are fetched conditionally
+and cost a 304 when they did not change.
+
+Nothing here is tied to a particular site: URLs and paths come from the
+caller, so the engine can be pointed at a local HTTP server.
+"""
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_DOWNLOAD_WORKERS = 8
+REQUEST_TIMEOUT = (5, 30)  # Connect and read timeouts in seconds
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5  # Seconds, doubled after each retry
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CHUNK_SIZE = 64 * 1024
+USER_AGENT = "MigotoModManager"
+
+# Download outcomes
+DOWNLOADED = "downloaded"
+NOT_MODIFIED = "not_modified"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+def create_session(workers=DEFAULT_DOWNLOAD_WORKERS):
+    """
+    Create a requests session with a connection pool sized for `workers` threads.
+
+    Retries cover connection errors and 429/5xx responses, honouring
+    Retry-After, with exponential backoff.
+    """
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=("GET", "HEAD"),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+class ValidatorCache:
+    """
+    ETag and Last-Modified values of earlier downloads, keyed by URL.
+
+    Thread-safe; saved as JSON through a temp file like the library index.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries = self._load()
+
+    def headers(self, url):
+        """Get the conditional request headers for a URL."""
+        with self._lock:
+            entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url, response):
+        """Remember a response's validators, or forget the URL if it sent none."""
+        entry = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }
+        with self._lock:
+            if entry["etag"] or entry["last_modified"]:
+                self.entries[url] = entry
+            else:
+                self.entries.pop(url, None)
+            self._dirty = True
+
+    def save(self):
+        """Write the cache if it changed."""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def _load(self):
+        try:
+            if self.path and os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Failed to load download cache: {str(e)}")
+        return {}
+
+class DownloadResult:
+    """
+    Outcome of one file download.
+
+    Attributes:
+        url (str): Requested URL
+        path (str): Target file
+        status (str): DOWNLOADED, NOT_MODIFIED, SKIPPED or FAILED
+        error (str): Error message when the download failed
+        data (bytes): The downloaded body, when it was asked to be kept
+    """
+
+    def __init__(self, url, path, status, error=None, data=None):
+        self.url = url
+        self.path = path
+        self.status = status
+        self.error = error
+        self.data = data
+
+class Downloader:
+    """
+    Fetches pages and files over one pooled session.
+
+    Args:
+        session (requests.Session, optional): Session to use; create_session() by default
+        cache (ValidatorCache, optional): Validators for conditional requests
+        workers (int): Number of files downloaded at the same time
+        timeout (tuple): Connect and read timeouts passed to requests
+    """
+
+    def __init__(self, session=None, cache=None, workers=DEFAULT_DOWNLOAD_WORKERS, timeout=REQUEST_TIMEOUT):
+        self.session = session or create_session(workers)
+        self.cache = cache or ValidatorCache()
+        self.workers = workers
+        self.timeout = timeout
+
+    def fetch_text(self, url, cache_path=None):
+        """
+        Fetch a page, conditionally when a copy of it is cached at cache_path.
+
+        Returns:
+            tuple: (page text, whether it changed since the cached copy)
+
+        Raises:
+            requests.RequestException: If the page could not be fetched
+        """
+        has_copy = cache_path is not None and os.path.exists(cache_path)
+        headers = self.cache.headers(url) if has_copy else {}
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and has_copy:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return f.read(), False
+        response.raise_for_status()
+
+        text = response.text
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, cache_path)
+            self.cache.update(url, response)
+            self.cache.save()
+        return text, True
+
+    def download(self, url, path, refresh=False, keep_data=False):
+        """
+        Download one file to path.
+
+        An existing file is skipped, or revalidated with a conditional request
+        when refresh is set. With keep_data the body is also returned in
+        memory, so later stages don't have to read the file back.
+
+        Returns:
+            DownloadResult: The outcome; errors are reported, not raised
+        """
+        exists = os.path.exists(path)
+        if exists and not refresh:
+            return DownloadResult(url, path, SKIPPED)
+
+        headers = self.cache.headers(url) if exists else {}
+        tmp_path = path + ".part"
+        try:
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                if response.status_code == 304 and exists:
+                    return DownloadResult(url, path, NOT_MODIFIED)
+                response.raise_for_status()
+                chunks = []
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        f.write(chunk)
+                        if keep_data:
+                            chunks.append(chunk)
+                os.replace(tmp_path, path)
+                self.cache.update(url, response)
+        except (requests.RequestException, OSError) as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return DownloadResult(url, path, FAILED, str(e))
+        return DownloadResult(url, path, DOWNLOADED, data=b"".join(chunks) if keep_data else None)
+
+    def download_all(self, items, refresh=False, progress=None, keep_data=False):
+        """
+        Download (url, path) pairs on the worker pool.
+
+        Existing files are skipped before anything is submitted unless refresh
+        is set. The validator cache is saved once at the end.
+
+        Args:
+            items (iterable): (url, path) pairs
+            refresh (bool): Whether to revalidate files that already exist
+            progress (callable, optional): Called with each DownloadResult as it completes
+            keep_data (bool): Whether to keep downloaded bodies in DownloadResult.data
+
+        Returns:
+            list: DownloadResult for every item, skipped ones first
+        """
+        results = []
+        pending = []
+        for url, path in items:
+            if not refresh and os.path.exists(path):
+                results.append(DownloadResult(url, path, SKIPPED))
+            else:
+                pending.append((url, path))
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="download") as executor:
+                futures = [executor.submit(self.download, url, path, refresh, keep_data) for url, path in pending]
+                for future in as_completed(futures):
+                    result = future.result()
+                    results.append(result)
+                    if progress:
+                        progress(result)
+            self.cache.save()
+        return results
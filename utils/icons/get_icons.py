@@ -1,66 +1,116 @@
-import requests
-from bs4 import BeautifulSoup
 import os
+from urllib.parse import urlsplit
 from config.constants import CHARACTER_ICON_URL
-from utils.icons.crop_icon import crop_image_to_square
+from utils.icons.crop_icon import DEFAULT_START_TOP
+from utils.icons.pipeline import crop_icons
+from utils.icons.thumbnails import generate_thumbnails
+from utils.icons.downloader import Downloader, ValidatorCache, DOWNLOADED, FAILED
+from utils.icons.sync_manifest import IconManifest
+from utils.icons.roster import iter_roster
 
-def get_icons(game, crop=False):
-    
-    os.makedirs(f"assets/character_icons/{game}/raw", exist_ok=True)
-    os.makedirs(f"assets/character_icons/{game}/icons", exist_ok=True)
-    
-    assets_icons_path = f"assets/character_icons/{game}/icons"
-    assets_raw_path = f"assets/character_icons/{game}/icons"
-    
-    existing_raw = [ assets_raw_path + "/" + img for img in os.listdir(assets_raw_path)]
-    existing_icons = [ assets_icons_path + "/" + img for img in os.listdir(assets_icons_path)]
-    
-    url = CHARACTER_ICON_URL[game]
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    cards = soup.find_all('div', class_='avatar-card card')
+def get_icons_dir(game):
+    """Get the directory holding a game's raw portraits, icons and download cache."""
+    return os.path.join("assets", "character_icons", game)
 
-    for card in cards:
-        name_tag = card.find('span', class_='emp-name')
-        if name_tag:
-            character_name = name_tag.text.strip()
-            #print(character_name)
-        else:
-            character_name = "Unknown"
-        if card:
-            img_tag = [ img for img in card.find_all('img', {'data-main-image': True}) if 'src' in img.attrs][0]
+def icon_filename(character_name, img_url):
+    """Get the file name a character's portrait is saved under."""
+    file_extension = os.path.splitext(urlsplit(img_url).path)[1]
+    return f"{character_name.replace(':', '').replace(' ', '_')}{file_extension}"
 
-            if img_tag and 'src' in img_tag.attrs:
-                img_url = img_tag['src']
-                base_url = 'https://www.prydwen.gg' 
-                full_img_url = base_url + img_url if img_url.startswith('/') else img_url
+def get_icons(game, crop=False, refresh=False, url=None, downloader=None, start_top=DEFAULT_START_TOP,
+              workers=1):
+    """
+    Sync a game's character portraits and optionally crop them into icons.
 
-                img_data = requests.get(full_img_url).content
-                file_extension = os.path.splitext(full_img_url)[1].split('?')[0]  # handle query strings
-                raw_filename = assets_raw_path + f"/{character_name.replace(':', '').replace(' ', '_')}{file_extension}"
-                icon_filename = assets_icons_path + f"/{character_name.replace(':', '').replace(' ', '_')}{file_extension}"
+    The roster page is fetched conditionally and is only parsed when it
+    changed. The per-game manifest then decides which portraits are new or
+    moved to another URL; only those are downloaded (concurrently), and only
+    icons whose portrait or crop parameters changed are cropped again, as one
+    batch. With nothing new this costs a single (usually 304) page request.
 
-                if raw_filename in existing_raw:
-                    if crop:
-                        if icon_filename in existing_icons:
-                            print(f"Raw/Icon images for {character_name} already exist. Skipping...")
-                            continue
-                    else:
-                        pass
-                    
-                    print(f"Raw image for {character_name} already exists, cropping is disabled. Skipping...")
-                    continue
-                
-                with open(raw_filename, 'wb') as img_file:
-                    img_file.write(img_data)
-                if crop:
-                    crop_image_to_square(raw_filename, icon_filename)
-               
-                print(f"Downloaded: {character_name} -> {raw_filename}" + " || cropped" if crop else "")
-            else:
-                print(f"No image found for {character_name}")
-        else:
-            print("No avatar div found in this card.")
+    Args:
+        game (str): Game name
+        crop (bool): Whether to crop portraits into square icons and thumbnails
+        refresh (bool): Whether to revalidate every portrait with the server
+        url (str, optional): Roster page URL; CHARACTER_ICON_URL[game] by default
+        downloader (Downloader, optional): Downloader to use
+        start_top (int): Top of the icon crop square in pixels
+        workers (int, optional): Crop processes; 1 (the default) crops in this
+            process, as the GUI calls this from a worker thread where starting a
+            process pool is unsafe. None uses one process per CPU
 
+    Returns:
+        SyncPlan: What the sync did; stale lists characters no longer on the roster
+
+    Raises:
+        requests.RequestException: If the roster page could not be fetched
+        RuntimeError: If some portraits could not be downloaded
+    """
+    icons_root = get_icons_dir(game)
+    assets_raw_path = os.path.join(icons_root, "raw")
+    assets_icons_path = os.path.join(icons_root, "icons")
+    cache_dir = os.path.join(icons_root, "cache")
+    os.makedirs(assets_raw_path, exist_ok=True)
+    os.makedirs(assets_icons_path, exist_ok=True)
+
+    if downloader is None:
+        downloader = Downloader(cache=ValidatorCache(os.path.join(cache_dir, "http_cache.json")))
+    manifest = IconManifest(icons_root)
+    url = url or CHARACTER_ICON_URL[game]
+    html, changed = downloader.fetch_text(url, os.path.join(cache_dir, "roster.html"))
+    roster = [] if changed else manifest.cached_roster()
+    if not roster:
+        roster = list(iter_roster(html, url))
+        manifest.set_roster(roster)
+    print(f"Roster page {'changed' if changed else 'unchanged'}: {len(roster)} characters")
+
+    filenames = {name: icon_filename(name, img_url) for name, img_url in roster}
+    plan = manifest.plan(roster, filenames, start_top, refresh)
+
+    # The plan already skipped what is on disk, so every listed portrait is fetched
+    # (conditionally when refreshing an existing file)
+    downloads = {img_url: (name, filename) for name, img_url, filename in plan.download}
+    results = downloader.download_all(
+        ((img_url, os.path.join(assets_raw_path, filename)) for img_url, (_, filename) in downloads.items()),
+        refresh=True,
+        progress=lambda result: print(f"Downloaded: {downloads[result.url][0]} -> {result.path}")
+        if result.status == DOWNLOADED else None,
+        keep_data=True
+    )
+
+    crop_jobs = {}
+    if crop:
+        for name in plan.crop:
+            crop_jobs[name] = os.path.join(assets_raw_path, filenames[name])
+    failed = []
+    for result in results:
+        name, filename = downloads[result.url]
+        if result.status == FAILED:
+            failed.append(name)
+            print(f"Failed to download {name}: {result.error}")
+            continue
+        if result.status == DOWNLOADED:
+            if crop and manifest.needs_crop(name, filename, start_top, result.data):
+                crop_jobs[name] = result.data
+            manifest.record_download(name, result.url, filename, result.data)
+        elif crop and manifest.needs_crop(name, filename, start_top):
+            crop_jobs[name] = result.path
+
+    if crop:
+        icon_paths = {name: os.path.join(assets_icons_path, filenames[name]) for name in crop_jobs}
+        crop_failed = crop_icons(((crop_jobs[name], icon_paths[name]) for name in crop_jobs), start_top, workers)
+        for name in crop_jobs:
+            if icon_paths[name] not in crop_failed:
+                manifest.record_crop(name, start_top)
+        print(f"Cropped {len(crop_jobs) - len(crop_failed)} icons")
+        generate_thumbnails(game, workers=workers)
+    manifest.save()
+
+    downloaded = sum(1 for result in results if result.status == DOWNLOADED)
+    print(f"Downloaded {downloaded}, unchanged {len(roster) - downloaded - len(failed)}")
+    if plan.stale:
+        print(f"No longer on the roster: {', '.join(plan.stale)}")
+    if failed:
+        raise RuntimeError(f"Failed to download {len(failed)} icons: {', '.join(failed)}")
     print("Exited with no errors.")
-            
\ No newline at end of file
+    return plan
@@ -0,0 +1,93 @@
+"""
+Batch crop and thumbnail pipeline for character icons.
+
+Portraits are cropped into square icons on a process pool, from bytes already
+in memory (fresh downloads) or read once by the worker (existing raw files).
+Thumbnails are then refreshed for the icons that changed, on the same kind of
+pool. It also runs standalone, e.g. after changing start_top:
+
+Usage (from the project root):
+    python -m utils.icons.pipeline [game ...] [--start-top N] [--workers N] [--missing]
+"""
+import os
+import argparse
+from utils.icons.crop_icon import crop_bytes_to_square, DEFAULT_START_TOP
+from utils.icons.process_pool import run_tasks
+from utils.icons.thumbnails import generate_thumbnails, ICON_EXTENSIONS
+
+ICONS_ROOT = os.path.join("assets", "character_icons")
+
+def _crop_task(source, output_path, start_top):
+    """Worker: crop one portrait given as encoded bytes or as a file path."""
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            source = f.read()
+    crop_bytes_to_square(source, output_path, start_top)
+
+def crop_icons(jobs, start_top=DEFAULT_START_TOP, workers=None):
+    """
+    Crop portraits into square icons across a process pool.
+
+    Args:
+        jobs (iterable): (source, icon path) pairs; source is the encoded
+            portrait or the path of the raw file
+        start_top (int): Top of the square in pixels
+        workers (int, optional): Number of processes
+
+    Returns:
+        dict: Icon path -> error message for the icons that failed
+    """
+    failed = {}
+    tasks = ((source, output_path, start_top) for source, output_path in jobs)
+    for (_, output_path, _), error in run_tasks(_crop_task, tasks, workers):
+        if error is not None:
+            failed[output_path] = str(error)
+            print(f"Failed to crop {output_path}: {str(error)}")
+    return failed
+
+def regenerate_icons(game, start_top=DEFAULT_START_TOP, workers=None, only_missing=False):
+    """
+    Crop a game's raw portraits into icons and refresh its thumbnails.
+
+    Args:
+        game (str): Game name
+        start_top (int): Top of the square in pixels
+        workers (int, optional): Number of processes
+        only_missing (bool): Whether to skip portraits that already have an icon
+
+    Returns:
+        tuple: (number of icons cropped, {icon path: error message})
+    """
+    raw_dir = os.path.join(ICONS_ROOT, game, "raw")
+    icons_dir = os.path.join(ICONS_ROOT, game, "icons")
+    if not os.path.isdir(raw_dir):
+        return 0, {}
+    os.makedirs(icons_dir, exist_ok=True)
+
+    existing_icons = set(os.listdir(icons_dir)) if only_missing else set()
+    jobs = [
+        (os.path.join(raw_dir, filename), os.path.join(icons_dir, filename))
+        for filename in sorted(os.listdir(raw_dir))
+        if os.path.splitext(filename)[1].lower() in ICON_EXTENSIONS and filename not in existing_icons
+    ]
+    failed = crop_icons(jobs, start_top, workers)
+    generate_thumbnails(game, workers=workers)
+    return len(jobs) - len(failed), failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Crop raw character portraits into icons and thumbnails.")
+    parser.add_argument("games", nargs="*", help="Games to process (default: every game under assets/character_icons)")
+    parser.add_argument("--start-top", type=int, default=DEFAULT_START_TOP, help="Top of the crop square in pixels")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes (default: one per CPU)")
+    parser.add_argument("--missing", action="store_true", help="Only crop portraits without an icon")
+    args = parser.parse_args()
+
+    games = args.games or sorted(
+        name for name in os.listdir(ICONS_ROOT) if os.path.isdir(os.path.join(ICONS_ROOT, name))
+    )
+    for game in games:
+        cropped, failed = regenerate_icons(game, args.start_top, args.workers, args.missing)
+        print(f"{game}: cropped {cropped} icons" + (f", {len(failed)} failed" if failed else ""))
+
+if __name__ == "__main__":
+    main()
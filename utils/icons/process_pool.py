@@ -0,0 +1,38 @@
+"""
+Process pool for CPU-bound icon work (decoding, cropping, resizing).
+
+Pillow holds the GIL for most of its work, so threads don't help here. Tasks
+must be picklable: a module-level function and plain arguments such as bytes
+and paths.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+INLINE_TASKS = 2  # Batches this small run in-process rather than starting workers
+
+def run_tasks(function, tasks, workers=None):
+    """
+    Run function(*task) for every task across a process pool.
+
+    Args:
+        function (callable): Module-level function to run
+        tasks (iterable): Argument tuples
+        workers (int, optional): Number of processes; one per CPU by default,
+            and 1 runs everything in the calling process
+
+    Yields:
+        tuple: (task, exception or None) in completion order
+    """
+    tasks = list(tasks)
+    if len(tasks) <= INLINE_TASKS or workers == 1:
+        for task in tasks:
+            try:
+                function(*task)
+                yield task, None
+            except Exception as e:
+                yield task, e
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(function, *task): task for task in tasks}
+        for future in as_completed(futures):
+            yield futures[future], future.exception()
@@ -0,0 +1,101 @@
+"""
+Streaming extraction of character rosters from prydwen.gg pages.
+
+Instead of building a full BeautifulSoup tree and searching it, RosterParser
+follows the HTML tokens once and only keeps state for the card it is inside:
+the name span's text and the first main image. Cards are yielded as soon as
+their closing tag is seen, so memory stays flat however large the page is.
+
+A roster card looks like:
+    <div class="avatar-card card">
+        ... <span class="emp-name">Name</span> ...
+        ... <img data-main-image="" src="/static/.../portrait.webp"> ...
+    </div>
+"""
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+CARD_CLASSES = {"avatar-card", "card"}
+NAME_CLASS = "emp-name"
+FEED_CHUNK = 64 * 1024
+
+def _classes(attrs):
+    """Get the set of classes of a tag's attribute list."""
+    for key, value in attrs:
+        if key == "class" and value:
+            return set(value.split())
+    return set()
+
+class RosterParser(HTMLParser):
+    """Collects (name, image src) pairs of roster cards as the HTML is fed in."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.cards = []
+        self._card_depth = 0  # Open <div>s of the current card, 0 outside cards
+        self._name_depth = 0  # Open <span>s of the first name span, 0 outside it
+        self._name_parts = None
+        self._src = None
+
+    def handle_starttag(self, tag, attrs):
+        if not self._card_depth:
+            if tag == "div" and CARD_CLASSES <= _classes(attrs):
+                self._card_depth = 1
+                self._name_parts = None
+                self._src = None
+            return
+
+        if tag == "div":
+            self._card_depth += 1
+        elif tag == "span":
+            if self._name_depth:
+                self._name_depth += 1
+            elif self._name_parts is None and NAME_CLASS in _classes(attrs):
+                self._name_depth = 1
+                self._name_parts = []
+        elif tag == "img" and self._src is None:
+            attributes = dict(attrs)
+            if "data-main-image" in attributes and attributes.get("src") is not None:
+                self._src = attributes["src"]
+
+    def handle_endtag(self, tag):
+        if not self._card_depth:
+            return
+        if tag == "span" and self._name_depth:
+            self._name_depth -= 1
+        elif tag == "div":
+            self._card_depth -= 1
+            if not self._card_depth:
+                name = "".join(self._name_parts).strip() if self._name_parts is not None else "Unknown"
+                self.cards.append((name, self._src))
+
+    def handle_data(self, data):
+        if self._name_depth:
+            self._name_parts.append(data)
+
+def iter_roster(html, page_url):
+    """
+    Stream the characters of a roster page.
+
+    Args:
+        html (str or iterable): The page, or an iterable of text chunks
+        page_url (str): URL the page came from, to resolve relative image URLs
+
+    Yields:
+        tuple: (character name, absolute image URL)
+    """
+    chunks = (html[i:i + FEED_CHUNK] for i in range(0, len(html), FEED_CHUNK)) if isinstance(html, str) else html
+    parser = RosterParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from _drain(parser, page_url)
+    parser.close()
+    yield from _drain(parser, page_url)
+
+def _drain(parser, page_url):
+    cards, parser.cards = parser.cards, []
+    for name, src in cards:
+        if src is None:
+            print(f"No image found for {name}")
+            continue
+        yield name, urljoin(page_url, src)
@@ -0,0 +1,180 @@
+"""
+Per-game record of synced character icons.
+
+The manifest lives at assets/character_icons/<game>/manifest.json and maps
+each character to the portrait URL it was fetched from, the file it was saved
+as, a hash of its contents, when it was fetched and the crop parameters its
+icon was made with. It also keeps the full (name, URL) roster of the last
+page that was parsed, whether or not every portrait downloaded, so an
+unchanged (304) roster page doesn't need parsing at all.
+
+plan() compares the manifest with a roster and the files on disk, so a sync
+only downloads new or moved portraits and only re-crops icons whose portrait
+or crop parameters changed. Characters that dropped off the roster are
+reported as stale; their files are left alone.
+"""
+import os
+import json
+import time
+import hashlib
+
+MANIFEST_VERSION = 2  # Version 1 stored roster names only
+MANIFEST_FILE = "manifest.json"
+
+def content_hash(data):
+    """Hash a portrait's bytes the same way thumbnails are keyed."""
+    return hashlib.sha1(data).hexdigest()
+
+class SyncPlan:
+    """
+    Work a sync has to do.
+
+    Attributes:
+        download (list): (name, URL, filename) of portraits to fetch
+        crop (list): Names whose icon must be (re)cropped from the raw file on disk
+        stale (list): Names in the manifest that are no longer on the roster
+        unchanged (list): Names with nothing to do
+    """
+
+    def __init__(self):
+        self.download = []
+        self.crop = []
+        self.stale = []
+        self.unchanged = []
+
+class IconManifest:
+    """
+    Sync state of one game's character icons.
+
+    Args:
+        icons_root (str): assets/character_icons/<game>
+    """
+
+    def __init__(self, icons_root):
+        self.path = os.path.join(icons_root, MANIFEST_FILE)
+        self.raw_dir = os.path.join(icons_root, "raw")
+        self.icons_dir = os.path.join(icons_root, "icons")
+        data = self._load()
+        self.roster = [tuple(item) for item in data.get("roster", [])]
+        self.entries = data.get("icons", {})
+        self._dirty = False
+
+    def cached_roster(self):
+        """Get the (name, URL) pairs of the last parsed roster page."""
+        return list(self.roster)
+
+    def set_roster(self, roster):
+        """Remember the (name, URL) pairs of a freshly parsed page."""
+        roster = [tuple(item) for item in roster]
+        if roster != self.roster:
+            self.roster = roster
+            self._dirty = True
+
+    def plan(self, roster, filenames, start_top, refresh=False):
+        """
+        Diff a roster against the manifest and the files on disk.
+
+        Raw portraits already on disk but missing from the manifest (from
+        before the manifest existed) are adopted as they are instead of being
+        downloaded again.
+
+        Args:
+            roster (list): (name, URL) pairs
+            filenames (dict): Name -> file name the portrait is saved under
+            start_top (int): Current crop parameter
+            refresh (bool): Whether to fetch every portrait again (conditionally)
+
+        Returns:
+            SyncPlan: What to download, crop and report
+        """
+        plan = SyncPlan()
+        existing_raw = set(os.listdir(self.raw_dir)) if os.path.isdir(self.raw_dir) else set()
+        existing_icons = set(os.listdir(self.icons_dir)) if os.path.isdir(self.icons_dir) else set()
+        crop = {"start_top": start_top}
+
+        for name, url in roster:
+            filename = filenames[name]
+            entry = self.entries.get(name)
+            if entry is None and filename in existing_raw:
+                entry = self._adopt(name, url, filename, crop if filename in existing_icons else None)
+
+            if refresh or entry is None or entry["url"] != url or filename not in existing_raw:
+                plan.download.append((name, url, filename))
+            elif entry["crop"] != crop or filename not in existing_icons:
+                plan.crop.append(name)
+            else:
+                plan.unchanged.append(name)
+
+        on_roster = {name for name, _ in roster}
+        plan.stale = sorted(name for name in self.entries if name not in on_roster)
+        return plan
+
+    def needs_crop(self, name, filename, start_top, data=None):
+        """
+        Check whether a character's icon must be cropped again.
+
+        It must when the icon is missing, was made with other crop parameters,
+        or (given the freshly downloaded data) the portrait's contents changed.
+        """
+        entry = self.entries.get(name)
+        return (entry is None or entry["crop"] != {"start_top": start_top}
+                or (data is not None and entry["hash"] != content_hash(data))
+                or not os.path.exists(os.path.join(self.icons_dir, filename)))
+
+    def record_download(self, name, url, filename, data):
+        """Record a fetched portrait; its crop parameters are set by record_crop()."""
+        previous = self.entries.get(name, {})
+        digest = content_hash(data)
+        self.entries[name] = {
+            "file": filename,
+            "url": url,
+            "hash": digest,
+            "fetched_at": time.time(),
+            "crop": previous.get("crop") if previous.get("hash") == digest else None
+        }
+        self._dirty = True
+
+    def record_crop(self, name, start_top):
+        """Record the crop parameters a character's icon was made with."""
+        self.entries[name]["crop"] = {"start_top": start_top}
+        self._dirty = True
+
+    def save(self):
+        """Write the manifest if it changed."""
+        if not self._dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": MANIFEST_VERSION, "roster": self.roster, "icons": self.entries}, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def _adopt(self, name, url, filename, crop):
+        """Record a raw portrait downloaded before the manifest existed."""
+        raw_path = os.path.join(self.raw_dir, filename)
+        with open(raw_path, 'rb') as f:
+            digest = content_hash(f.read())
+        entry = {
+            "file": filename,
+            "url": url,
+            "hash": digest,
+            "fetched_at": os.path.getmtime(raw_path),
+            "crop": crop
+        }
+        self.entries[name] = entry
+        self._dirty = True
+        return entry
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    return data
+                if data.get("version") == 1:
+                    # Keep the icon records; the roster is re-parsed once
+                    return {"icons": data.get("icons", {})}
+        except Exception as e:
+            print(f"Failed to load icon manifest: {str(e)}")
+        return {}
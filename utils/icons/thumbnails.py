@@ -0,0 +1,139 @@
+"""
+Pre-baked thumbnails for character icons.
+
+Thumbnails are written to assets/character_icons/<game>/thumbs/<size>/ at the
+exact sizes the GUI displays, so buttons can show them without resampling.
+A manifest keyed by the source file's content hash makes regeneration a no-op
+until an icon actually changes.
+"""
+import os
+import io
+import json
+import hashlib
+from PIL import Image
+from utils.icons.process_pool import run_tasks
+
+THUMBNAIL_SIZES = (80,)
+ICON_EXTENSIONS = ('.webp', '.png', '.jpg', '.jpeg', '.gif', '.bmp')
+
+def get_thumbnail_dir(game, size):
+    """Get the directory holding a game's thumbnails of one size."""
+    return os.path.join("assets", "character_icons", game, "thumbs", str(size))
+
+def get_thumbnail_path(game, icon_path, size):
+    """
+    Get the thumbnail for a character icon if it has been generated.
+
+    Args:
+        game (str): Game name
+        icon_path (str): Path to the full-size icon
+        size (int): Thumbnail size
+
+    Returns:
+        str: Path to the thumbnail, or None if it does not exist
+    """
+    stem = os.path.splitext(os.path.basename(icon_path))[0]
+    thumb_path = os.path.join(get_thumbnail_dir(game, size), f"{stem}.webp")
+    return thumb_path if os.path.exists(thumb_path) else None
+
+def fit_size(width, height, max_size):
+    """Scale (width, height) to fit a max_size square, keeping the aspect ratio."""
+    if width > height:
+        return max_size, int((max_size * height) / width)
+    return int((max_size * width) / height), max_size
+
+def generate_thumbnails(game, sizes=THUMBNAIL_SIZES, workers=None):
+    """
+    Generate missing or outdated thumbnails for a game's character icons.
+
+    Outdated icons are resized across a process pool.
+
+    Args:
+        game (str): Game name
+        sizes (tuple): Thumbnail sizes to produce
+        workers (int, optional): Number of processes
+
+    Returns:
+        int: Number of icons whose thumbnails were created, updated or removed
+    """
+    icons_dir = os.path.join("assets", "character_icons", game, "icons")
+    if not os.path.isdir(icons_dir):
+        return 0
+
+    thumbs_root = os.path.dirname(get_thumbnail_dir(game, sizes[0]))
+    manifest_path = os.path.join(thumbs_root, "manifest.json")
+    manifest = _load_manifest(manifest_path)
+    for size in sizes:
+        os.makedirs(get_thumbnail_dir(game, size), exist_ok=True)
+
+    regenerated = 0
+    seen = set()
+    outdated = {}
+    for filename in sorted(os.listdir(icons_dir)):
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() not in ICON_EXTENSIONS or stem in seen:
+            continue
+        seen.add(stem)
+
+        with open(os.path.join(icons_dir, filename), 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+
+        entry = manifest.get(stem)
+        if (entry and entry["hash"] == digest and entry["sizes"] == list(sizes)
+                and all(get_thumbnail_path(game, filename, size) for size in sizes)):
+            continue
+
+        thumb_paths = tuple(
+            (size, os.path.join(get_thumbnail_dir(game, size), f"{stem}.webp")) for size in sizes
+        )
+        outdated[thumb_paths] = (stem, filename, digest, data)
+
+    tasks = ((data, thumb_paths) for thumb_paths, (_, _, _, data) in outdated.items())
+    for (_, thumb_paths), error in run_tasks(_thumbnail_task, tasks, workers):
+        stem, filename, digest, _ = outdated[thumb_paths]
+        if error is not None:
+            print(f"Failed to create thumbnail for {filename}: {str(error)}")
+            continue
+        manifest[stem] = {"source": filename, "hash": digest, "sizes": list(sizes)}
+        regenerated += 1
+
+    # Drop thumbnails whose source icon is gone
+    for stem in list(manifest):
+        if stem not in seen:
+            for size in manifest.pop(stem)["sizes"]:
+                thumb_path = os.path.join(get_thumbnail_dir(game, size), f"{stem}.webp")
+                if os.path.exists(thumb_path):
+                    os.remove(thumb_path)
+            regenerated += 1
+
+    if regenerated:
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+    return regenerated
+
+def _thumbnail_task(data, thumb_paths):
+    """Worker: decode an icon once and write its thumbnails at every (size, path)."""
+    with Image.open(io.BytesIO(data)) as source:
+        if source.mode not in ("RGB", "RGBA"):
+            source = source.convert("RGBA")
+        for size, thumb_path in thumb_paths:
+            _write_thumbnail(source, size, thumb_path)
+
+def _write_thumbnail(source, size, thumb_path):
+    """Resize an icon to fit a size x size box and save it atomically."""
+    thumb = source.resize(fit_size(source.width, source.height, size), Image.Resampling.LANCZOS)
+    tmp_path = thumb_path + ".tmp"
+    thumb.save(tmp_path, format="WEBP", lossless=True)
+    os.replace(tmp_path, thumb_path)
+
+def _load_manifest(manifest_path):
+    try:
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Failed to load thumbnail manifest: {str(e)}")
+    return {}
@@ -0,0 +1,90 @@
+"""
+Persistent record of the mods installed into game directories.
+"""
+import os
+import json
+import time
+import threading
+from config.constants import INSTALL_RECORDS_FILE
+
+RECORDS_VERSION = 1
+
+class InstallRecords:
+    """
+    On-disk table of installed mod folders.
+
+    Each installed folder is keyed by its path and stores the library source it
+    came from, the install strategy that placed it (see utils.link_tree, or
+    "extract" for archives) and when it was installed.
+    """
+
+    def __init__(self, records_file=INSTALL_RECORDS_FILE):
+        self.records_file = records_file
+        self._lock = threading.Lock()
+        self._installs = {}
+        self._dirty = False
+        self._load()
+
+    def get(self, path):
+        """Get the record of an installed mod folder, or None if unknown."""
+        with self._lock:
+            record = self._installs.get(self._key(path))
+        return dict(record) if record else None
+
+    def record(self, path, source, strategy):
+        """Remember how a mod folder was installed."""
+        with self._lock:
+            self._installs[self._key(path)] = {
+                "source": os.path.abspath(source),
+                "strategy": strategy,
+                "installed_at": time.time(),
+            }
+            self._dirty = True
+
+    def forget(self, path):
+        """Drop the record of a removed mod folder."""
+        with self._lock:
+            if self._installs.pop(self._key(path), None) is not None:
+                self._dirty = True
+
+    def save(self):
+        """Write the records to disk if they changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return True
+            data = {"version": RECORDS_VERSION, "installs": self._installs}
+            try:
+                tmp_file = self.records_file + ".tmp"
+                with open(tmp_file, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_file, self.records_file)
+                self._dirty = False
+                return True
+            except Exception as e:
+                print(f"Failed to save install records: {str(e)}")
+                return False
+
+    def _load(self):
+        """Load the records from disk, discarding them if unreadable or outdated."""
+        try:
+            if os.path.exists(self.records_file):
+                with open(self.records_file, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == RECORDS_VERSION:
+                    self._installs = data.get("installs", {})
+        except Exception as e:
+            print(f"Failed to load install records: {str(e)}")
+            self._installs = {}
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+_install_records = None
+
+def get_install_records():
+    """Get the process-wide install records, loading them on first use."""
+    global _install_records
+    if _install_records is None:
+        _install_records = InstallRecords()
+    return _install_records
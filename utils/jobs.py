@@ -0,0 +1,189 @@
+"""
+Background job queue with a bounded, resizable worker pool.
+
+Job functions run in worker threads and talk to the GUI only through the
+queue's event channel, which is drained on the Tk main loop with after().
+"""
+import queue
+import threading
+import itertools
+from collections import deque
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class Job:
+    """
+    One unit of background work.
+
+    The function is called as func(job, *args) in a worker thread. It can
+    report progress with job.report(...) and should check job.is_cancelled()
+    between steps. Its return value becomes job.result; an exception marks
+    the job failed with job.error set to its message.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, job_queue, func, args, label, on_progress, on_done):
+        self.id = next(self._ids)
+        self.label = label
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.progress = {}
+        self._queue = job_queue
+        self._func = func
+        self._args = args
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._cancelled = threading.Event()
+
+    def report(self, **progress):
+        """Send progress data to the main thread (worker thread side)."""
+        self._queue.events.put(("progress", self, progress))
+
+    def cancel(self):
+        """Ask the job to stop; queued jobs are skipped entirely."""
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        """Check whether cancel() was called."""
+        return self._cancelled.is_set()
+
+    @property
+    def finished(self):
+        return self.state in (DONE, FAILED, CANCELLED)
+
+class JobQueue:
+    """
+    FIFO of jobs run by at most `workers` threads at a time.
+
+    Callbacks (on_progress(job, progress) and on_done(job)) always run on the
+    Tk main thread, from a drain loop that only polls while jobs are pending.
+    """
+
+    def __init__(self, workers=2, name="jobs"):
+        self.name = name
+        self.workers = max(1, workers)
+        self.events = queue.Queue()
+        self._pending = deque()
+        self._running = set()
+        self._lock = threading.Lock()
+        self._running_workers = 0
+        self._unfinished = 0
+        self._drain_root = None
+
+    def submit(self, widget, func, *args, label="", on_progress=None, on_done=None):
+        """
+        Queue a job. Must be called from the Tk main thread.
+
+        Args:
+            widget: Any widget of the application, used to schedule the drain loop
+            func (callable): Called as func(job, *args) in a worker thread
+            *args: Arguments for func
+            label (str): Name shown to the user
+            on_progress (callable): Called with (job, progress dict) on the main thread
+            on_done (callable): Called with (job) on the main thread when it ends
+
+        Returns:
+            Job: The queued job
+        """
+        job = Job(self, func, args, label, on_progress, on_done)
+        with self._lock:
+            self._pending.append(job)
+            self._unfinished += 1
+        self._spawn_workers()
+
+        if self._drain_root is None:
+            self._drain_root = widget._root()
+            self._drain_root.after(50, self._drain_events)
+        return job
+
+    def set_workers(self, workers):
+        """Change the pool size; extra workers start at once, surplus ones finish their job first."""
+        self.workers = max(1, workers)
+        self._spawn_workers()
+
+    def cancel_all(self):
+        """Cancel every queued and running job."""
+        with self._lock:
+            jobs = list(self._pending) + list(self._running)
+        for job in jobs:
+            job.cancel()
+
+    def _spawn_workers(self):
+        with self._lock:
+            # Workers not busy with a job will pick up pending ones themselves
+            while (self._running_workers < self.workers
+                   and self._running_workers - len(self._running) < len(self._pending)):
+                self._running_workers += 1
+                threading.Thread(target=self._worker, name=f"{self.name}-worker", daemon=True).start()
+
+    def _worker(self):
+        """Worker thread: run queued jobs until the queue is empty or the pool shrank."""
+        while True:
+            with self._lock:
+                if not self._pending or self._running_workers > self.workers:
+                    self._running_workers -= 1
+                    return
+                job = self._pending.popleft()
+                self._running.add(job)
+            self._run(job)
+            with self._lock:
+                self._running.discard(job)
+
+    def _run(self, job):
+        if job.is_cancelled():
+            job.state = CANCELLED
+        else:
+            job.state = RUNNING
+            self.events.put(("started", job, None))
+            try:
+                job.result = job._func(job, *job._args)
+                job.state = CANCELLED if job.is_cancelled() else DONE
+            except Exception as e:
+                job.error = str(e)
+                job.state = FAILED
+        self.events.put(("finished", job, None))
+
+    def _drain_events(self):
+        """Main thread: run job callbacks for everything the workers reported."""
+        try:
+            while True:
+                kind, job, data = self.events.get_nowait()
+                try:
+                    if kind == "progress":
+                        job.progress.update(data)
+                        if job._on_progress:
+                            job._on_progress(job, data)
+                    elif kind == "started":
+                        if job._on_progress:
+                            job._on_progress(job, {})
+                    elif kind == "finished":
+                        with self._lock:
+                            self._unfinished -= 1
+                        if job._on_done:
+                            job._on_done(job)
+                except Exception as e:
+                    print(f"Job callback failed for {job.label}: {str(e)}")
+        except queue.Empty:
+            pass
+
+        # Keep polling only while jobs are outstanding
+        with self._lock:
+            unfinished = self._unfinished
+        if unfinished:
+            self._drain_root.after(50, self._drain_events)
+        else:
+            self._drain_root = None
+
+_queues = {}
+
+def get_job_queue(name, workers=2):
+    """Get the shared job queue with this name, creating it on first use."""
+    if name not in _queues:
+        _queues[name] = JobQueue(workers, name)
+    return _queues[name]
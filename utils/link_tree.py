@@ -0,0 +1,178 @@
+"""
+Strategies for placing a mod folder into the game's mods directory.
+
+From cheapest to most expensive:
+
+- reflink: copy-on-write clone of every file (Btrfs, XFS, APFS, ...). The
+  installed files share disk blocks with the library until either is modified.
+- hardlink: every installed file is a second name for the library file. No data
+  is written, but editing an installed file also edits the library copy.
+- symlink: the installed mod folder is a link to the library folder.
+- copy: a full copy with the multithreaded engine in utils.copy_engine.
+
+Reflinks and hardlinks need the library and the game folder on the same volume
+and symlinks may need extra privileges on Windows, so clone_tree() starts at the
+configured strategy and falls back to the next one until one works. Only
+"not supported here" errors trigger a fallback; running out of space, access
+denied and other real failures fail the install. A reflink falls back straight
+to a copy: hardlinks and symlinks share edits with the library, which a user
+who picked reflink did not ask for.
+"""
+import os
+import errno
+import sys
+import shutil
+from utils.copy_engine import copy_tree, copy_file
+from utils.copy_progress import CopyProgress
+
+REFLINK = "reflink"
+HARDLINK = "hardlink"
+SYMLINK = "symlink"
+COPY = "copy"
+
+STRATEGIES = (REFLINK, HARDLINK, SYMLINK, COPY)
+DEFAULT_STRATEGY = REFLINK
+
+# ioctl number of FICLONE on Linux (_IOW(0x94, 9, int))
+_FICLONE = 0x40049409
+
+# Errors meaning the filesystem or OS can't do it, as opposed to a failed attempt
+_REFLINK_UNSUPPORTED = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.ENOTTY, errno.ENOSYS}
+_LINK_UNSUPPORTED = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EPERM, errno.EMLINK, errno.ENOSYS}
+# Windows: ERROR_INVALID_FUNCTION, ERROR_NOT_SAME_DEVICE, ERROR_NOT_SUPPORTED, ERROR_PRIVILEGE_NOT_HELD
+_UNSUPPORTED_WINERRORS = {1, 17, 50, 1314}
+
+class StrategyUnavailable(Exception):
+    """A strategy cannot be used for this source/destination pair."""
+
+def _unavailable(error, unsupported):
+    """Raise StrategyUnavailable for a "not supported" OSError and re-raise any other."""
+    if error.errno in unsupported or getattr(error, "winerror", None) in _UNSUPPORTED_WINERRORS:
+        raise StrategyUnavailable(str(error)) from error
+    raise error
+
+def _reflink_file(src, dst):
+    """Clone one file with copy-on-write, keeping its metadata like shutil.copy2."""
+    try:
+        if sys.platform.startswith("linux"):
+            import fcntl
+            with open(src, 'rb') as src_file, open(dst, 'wb') as dst_file:
+                fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+        elif sys.platform == "darwin":
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+                error = ctypes.get_errno()
+                raise OSError(error, os.strerror(error), dst)
+        else:
+            raise StrategyUnavailable(f"reflinks are not supported on {sys.platform}")
+    except OSError as e:
+        # A partially created clone must not be mistaken for a copy
+        if os.path.lexists(dst):
+            os.remove(dst)
+        _unavailable(e, _REFLINK_UNSUPPORTED)
+    shutil.copystat(src, dst)
+    return dst
+
+def _hardlink_file(src, dst):
+    """Link one file into the destination tree."""
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        _unavailable(e, _LINK_UNSUPPORTED)
+    return dst
+
+def _clone_with(strategy, source_path, dest_path, tracker):
+    """Place source_path at dest_path with one strategy, raising StrategyUnavailable if it can't."""
+    if strategy == REFLINK:
+        copy_tree(source_path, dest_path, tracker, copy_function=_reflink_file)
+    elif strategy == HARDLINK:
+        copy_tree(source_path, dest_path, tracker, copy_function=_hardlink_file)
+    elif strategy == SYMLINK:
+        try:
+            os.symlink(os.path.abspath(source_path), dest_path, target_is_directory=True)
+        except OSError as e:
+            _unavailable(e, _LINK_UNSUPPORTED)
+        tracker.complete()
+    else:
+        copy_tree(source_path, dest_path, tracker)
+
+def clone_file(src, dst, strategy=DEFAULT_STRATEGY, order=None):
+    """
+    Place a single file at dst (which must not exist), falling back like clone_tree.
+
+    Symlinks only apply to whole folders, so files go from hardlink straight to copy.
+
+    Args:
+        src (str): File to place
+        dst (str): Destination path
+        strategy (str): First strategy to try, one of STRATEGIES
+        order (tuple, optional): Strategies to try instead of fallback_order(strategy)
+
+    Returns:
+        str: The strategy that was used
+    """
+    for candidate in order or fallback_order(strategy):
+        try:
+            if candidate == REFLINK:
+                _reflink_file(src, dst)
+            elif candidate == HARDLINK:
+                _hardlink_file(src, dst)
+            elif candidate == COPY:
+                copy_file(src, dst)
+            else:
+                continue
+            return candidate
+        except StrategyUnavailable:
+            continue
+    raise RuntimeError("no install method available")
+
+def fallback_order(strategy):
+    """Get the strategies to try for a configured strategy, in order."""
+    if strategy not in STRATEGIES:
+        strategy = DEFAULT_STRATEGY
+    if strategy == REFLINK:
+        return (REFLINK, COPY)
+    return STRATEGIES[STRATEGIES.index(strategy):]
+
+def clone_tree(source_path, dest_path, strategy=DEFAULT_STRATEGY, tracker=None):
+    """
+    Place a mod folder at dest_path, trying strategies from `strategy` down to a full copy.
+
+    Args:
+        source_path (str): Mod folder in the library
+        dest_path (str): Path of the installed mod folder (must not exist)
+        strategy (str): First strategy to try, one of STRATEGIES
+        tracker (CopyProgress, optional): Progress and cancellation of the install
+
+    Returns:
+        str: The strategy that was used
+
+    Raises:
+        InstallCancelled: If the tracker's install was cancelled
+        Exception: Any error raised by the full copy
+    """
+    if tracker is None:
+        tracker = CopyProgress()
+    for candidate in fallback_order(strategy):
+        try:
+            _clone_with(candidate, source_path, dest_path, tracker)
+            return candidate
+        except StrategyUnavailable as e:
+            print(f"Install method {candidate} unavailable, falling back: {str(e)}")
+            remove_tree(dest_path)
+            tracker.restart()
+    raise RuntimeError("no install method available")
+
+def remove_tree(path):
+    """Remove an installed mod: a folder tree, a folder symlink or a single file."""
+    if os.path.islink(path):
+        # Directory symlinks are removed with rmdir on Windows
+        if os.name == "nt" and os.path.isdir(path):
+            os.rmdir(path)
+        else:
+            os.unlink(path)
+    elif os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
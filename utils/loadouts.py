@@ -0,0 +1,211 @@
+"""
+Loadouts: saved character -> mod choices applied to a game in one job.
+
+Loadouts are stored in the settings file under "loadouts", one table per game
+mapping loadout names to {character folder: library entry name}. Applying a
+loadout only installs the characters whose installed mod differs from the
+saved one, several characters at a time.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import save_data
+from utils.copy_progress import InstallCancelled
+from utils.file_operations import copy_mod_folder, install_archive, find_matching_mods
+from utils.link_tree import DEFAULT_STRATEGY
+from utils.mod_index import ARCHIVE_EXTENSIONS
+from utils.zip.extract import ExtractionCancelled
+
+SETTINGS_KEY = "loadouts"
+DEFAULT_LOADOUT_WORKERS = 4
+
+def installed_name(entry_name):
+    """Get the folder name a library entry is installed under (archives drop their extension)."""
+    if entry_name.lower().endswith(ARCHIVE_EXTENSIONS):
+        return os.path.splitext(entry_name)[0]
+    return entry_name
+
+def _installed_mods(mods_to, character_folder):
+    """Get the names of the mods installed for a character."""
+    return [
+        os.path.basename(mod_path)
+        for mod_path in find_matching_mods(mods_to, character_folder, [character_folder])
+    ]
+
+class LoadoutStore:
+    """
+    Loadouts of one game, backed by the shared settings dict.
+
+    The settings dict is the one loaded by the App, so save() writes the whole
+    file back through save_data() like CharacterMatchCache does.
+    """
+
+    def __init__(self, settings, game):
+        self.settings = settings
+        self.game = game
+        self.loadouts = settings.setdefault(SETTINGS_KEY, {}).setdefault(game, {})
+
+    def names(self):
+        """Get the loadout names, sorted."""
+        return sorted(self.loadouts, key=str.lower)
+
+    def get(self, name):
+        """Get a loadout's {character folder: library entry name} mapping."""
+        return dict(self.loadouts.get(name, {}))
+
+    def set(self, name, mapping):
+        """Store a loadout, replacing any loadout with the same name."""
+        self.loadouts[name] = dict(mapping)
+
+    def delete(self, name):
+        """Forget a loadout."""
+        self.loadouts.pop(name, None)
+
+    def save(self):
+        """Write the settings file."""
+        return save_data(self.settings)
+
+def capture_loadout(mods_from, mods_to, character_folders):
+    """
+    Build a loadout from what is installed right now.
+
+    Each character with an installed mod that exists in the library (as a folder
+    or as an archive of the same name) is mapped to that library entry.
+
+    Returns:
+        dict: {character folder: library entry name}
+    """
+    mapping = {}
+    for character_folder in character_folders:
+        installed = _installed_mods(mods_to, character_folder)
+        if not installed:
+            continue
+        char_path = os.path.join(mods_from, character_folder)
+        try:
+            entries = os.listdir(char_path)
+        except OSError:
+            continue
+        for entry in sorted(entries):
+            if installed_name(entry) == installed[0] and (
+                    os.path.isdir(os.path.join(char_path, entry))
+                    or entry.lower().endswith(ARCHIVE_EXTENSIONS)):
+                mapping[character_folder] = entry
+                break
+    return mapping
+
+class LoadoutResult:
+    """
+    Outcome of applying a loadout.
+
+    Attributes:
+        installed (list): Characters whose mod was installed
+        unchanged (list): Characters that already had the saved mod
+        missing (list): Characters whose saved mod is no longer in the library
+        failed (dict): Character -> error message
+        cancelled (bool): Whether the job was cancelled before finishing
+    """
+
+    def __init__(self):
+        self.installed = []
+        self.unchanged = []
+        self.missing = []
+        self.failed = {}
+        self.cancelled = False
+
+def plan_loadout(mods_from, mods_to, mapping):
+    """
+    Split a loadout into the characters to install and those already up to date.
+
+    Returns:
+        tuple: ([(character folder, entry name)] to install, unchanged characters, missing characters)
+    """
+    to_install = []
+    unchanged = []
+    missing = []
+    for character_folder, entry in sorted(mapping.items()):
+        if not os.path.exists(os.path.join(mods_from, character_folder, entry)):
+            missing.append(character_folder)
+        elif _installed_mods(mods_to, character_folder) == [installed_name(entry)]:
+            unchanged.append(character_folder)
+        else:
+            to_install.append((character_folder, entry))
+    return to_install, unchanged, missing
+
+def apply_loadout(mods_from, mods_to, mapping, install_settings=None, workers=DEFAULT_LOADOUT_WORKERS,
+                  progress=None, is_cancelled=None):
+    """
+    Install every character of a loadout whose installed mod differs, in parallel.
+
+    Each character goes through the normal staged install (copy_mod_folder or
+    install_archive), so a character that fails or is cancelled keeps its
+    previous mod and can still be undone individually.
+
+    Args:
+        mods_from (str): Mod library directory
+        mods_to (str): Game mods directory
+        mapping (dict): {character folder: library entry name}
+        install_settings (dict, optional): The "install_settings" section of the settings
+        workers (int): Number of characters installed at the same time
+        progress (callable, optional): Called with a dict of items_done, total_items
+            and member (the characters being installed)
+        is_cancelled (callable, optional): Returns True when the job should stop
+
+    Returns:
+        LoadoutResult: What happened to each character
+    """
+    install_settings = install_settings or {}
+    result = LoadoutResult()
+    to_install, result.unchanged, result.missing = plan_loadout(mods_from, mods_to, mapping)
+
+    lock = threading.Lock()
+    running = []
+
+    def report():
+        if progress:
+            progress({
+                "items_done": len(result.installed) + len(result.failed),
+                "total_items": len(to_install),
+                "member": ", ".join(running)
+            })
+
+    def install(character_folder, entry):
+        if is_cancelled and is_cancelled():
+            return
+        with lock:
+            running.append(character_folder)
+            report()
+        source_path = os.path.join(mods_from, character_folder, entry)
+        try:
+            if entry.lower().endswith(ARCHIVE_EXTENSIONS):
+                install_archive(source_path, mods_to, character_folder, is_cancelled=is_cancelled)
+            else:
+                copy_mod_folder(
+                    source_path,
+                    os.path.join(mods_to, entry),
+                    strategy=install_settings.get("strategy", DEFAULT_STRATEGY),
+                    delta=install_settings.get("delta", 1) == 1,
+                    use_hash=install_settings.get("delta_hash", 0) == 1,
+                    is_cancelled=is_cancelled
+                )
+            outcome = None
+        except (InstallCancelled, ExtractionCancelled):
+            return
+        except Exception as e:
+            outcome = str(e)
+        finally:
+            with lock:
+                running.remove(character_folder)
+        with lock:
+            if outcome is None:
+                result.installed.append(character_folder)
+            else:
+                result.failed[character_folder] = outcome
+            report()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="loadout") as executor:
+        for future in [executor.submit(install, *item) for item in to_install]:
+            future.result()
+
+    finished = len(result.installed) + len(result.failed)
+    result.cancelled = bool(is_cancelled and is_cancelled()) and finished < len(to_install)
+    return result
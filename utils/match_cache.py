@@ -0,0 +1,110 @@
+"""
+Persistent folder name -> character match table.
+
+Matches are stored in the settings file under "character_matches", one table
+per game, so folders seen on an earlier launch never reach the fuzzy matcher
+again. Each table records the version of the character list it was built
+against and is dropped when the list changes. Overrides chosen by the user are
+kept across list changes for as long as the chosen character still exists.
+"""
+import hashlib
+from config.settings import save_data
+from utils.character_matcher import get_character_matcher
+
+SETTINGS_KEY = "character_matches"
+
+def character_list_version(character_list):
+    """Get a short hash identifying the contents of a character list."""
+    return hashlib.sha1("\n".join(character_list).encode("utf-8")).hexdigest()[:12]
+
+class CharacterMatchCache:
+    """
+    Match table for one game, backed by the shared settings dict.
+
+    The settings dict is the one loaded by the App (and edited by the settings
+    tab), so save() writes the whole file back through save_data().
+    """
+
+    def __init__(self, settings, game, character_list):
+        self.settings = settings
+        self.game = game
+        self.character_list = character_list
+        self.matcher = get_character_matcher(character_list)
+        self._dirty = False
+
+        tables = settings.setdefault(SETTINGS_KEY, {})
+        version = character_list_version(character_list)
+        table = tables.get(game)
+        if not table or table.get("version") != version:
+            overrides = table.get("overrides", {}) if table else {}
+            table = {
+                "version": version,
+                "matches": {},
+                "overrides": {
+                    folder: name for folder, name in overrides.items()
+                    if name in character_list
+                }
+            }
+            tables[game] = table
+            self._dirty = True
+        self.matches = table["matches"]
+        self.overrides = table["overrides"]
+
+    def match(self, folder):
+        """
+        Get the character for a folder: override, then stored match, then the matcher.
+
+        Args:
+            folder (str): Character folder name
+
+        Returns:
+            str: The matched character name or the folder name if no match
+        """
+        if folder in self.overrides:
+            return self.overrides[folder]
+        if folder not in self.matches:
+            self.matches[folder] = self.matcher.match(folder)
+            self._dirty = True
+        return self.matches[folder]
+
+    def match_all(self, folders):
+        """Make sure every folder has a stored match, scoring the new ones in one batch."""
+        new_folders = [
+            folder for folder in folders
+            if folder not in self.overrides and folder not in self.matches
+        ]
+        if new_folders:
+            self.matches.update(zip(new_folders, self.matcher.match_many(new_folders)))
+            self._dirty = True
+
+    def is_overridden(self, folder):
+        """Check whether the user chose the character for a folder."""
+        return folder in self.overrides
+
+    def set_override(self, folder, character_name):
+        """Always match a folder to character_name."""
+        if self.overrides.get(folder) != character_name:
+            self.overrides[folder] = character_name
+            self._dirty = True
+
+    def clear_override(self, folder):
+        """Go back to the automatic match for a folder."""
+        if self.overrides.pop(folder, None) is not None:
+            self._dirty = True
+
+    def retain(self, folders):
+        """Forget automatic matches for folders that no longer exist (overrides stay)."""
+        folders = set(folders)
+        for folder in list(self.matches):
+            if folder not in folders:
+                del self.matches[folder]
+                self._dirty = True
+
+    def save(self):
+        """Write the settings file if the table changed since the last save."""
+        if not self._dirty:
+            return True, None
+        success, error = save_data(self.settings)
+        if success:
+            self._dirty = False
+        return success, error
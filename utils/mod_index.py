@@ -0,0 +1,232 @@
+"""
+Persistent index of the mod library ("Mods From" directories).
+"""
+import os
+import json
+import threading
+from config.constants import LIBRARY_INDEX_FILE
+
+ARCHIVE_EXTENSIONS = ('.zip', '.rar')
+INDEX_VERSION = 2  # Version 1 entries had no per-folder mtimes
+
+class ModLibraryIndex:
+    """
+    On-disk cache of mod library directory listings.
+
+    Each directory is stored with its mtime and its entries (name, kind, size,
+    mtime, instructions presence). A directory is only re-listed when its own
+    mtime changes. Mod folders also record the mtime of every folder inside
+    them: lookups only stat each mod's root folder, which catches top-level
+    changes, and revalidate() stats the rest on a worker thread to catch a
+    mod whose tree gained, lost or renamed anything deeper down.
+    """
+
+    def __init__(self, index_file=LIBRARY_INDEX_FILE):
+        self.index_file = index_file
+        self._lock = threading.Lock()
+        self._dirs = {}
+        self._dirty = False
+        self._load()
+
+    def list_entries(self, path, details=True):
+        """
+        Get the subfolders and archives of a directory, using the cache when valid.
+
+        Args:
+            path (str): Directory to list
+            details (bool): Whether sizes and instructions presence are needed
+
+        Returns:
+            list: Entry dicts with name, kind, size, mtime and has_instructions
+        """
+        if not path:
+            return []
+        try:
+            dir_mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+
+        key = self._key(path)
+        with self._lock:
+            cached = self._dirs.get(key)
+        if cached and cached["mtime"] == dir_mtime and (cached["detailed"] or not details):
+            if details:
+                self._refresh_details(path, cached["entries"], deep=False)
+            return [dict(entry) for entry in cached["entries"]]
+
+        previous = {entry["name"]: entry for entry in cached["entries"]} if cached else {}
+        entries = self._scan(path, previous, details)
+        if entries is None:
+            return []
+
+        with self._lock:
+            self._dirs[key] = {"mtime": dir_mtime, "detailed": details, "entries": entries}
+            self._dirty = True
+        return [dict(entry) for entry in entries]
+
+    def list_names(self, path):
+        """Get just the entry names of a directory (no size/instructions scan)."""
+        return [entry["name"] for entry in self.list_entries(path, details=False)]
+
+    def revalidate(self, path):
+        """
+        Stat every folder of a directory's cached mods and rescan those that changed.
+
+        This costs one stat per folder in the library, so call it from a worker
+        thread after showing the (shallowly checked) cached listing.
+
+        Returns:
+            bool: True if any entry was rescanned
+        """
+        with self._lock:
+            cached = self._dirs.get(self._key(path))
+        if not cached or not cached["detailed"]:
+            return False
+        return self._refresh_details(path, cached["entries"], deep=True)
+
+    def invalidate(self, path):
+        """Forget the cached listing of a directory so the next lookup rescans it."""
+        with self._lock:
+            if self._dirs.pop(self._key(path), None) is not None:
+                self._dirty = True
+
+    def save(self):
+        """Write the index to disk if it changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return True
+            data = {"version": INDEX_VERSION, "directories": self._dirs}
+            try:
+                tmp_file = self.index_file + ".tmp"
+                with open(tmp_file, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_file, self.index_file)
+                self._dirty = False
+                return True
+            except Exception as e:
+                print(f"Failed to save mod library index: {str(e)}")
+                return False
+
+    def _load(self):
+        """Load the index from disk, discarding it if unreadable or outdated."""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    self._dirs = data.get("directories", {})
+        except Exception as e:
+            print(f"Failed to load mod library index: {str(e)}")
+            self._dirs = {}
+
+    def _scan(self, path, previous, details):
+        """Scan a directory, reusing details of mod folders whose root folder is unchanged."""
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for dir_entry in it:
+                    try:
+                        is_dir = dir_entry.is_dir()
+                        if not is_dir and not dir_entry.name.lower().endswith(ARCHIVE_EXTENSIONS):
+                            continue
+                        stat = dir_entry.stat()
+                    except OSError:
+                        continue
+
+                    entry = {
+                        "name": dir_entry.name,
+                        "kind": "folder" if is_dir else "archive",
+                        "mtime": stat.st_mtime_ns,
+                        "size": None if is_dir else stat.st_size,
+                        "has_instructions": False,
+                    }
+                    if details and is_dir:
+                        old = previous.get(dir_entry.name)
+                        if old and old["size"] is not None and _folders_unchanged(dir_entry.path, old["folders"], deep=False):
+                            entry["size"] = old["size"]
+                            entry["has_instructions"] = old["has_instructions"]
+                            entry["folders"] = old["folders"]
+                        else:
+                            entry.update(_scan_mod_folder(dir_entry.path))
+                    entries.append(entry)
+        except OSError as e:
+            print(f"Failed to scan {path}: {str(e)}")
+            return None
+        return entries
+
+    def _refresh_details(self, path, entries, deep):
+        """Rescan the mod folders of a cached listing that changed; True if any did."""
+        changed = False
+        for position, entry in enumerate(entries):
+            if entry["kind"] != "folder" or entry["size"] is None:
+                continue
+            mod_path = os.path.join(path, entry["name"])
+            if not _folders_unchanged(mod_path, entry["folders"], deep):
+                # Replace rather than update, so concurrent readers never see a half-updated entry
+                updated = dict(entry, **_scan_mod_folder(mod_path))
+                with self._lock:
+                    entries[position] = updated
+                    self._dirty = True
+                changed = True
+        return changed
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+def _folders_unchanged(path, folders, deep):
+    """Check that the mod root (and with deep, every folder) recorded by _scan_mod_folder has the same mtime."""
+    for relative, mtime in (folders.items() if deep else [("", folders.get(""))]):
+        try:
+            if os.stat(os.path.join(path, relative)).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+def _scan_mod_folder(path):
+    """
+    Compute the total size of a mod folder and whether it ships instructions.
+
+    Args:
+        path (str): Path to the mod folder
+
+    Returns:
+        dict: size (bytes), has_instructions (a top-level .txt file exists) and
+            folders (relative path -> mtime of the mod folder and every folder in it)
+    """
+    total_size = 0
+    has_instructions = False
+    folders = {}
+    try:
+        folders[""] = os.stat(path).st_mtime_ns
+    except OSError:
+        pass
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as it:
+                for dir_entry in it:
+                    try:
+                        if dir_entry.is_dir(follow_symlinks=False):
+                            pending.append(dir_entry.path)
+                            folders[os.path.relpath(dir_entry.path, path)] = dir_entry.stat(follow_symlinks=False).st_mtime_ns
+                        else:
+                            total_size += dir_entry.stat(follow_symlinks=False).st_size
+                            if current == path and dir_entry.name.lower().endswith('.txt'):
+                                has_instructions = True
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return {"size": total_size, "has_instructions": has_instructions, "folders": folders}
+
+_library_index = None
+
+def get_library_index():
+    """Get the process-wide mod library index, loading it on first use."""
+    global _library_index
+    if _library_index is None:
+        _library_index = ModLibraryIndex()
+    return _library_index
@@ -0,0 +1,198 @@
+"""
+Staged installs swapped into the game's mods directory with renames.
+
+A new mod is first built in a staging folder on the same volume as the game's
+mods directory. Once it is complete, the character's installed mods are moved
+aside into a backup folder and the staged mod is renamed into place. Both steps
+are renames, so a failure or crash while building never touches the installed
+mod, and undoing the last install is a rename back instead of a recopy.
+
+Everything lives under mods_to/DISABLED_mod_manager: 3DMigoto skips folders
+whose name starts with DISABLED, so staged and backed-up mods are never loaded
+by the game. The backup of a character's previous mods is kept until the next
+install for that character or until it is confirmed with confirm_install().
+"""
+import os
+import json
+import shutil
+import tempfile
+from utils.install_records import get_install_records
+
+WORK_DIR_NAME = "DISABLED_mod_manager"
+JOURNAL_FILE = "journal.json"
+
+def _work_dir(mods_to, *parts):
+    return os.path.join(mods_to, WORK_DIR_NAME, *parts)
+
+def _hide(path):
+    """Mark a folder hidden in Explorer (dot-less names are not hidden otherwise)."""
+    if os.name == "nt":
+        import ctypes
+        ctypes.windll.kernel32.SetFileAttributesW(path, 0x02)
+
+def new_staging_dir(mods_to):
+    """
+    Create an empty staging folder on the mods directory's volume.
+
+    Args:
+        mods_to (str): Game mods directory
+
+    Returns:
+        str: Path of the new folder; the caller removes it when done
+    """
+    work_dir = _work_dir(mods_to)
+    # Several installs may create it at once; hiding it again is harmless
+    os.makedirs(work_dir, exist_ok=True)
+    _hide(work_dir)
+    staging_dir = _work_dir(mods_to, "staging")
+    os.makedirs(staging_dir, exist_ok=True)
+    return tempfile.mkdtemp(dir=staging_dir)
+
+def clean_staging(mods_to):
+    """
+    Remove staging folders left behind by interrupted installs.
+
+    Only call this before any install can run (at startup): it removes the
+    staging folders of running installs too.
+    """
+    shutil.rmtree(_work_dir(mods_to, "staging"), ignore_errors=True)
+
+def _backup_dir(mods_to, character_folder):
+    return _work_dir(mods_to, "backup", character_folder)
+
+def _read_journal(backup_dir):
+    try:
+        with open(os.path.join(backup_dir, JOURNAL_FILE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_journal(backup_dir, journal):
+    tmp_file = os.path.join(backup_dir, JOURNAL_FILE + ".tmp")
+    with open(tmp_file, 'w') as f:
+        json.dump(journal, f)
+    os.replace(tmp_file, os.path.join(backup_dir, JOURNAL_FILE))
+
+def swap_in(mods_to, character_folder, staged_path, installed_paths, source, strategy):
+    """
+    Replace a character's installed mods with a staged mod folder.
+
+    The previous backup of the character is discarded, the installed mods are
+    renamed into a fresh backup and the staged folder is renamed into
+    mods_to/<character_folder>. If any rename fails, the mods moved so far are
+    put back and the error is raised.
+
+    Args:
+        mods_to (str): Game mods directory
+        character_folder (str): Character folder name
+        staged_path (str): Complete mod folder inside a staging folder
+        installed_paths (list): Installed mod paths of the character to replace
+        source (str): Library path the mod came from, for the install records
+        strategy (str): How the mod was placed, for the install records
+
+    Returns:
+        str: Path of the installed mod folder
+    """
+    records = get_install_records()
+    character_dir = os.path.join(mods_to, character_folder)
+    dest_path = os.path.join(character_dir, os.path.basename(staged_path))
+    os.makedirs(character_dir, exist_ok=True)
+
+    confirm_install(mods_to, character_folder)
+    backup_dir = _backup_dir(mods_to, character_folder)
+    os.makedirs(os.path.join(backup_dir, "mods"))
+    journal = {
+        "installed": os.path.basename(dest_path),
+        "previous": {
+            os.path.basename(path): records.get(path) for path in installed_paths
+        },
+    }
+    _write_journal(backup_dir, journal)
+
+    moved = []
+    try:
+        for path in installed_paths:
+            backup_path = os.path.join(backup_dir, "mods", os.path.basename(path))
+            os.rename(path, backup_path)
+            moved.append((backup_path, path))
+        os.rename(staged_path, dest_path)
+    except BaseException:
+        for backup_path, path in reversed(moved):
+            os.rename(backup_path, path)
+        shutil.rmtree(backup_dir, ignore_errors=True)
+        raise
+
+    for path in installed_paths:
+        records.forget(path)
+    records.record(dest_path, source, strategy)
+    records.save()
+    return dest_path
+
+def can_undo(mods_to, character_folder):
+    """Check whether the last install of a character can be undone."""
+    return bool(mods_to) and _read_journal(_backup_dir(mods_to, character_folder)) is not None
+
+def undo_last_install(mods_to, character_folder):
+    """
+    Put back the mods a character had before its last install.
+
+    Nothing is moved if a restored folder's name is taken by another folder.
+    If a rename still fails, the mods moved so far are put back, so the
+    character keeps its installed mod and the undo can be retried.
+
+    Returns:
+        list: Names of the restored mod folders
+
+    Raises:
+        FileNotFoundError: If there is no install to undo
+        FileExistsError: If a folder to restore would replace another folder
+    """
+    backup_dir = _backup_dir(mods_to, character_folder)
+    journal = _read_journal(backup_dir)
+    if journal is None:
+        raise FileNotFoundError(f"No install to undo for {character_folder}")
+
+    records = get_install_records()
+    character_dir = os.path.join(mods_to, character_folder)
+    installed_path = os.path.join(character_dir, journal["installed"])
+    previous = {
+        name: record for name, record in journal["previous"].items()
+        if os.path.lexists(os.path.join(backup_dir, "mods", name))
+    }
+    for name in previous:
+        if name != journal["installed"] and os.path.lexists(os.path.join(character_dir, name)):
+            raise FileExistsError(f"Cannot restore {name}: a folder with that name exists in {character_dir}")
+
+    # Move the installed mod out with a rename and delete it once the old ones are back
+    trash_dir = new_staging_dir(mods_to)
+    trashed_path = os.path.join(trash_dir, journal["installed"])
+    moved = []
+    try:
+        if os.path.lexists(installed_path):
+            os.rename(installed_path, trashed_path)
+        for name in previous:
+            backup_path = os.path.join(backup_dir, "mods", name)
+            path = os.path.join(character_dir, name)
+            os.rename(backup_path, path)
+            moved.append((path, backup_path))
+    except BaseException:
+        for path, backup_path in reversed(moved):
+            os.rename(path, backup_path)
+        if os.path.lexists(trashed_path):
+            os.rename(trashed_path, installed_path)
+        shutil.rmtree(trash_dir, ignore_errors=True)
+        raise
+
+    records.forget(installed_path)
+    for name, record in previous.items():
+        if record:
+            records.record(os.path.join(character_dir, name), record["source"], record["strategy"])
+    shutil.rmtree(backup_dir, ignore_errors=True)
+    shutil.rmtree(trash_dir, ignore_errors=True)
+    records.save()
+    return list(previous)
+
+def confirm_install(mods_to, character_folder):
+    """Discard the rollback copy of a character's last install."""
+    # rmtree unlinks symlinked mod folders without following them into the library
+    shutil.rmtree(_backup_dir(mods_to, character_folder), ignore_errors=True)
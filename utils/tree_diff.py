@@ -0,0 +1,144 @@
+"""
+Delta updates of an installed mod folder.
+
+Swapping between two versions of a mod usually changes a few .ini or buffer
+files. diff_trees() compares an installed folder with the library folder and
+stage_diff() builds the new version from the installed files that did not
+change plus copies of the ones that did. The staging folder is on the same
+volume as the installed folder, so unchanged files are reflinked (or hardlinked,
+when that is the configured strategy) rather than copied and only the changed
+files cost any real I/O.
+"""
+import os
+import hashlib
+from utils.copy_progress import CopyProgress
+from utils.link_tree import clone_file, REFLINK, HARDLINK, COPY
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class TreeDiff:
+    """
+    Changes needed to turn an installed folder into a copy of a source folder.
+
+    All paths are relative to the folder roots.
+
+    Attributes:
+        copy (list): Source files that are new or changed
+        unchanged (list): Source files identical to the installed ones
+        delete_files (list): Installed files missing from the source
+        source_dirs (list): Every folder of the source tree
+        copy_bytes (int): Total size of the files to copy
+    """
+
+    def __init__(self):
+        self.copy = []
+        self.unchanged = []
+        self.delete_files = []
+        self.source_dirs = []
+        self.copy_bytes = 0
+
+def _walk(root):
+    """Map relative file paths to stat results and list relative folders of a tree, following symlinks."""
+    files = {}
+    dirs = []
+    pending = [""]
+    while pending:
+        relative = pending.pop()
+        with os.scandir(os.path.join(root, relative)) as it:
+            for dir_entry in it:
+                path = os.path.join(relative, dir_entry.name)
+                if dir_entry.is_dir():
+                    dirs.append(path)
+                    pending.append(path)
+                else:
+                    files[path] = dir_entry.stat()
+    return files, dirs
+
+def _file_hash(path):
+    """Hash a file's contents."""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+def _same_file(source_file, source_stat, dest_file, dest_stat, use_hash):
+    """Compare two files by size and mtime, or by size and contents when use_hash is set."""
+    if source_stat.st_size != dest_stat.st_size:
+        return False
+    if source_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+        return True
+    return use_hash and _file_hash(source_file) == _file_hash(dest_file)
+
+def diff_trees(source_path, dest_path, use_hash=False):
+    """
+    Compare an installed mod folder with its library source.
+
+    Files with the same size and mtime are unchanged (installs keep source
+    mtimes). With use_hash, files of equal size whose mtimes differ are
+    compared by contents instead of being replaced.
+
+    Args:
+        source_path (str): Library mod folder
+        dest_path (str): Installed mod folder
+        use_hash (bool): Whether to hash files whose mtime differs
+
+    Returns:
+        TreeDiff: The changes to apply
+    """
+    source_files, source_dirs = _walk(source_path)
+    dest_files, _ = _walk(dest_path)
+    diff = TreeDiff()
+    diff.source_dirs = sorted(source_dirs)
+
+    for path, source_stat in source_files.items():
+        dest_stat = dest_files.get(path)
+        if dest_stat is not None and _same_file(
+                os.path.join(source_path, path), source_stat,
+                os.path.join(dest_path, path), dest_stat, use_hash):
+            diff.unchanged.append(path)
+        else:
+            diff.copy.append(path)
+            diff.copy_bytes += source_stat.st_size
+
+    diff.delete_files = [path for path in dest_files if path not in source_files]
+    return diff
+
+def stage_diff(diff, source_path, base_path, staged_path, strategy=COPY, tracker=None):
+    """
+    Build the new version of a mod at staged_path from an installed version.
+
+    Unchanged files are taken from base_path by reflink, falling back to a
+    copy, and new and changed ones from source_path with the configured
+    strategy. base_path itself is left untouched so it can be kept as the
+    rollback copy; unchanged files are only hardlinked to it when the strategy
+    is HARDLINK, as editing a hardlinked file in the game folder would edit the
+    rollback copy too.
+
+    Args:
+        diff (TreeDiff): Result of diff_trees(source_path, base_path)
+        source_path (str): Library mod folder
+        base_path (str): Installed mod folder
+        staged_path (str): Folder to create (must not exist)
+        strategy (str): First file placement strategy for changed files
+        tracker (CopyProgress, optional): Progress and cancellation of the install;
+            only changed files count toward its bytes
+
+    Raises:
+        InstallCancelled: If the tracker's install was cancelled
+    """
+    if tracker is None:
+        tracker = CopyProgress()
+    os.makedirs(staged_path)
+    for path in diff.source_dirs:
+        os.makedirs(os.path.join(staged_path, path), exist_ok=True)
+    unchanged_order = (REFLINK, HARDLINK, COPY) if strategy == HARDLINK else (REFLINK, COPY)
+    for path in diff.unchanged:
+        tracker.check_cancelled()
+        clone_file(os.path.join(base_path, path), os.path.join(staged_path, path), order=unchanged_order)
+        tracker.file_done(path)
+    for path in diff.copy:
+        tracker.check_cancelled()
+        source_file = os.path.join(source_path, path)
+        clone_file(source_file, os.path.join(staged_path, path), strategy)
+        tracker.file_done(path, os.path.getsize(source_file))
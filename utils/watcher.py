@@ -0,0 +1,235 @@
+"""
+Filesystem watcher for the mod library.
+
+Watches a "Mods From" directory and its character subfolders and reports
+added, removed and renamed entries through a thread-safe queue. Uses inotify
+on Linux and falls back to polling directory mtimes everywhere else.
+"""
+import os
+import sys
+import queue
+import select
+import struct
+import threading
+from collections import namedtuple
+
+WatchEvent = namedtuple("WatchEvent", ["kind", "directory", "name", "new_name"])
+WatchEvent.__new__.__defaults__ = (None,)
+
+# inotify constants from <sys/inotify.h>
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT_HEADER = struct.Struct("iIII")
+
+class LibraryWatcher:
+    """
+    Background watcher feeding a change queue.
+
+    Events are WatchEvent tuples with kind "added", "removed", "renamed" or
+    "rescan" (the backend lost track and the directory should be re-listed).
+    The directory field is the absolute path of the directory that changed.
+    """
+
+    def __init__(self, root, poll_interval=2.0):
+        self.root = os.path.abspath(root)
+        self.poll_interval = poll_interval
+        self.events = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start watching in a daemon thread."""
+        if self._thread is not None or not os.path.isdir(self.root):
+            return
+        backend = _InotifyBackend if _InotifyBackend.available() else _PollingBackend
+        self._thread = threading.Thread(target=self._run, args=(backend,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watcher thread."""
+        self._stop.set()
+
+    def _run(self, backend):
+        try:
+            backend(self.root, self.events, self._stop, self.poll_interval).run()
+        except Exception as e:
+            print(f"Library watcher stopped for {self.root}: {str(e)}")
+            if backend is _InotifyBackend and not self._stop.is_set():
+                _PollingBackend(self.root, self.events, self._stop, self.poll_interval).run()
+
+class _PollingBackend:
+    """Compare directory listings every poll_interval seconds."""
+
+    def __init__(self, root, events, stop, poll_interval):
+        self.root = root
+        self.events = events
+        self.stop = stop
+        self.poll_interval = poll_interval
+        self.snapshots = {}
+
+    def run(self):
+        self._snapshot(self.root)
+        for name in self.snapshots.get(self.root, (None, set()))[1]:
+            self._snapshot(os.path.join(self.root, name))
+
+        while not self.stop.wait(self.poll_interval):
+            for directory in list(self.snapshots):
+                self._poll(directory)
+
+    def _snapshot(self, directory):
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            names = set(os.listdir(directory))
+        except OSError:
+            return None
+        self.snapshots[directory] = (mtime, names)
+        return names
+
+    def _poll(self, directory):
+        if directory not in self.snapshots:
+            return
+        old_mtime, old_names = self.snapshots[directory]
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            del self.snapshots[directory]
+            return
+        if mtime == old_mtime:
+            return
+
+        names = self._snapshot(directory)
+        if names is None:
+            return
+        for name in sorted(old_names - names):
+            self.events.put(WatchEvent("removed", directory, name))
+            if directory == self.root:
+                self.snapshots.pop(os.path.join(directory, name), None)
+        for name in sorted(names - old_names):
+            self.events.put(WatchEvent("added", directory, name))
+            if directory == self.root and os.path.isdir(os.path.join(directory, name)):
+                self._snapshot(os.path.join(directory, name))
+
+class _InotifyBackend:
+    """Linux inotify watches on the root and each character folder."""
+
+    _libc = None
+
+    @classmethod
+    def available(cls):
+        if not sys.platform.startswith("linux"):
+            return False
+        if cls._libc is None:
+            try:
+                import ctypes
+                import ctypes.util
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+                cls._libc = libc
+            except (OSError, AttributeError):
+                cls._libc = False
+        return bool(cls._libc)
+
+    def __init__(self, root, events, stop, poll_interval):
+        self.root = root
+        self.events = events
+        self.stop = stop
+        self.poll_interval = poll_interval
+        self.watches = {}
+
+    def run(self):
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError("inotify_init1 failed")
+        try:
+            self._add_watch(self.root)
+            for name in os.listdir(self.root):
+                path = os.path.join(self.root, name)
+                if os.path.isdir(path):
+                    self._add_watch(path)
+
+            while not self.stop.is_set():
+                readable, _, _ = select.select([self.fd], [], [], self.poll_interval)
+                if readable:
+                    self._handle(self._read())
+        finally:
+            os.close(self.fd)
+
+    def _add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd >= 0:
+            self.watches[wd] = path
+
+    def _remove_watch(self, path):
+        for wd, watched in list(self.watches.items()):
+            if watched == path:
+                self._libc.inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+
+    def _read(self):
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        raw_events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            raw_events.append((wd, mask, cookie, name))
+        return raw_events
+
+    def _handle(self, raw_events):
+        pending_moves = {}
+        for wd, mask, cookie, name in raw_events:
+            if mask & IN_Q_OVERFLOW:
+                self.events.put(WatchEvent("rescan", self.root, None))
+                continue
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.watches[wd]
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                continue
+
+            is_root_dir = directory == self.root and mask & IN_ISDIR
+            if mask & IN_CREATE:
+                if is_root_dir:
+                    self._add_watch(os.path.join(directory, name))
+                self.events.put(WatchEvent("added", directory, name))
+            elif mask & IN_DELETE:
+                self.events.put(WatchEvent("removed", directory, name))
+            elif mask & IN_MOVED_FROM:
+                pending_moves[cookie] = (directory, name)
+            elif mask & IN_MOVED_TO:
+                if is_root_dir:
+                    self._add_watch(os.path.join(directory, name))
+                source = pending_moves.pop(cookie, None)
+                if source and source[0] == directory:
+                    self.events.put(WatchEvent("renamed", directory, source[1], name))
+                else:
+                    if source:
+                        self.events.put(WatchEvent("removed", source[0], source[1]))
+                    self.events.put(WatchEvent("added", directory, name))
+
+        # Moves out of the watched tree never get a matching IN_MOVED_TO
+        for directory, name in pending_moves.values():
+            if directory == self.root:
+                self._remove_watch(os.path.join(directory, name))
+            self.events.put(WatchEvent("removed", directory, name))
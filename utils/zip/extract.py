@@ -2,6 +2,8 @@
 Archive extraction utilities for ZIP and RAR files.
 """
 import os
+import time
+import shutil
 import zipfile
 import rarfile
 from tkinter import messagebox
@@ -93,14 +95,29 @@ def check_unrar_installed():
     except Exception:
         return False
 
-def extract_archive(archive_path, extract_to=None, progress_window=None):
+CHUNK_SIZE = 1024 * 1024  # Bytes copied per read while streaming a member
+PROGRESS_INTERVAL = 0.1  # Seconds between progress reports
+# Characters zipfile replaces with "_" when extracting on Windows
+_WINDOWS_ILLEGAL = str.maketrans(':<>|"?*', "_" * 7)
+
+class ExtractionCancelled(Exception):
+    """Raised when an extraction is cancelled between two members."""
+
+def extract_archive(archive_path, extract_to=None, progress_window=None, progress=None, is_cancelled=None):
     """
     Extract a ZIP or RAR archive to the specified directory.
     
+    Members are streamed one at a time, so progress can be reported while a
+    large archive is extracted and the extraction can stop between members.
+    A cancelled or failed extraction removes the folder it created.
+    
     Args:
         archive_path (str): Path to the archive file
         extract_to (str, optional): Directory to extract to. If None, creates a directory named after the archive.
         progress_window: Optional progress window to update
+        progress (callable, optional): Called from the extracting thread with a dict of
+            bytes_done, total_bytes, member and throughput (bytes per second)
+        is_cancelled (callable, optional): Returns True when the extraction should stop
     
     Returns:
         bool: True if successful, False otherwise
@@ -120,7 +137,8 @@ def extract_archive(archive_path, extract_to=None, progress_window=None):
         extract_to = os.path.join(extract_to, archive_name)
         
     # Create extract directory if it doesn't exist
-    if not os.path.exists(extract_to):
+    created = not os.path.exists(extract_to)
+    if created:
         os.makedirs(extract_to)
     
     try:
@@ -129,7 +147,7 @@ def extract_archive(archive_path, extract_to=None, progress_window=None):
         
         success = False
         if ext == '.zip':
-            success = extract_zip(archive_path, extract_to)
+            success = extract_zip(archive_path, extract_to, progress, is_cancelled)
         elif ext == '.rar':
             if not _unrar.is_installed():
                 error_msg = (
@@ -138,12 +156,14 @@ def extract_archive(archive_path, extract_to=None, progress_window=None):
                 )
                 if progress_window:
                     progress_window.show_error(error_msg)
+                _remove_partial(extract_to, created)
                 return False
-            success = extract_rar(archive_path, extract_to)
+            success = extract_rar(archive_path, extract_to, progress, is_cancelled)
         else:
             error_msg = f"Unsupported archive format: {ext}"
             if progress_window:
                 progress_window.show_error(error_msg)
+            _remove_partial(extract_to, created)
             return False
             
         # If extraction was successful and delete_after_extract is enabled, delete the archive
@@ -155,6 +175,8 @@ def extract_archive(archive_path, extract_to=None, progress_window=None):
                     os.remove(archive_path)
                 except Exception as e:
                     print(f"Failed to delete archive: {str(e)}")
+        else:
+            _remove_partial(extract_to, created)
             
         return success
             
@@ -162,47 +184,223 @@ def extract_archive(archive_path, extract_to=None, progress_window=None):
         error_msg = f"Failed to extract archive: {str(e)}"
         if progress_window:
             progress_window.show_error(error_msg)
+        _remove_partial(extract_to, created)
         return False
 
-def extract_zip(zip_path, extract_to):
+def extract_zip(zip_path, extract_to, progress=None, is_cancelled=None):
     """
     Extract a ZIP file to the specified directory.
     
     Args:
         zip_path (str): Path to the ZIP file
         extract_to (str): Directory to extract to
+        progress (callable, optional): Progress callback, see extract_archive
+        is_cancelled (callable, optional): Cancellation check, see extract_archive
     
     Returns:
         bool: True if successful, False otherwise
     """
     try:
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            # Extract all contents directly to the specified directory
-            zip_ref.extractall(extract_to)
+            # Stream the contents directly to the specified directory
+            extract_members(zip_ref, extract_to, progress, is_cancelled)
         return True
         
+    except ExtractionCancelled:
+        print(f"Extraction cancelled: {zip_path}")
+        return False
     except Exception as e:
         print(f"Failed to extract ZIP: {str(e)}")
         return False
 
-def extract_rar(rar_path, extract_to):
+def extract_rar(rar_path, extract_to, progress=None, is_cancelled=None):
     """
     Extract a RAR file to the specified directory.
     
     Args:
         rar_path (str): Path to the RAR file
         extract_to (str): Directory to extract to
+        progress (callable, optional): Progress callback, see extract_archive
+        is_cancelled (callable, optional): Cancellation check, see extract_archive
     
     Returns:
         bool: True if successful, False otherwise
     """
     try:
         with rarfile.RarFile(rar_path, 'r') as rar_ref:
-            # Extract all contents directly to the specified directory
-            rar_ref.extractall(extract_to)
+            # Stream the contents directly to the specified directory
+            extract_members(rar_ref, extract_to, progress, is_cancelled)
         return True
         
+    except ExtractionCancelled:
+        print(f"Extraction cancelled: {rar_path}")
+        return False
     except Exception as e:
         print(f"Failed to extract RAR: {str(e)}")
         return False
 
+def open_archive(archive_path):
+    """
+    Open a ZIP or RAR archive for streaming with extract_members().
+    
+    Args:
+        archive_path (str): Path to the archive file
+    
+    Returns:
+        zipfile.ZipFile or rarfile.RarFile: The open archive (use it as a context manager)
+    
+    Raises:
+        ValueError: If the archive format is not supported
+        RuntimeError: If a RAR archive is given and UnRAR is not available
+    """
+    _, ext = os.path.splitext(archive_path.lower())
+    if ext == '.zip':
+        return zipfile.ZipFile(archive_path, 'r')
+    if ext == '.rar':
+        if not _unrar.is_installed():
+            raise RuntimeError("UnRAR is not installed or not found. Please install WinRAR (Windows) or unrar (Linux/Mac).")
+        return rarfile.RarFile(archive_path, 'r')
+    raise ValueError(f"Unsupported archive format: {ext}")
+
+def extract_members(archive, extract_to, progress=None, is_cancelled=None):
+    """
+    Stream every member of an open ZipFile or RarFile into a directory.
+    
+    Each member is copied in CHUNK_SIZE reads, so memory use does not depend
+    on member size. Progress is reported at most every PROGRESS_INTERVAL
+    seconds and once more at the end.
+    
+    Args:
+        archive: An open zipfile.ZipFile or rarfile.RarFile
+        extract_to (str): Directory to extract to
+        progress (callable, optional): Progress callback, see extract_archive
+        is_cancelled (callable, optional): Cancellation check, see extract_archive
+    
+    Solid RAR archives are handed to the UnRAR tool in one pass instead (see
+    _extract_solid_rar), since opening their members one by one decompresses
+    the solid stream from the start every time.
+    
+    Raises:
+        ExtractionCancelled: If is_cancelled() returned True between two members
+    """
+    if isinstance(archive, rarfile.RarFile) and archive.is_solid():
+        _extract_solid_rar(archive, extract_to, progress, is_cancelled)
+        return
+
+    members = archive.infolist()
+    total_bytes = sum(member.file_size for member in members if not member.is_dir())
+    bytes_done = 0
+    started = time.monotonic()
+    last_report = 0.0
+
+    def report(member_name):
+        elapsed = time.monotonic() - started
+        progress({
+            "bytes_done": bytes_done,
+            "total_bytes": total_bytes,
+            "member": member_name,
+            "throughput": bytes_done / elapsed if elapsed > 0 else 0.0
+        })
+
+    for member in members:
+        if is_cancelled and is_cancelled():
+            raise ExtractionCancelled(member.filename)
+
+        target = _member_target(extract_to, member.filename)
+        if target is None:
+            continue
+        if member.is_dir():
+            os.makedirs(target, exist_ok=True)
+            continue
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with archive.open(member) as source, open(target, 'wb') as dest:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                dest.write(chunk)
+                bytes_done += len(chunk)
+                if progress and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.monotonic()
+                    report(member.filename)
+
+    if progress:
+        report("")
+
+def _extract_solid_rar(archive, extract_to, progress=None, is_cancelled=None):
+    """
+    Extract a solid RAR archive with a single run of the UnRAR tool.
+    
+    UnRAR drops absolute and ".." paths and fixes names that are illegal on
+    Windows itself. Progress is coarse: one report when the run starts and
+    one when it ends; cancellation is checked every PROGRESS_INTERVAL and
+    kills the tool.
+    
+    Raises:
+        ExtractionCancelled: If is_cancelled() returned True during the run
+        RuntimeError: If the tool failed
+    """
+    total_bytes = sum(member.file_size for member in archive.infolist() if not member.is_dir())
+    started = time.monotonic()
+
+    def report(bytes_done, member_name):
+        if progress:
+            elapsed = time.monotonic() - started
+            progress({
+                "bytes_done": bytes_done,
+                "total_bytes": total_bytes,
+                "member": member_name,
+                "throughput": bytes_done / elapsed if elapsed > 0 else 0.0
+            })
+
+    os.makedirs(extract_to, exist_ok=True)
+    report(0, os.path.basename(archive.filename))
+    process = subprocess.Popen(
+        [rarfile.UNRAR_TOOL, "x", "-y", "-o+", "-idq", archive.filename, os.path.join(extract_to, "")],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    while True:
+        try:
+            _, stderr = process.communicate(timeout=PROGRESS_INTERVAL)
+            break
+        except subprocess.TimeoutExpired:
+            if is_cancelled and is_cancelled():
+                process.kill()
+                process.wait()
+                process.stderr.close()
+                raise ExtractionCancelled(archive.filename)
+    if process.returncode != 0:
+        raise RuntimeError(f"UnRAR failed ({process.returncode}): {stderr.decode(errors='replace').strip()}")
+    report(total_bytes, "")
+
+def _member_target(extract_to, filename):
+    """
+    Get the path a member extracts to, or None if nothing would be left of it.
+    
+    Like zipfile's extractall, absolute paths, drive letters and "." / ".."
+    components are dropped so members cannot escape extract_to, and on
+    Windows characters that are illegal in file names become "_" and trailing
+    dots are stripped.
+    """
+    parts = []
+    for part in filename.replace('\\', '/').split('/'):
+        part = os.path.splitdrive(part)[1]
+        if os.sep == '\\':
+            part = _sanitize_windows_name(part)
+        if part in ('', '.', '..'):
+            continue
+        parts.append(part)
+    if not parts:
+        return None
+    return os.path.join(extract_to, *parts)
+
+def _sanitize_windows_name(part):
+    """Make one path component valid on Windows, the way zipfile does."""
+    return part.translate(_WINDOWS_ILLEGAL).rstrip('.')
+
+def _remove_partial(extract_to, created):
+    """Remove a directory created for an extraction that did not complete."""
+    if created and os.path.isdir(extract_to):
+        shutil.rmtree(extract_to, ignore_errors=True)